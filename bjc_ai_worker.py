@@ -0,0 +1,169 @@
+import os
+import random
+import subprocess
+import sys
+import threading
+import weakref
+from collections import namedtuple
+from multiprocessing.connection import Client, Listener
+
+# ------------------------------------------------------------------------------
+# Asynchronous AI decisions
+# The game thread never waits for a policy. Each frame an AI player submits an
+# immutable AISnapshot (only the latest one per player is kept) and reads the
+# newest Decision that has come back; if that decision is older than the
+# allowed staleness it falls back to the cheap built-in AI for the frame.
+# Policies run on one worker thread; with processes=True the thread only
+# forwards snapshots to a child process over a multiprocessing connection, so
+# a CPU-heavy policy does not hold the GIL away from the render loop. The child
+# runs this file as a script (`python bjc_ai_worker.py <address>`), which never
+# imports pygame or the game module: a multiprocessing "spawn" child would
+# re-import the parent's main module (bjc_game) and open a second window and
+# audio device per AI process.
+# A policy is a picklable function policy(snapshot, rng) -> (target_x, swing).
+# ------------------------------------------------------------------------------
+
+AISnapshot = namedtuple("AISnapshot", [
+    "t",                                  # 플레이어 AI 시계(초) — 결정의 나이 계산용
+    "x", "y",                             # 플레이어 위치
+    "shuttle_x", "shuttle_y", "shuttle_vx", "shuttle_vy", "shuttle_z",
+    "predict", "aim_error", "swing_prob", # 난이도 값
+    "lane",                               # (min_x, max_x) 또는 None
+])
+
+Decision = namedtuple("Decision", ["t", "target_x", "swing"])
+
+
+def predict_target_x(x, y, sx, sy, vx, vy, predict, aim_error, rng):
+    """현재 셔틀 x와 내 y에 도달할 때의 예측 x를 섞고 에임 오차를 더한 목표 x"""
+    t_to_me = abs(y - sy) / max(60.0, abs(vy))   # 60은 안전 최소치로 폭주 방지
+    predicted_x = sx + vx * t_to_me
+    w = max(0.0, min(1.0, predict))
+    target_x = (1.0 - w) * sx + w * predicted_x
+    return target_x + rng.uniform(-aim_error, aim_error)
+
+
+def swing_intent(x, y, sx, sy, reach, swing_prob, rng):
+    """셔틀이 가까울 때만 확률적으로 스윙"""
+    close_x = abs(sx - x) <= reach
+    close_y = abs(sy - y) <= 120
+    return close_x and close_y and (rng.random() < swing_prob)
+
+
+def heuristic_policy(snap, rng, reach=50):
+    """기본 AI(Player.update_ai)와 같은 규칙을 스냅샷에 적용"""
+    target_x = predict_target_x(snap.x, snap.y, snap.shuttle_x, snap.shuttle_y,
+                                snap.shuttle_vx, snap.shuttle_vy, snap.predict, snap.aim_error, rng)
+    if snap.lane:
+        target_x = max(snap.lane[0], min(snap.lane[1], target_x))
+    return target_x, swing_intent(snap.x, snap.y, snap.shuttle_x, snap.shuttle_y,
+                                  reach, snap.swing_prob, rng)
+
+
+def _process_main(conn, policy, seed):
+    rng = random.Random(seed)
+    while True:
+        try:
+            snap = conn.recv()
+        except EOFError:
+            break
+        if snap is None:
+            break
+        conn.send(policy(snap, rng))
+
+
+def _child_main(address):
+    # 정책 프로세스 진입점: 인증 키는 stdin으로 받음 (명령줄에 남지 않게)
+    authkey = bytes.fromhex(sys.stdin.readline().strip())
+    conn = Client(address, authkey=authkey)
+    policy, seed = conn.recv()
+    _process_main(conn, policy, seed)
+
+
+class AIWorker:
+    def __init__(self, policy=heuristic_policy, processes=False, seed=None):
+        self.policy = policy
+        self.rng = random.Random(seed)
+        self._cond = threading.Condition()
+        self._pending = {}          # key -> 가장 최근 스냅샷 (밀린 것은 덮어씀)
+        self._latest = weakref.WeakKeyDictionary()   # key(플레이어) -> Decision, 씬이 사라지면 같이 정리
+        self._closed = False
+        self.processes = processes
+        self._conn = self._proc = self._listener = None
+        if processes:
+            authkey = os.urandom(32)
+            self._listener = Listener(authkey=authkey)
+            self._proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), self._listener.address],
+                                          stdin=subprocess.PIPE)
+            self._proc.stdin.write(authkey.hex().encode() + b"\n")
+            self._proc.stdin.close()
+            self._seed = seed
+        self._thread = threading.Thread(target=self._run, name="ai-worker", daemon=True)
+        self._thread.start()
+
+    # --- game side (never blocks on the policy) ---------------------------------
+    def submit(self, key, snap):
+        with self._cond:
+            self._pending[key] = snap
+            self._cond.notify()
+
+    def latest(self, key):
+        return self._latest.get(key)
+
+    def close(self, timeout=1.0):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout)
+        if self._proc is None:
+            return
+        if self._conn is not None:
+            try:
+                self._conn.send(None)
+            except OSError:
+                pass
+        try:
+            self._proc.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()           # 접속도 못 했거나 응답 없음
+            self._proc.wait()
+
+    # --- worker thread ------------------------------------------------------------
+    def _connect(self):
+        # 자식이 접속할 때까지는 이 스레드만 기다림 (게임은 그동안 기본 AI)
+        try:
+            self._conn = self._listener.accept()
+            self._conn.send((self.policy, self._seed))
+        finally:
+            self._listener.close()
+
+    def _decide(self, snap):
+        if not self.processes:
+            return self.policy(snap, self.rng)
+        self._conn.send(snap)
+        return self._conn.recv()
+
+    def _run(self):
+        if self.processes:
+            try:
+                self._connect()
+            except (OSError, EOFError):
+                return        # 정책 프로세스가 뜨지 못함 → 게임은 기본 AI로
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                batch = list(self._pending.items())
+                self._pending.clear()
+            for key, snap in batch:
+                try:
+                    target_x, swing = self._decide(snap)
+                except (OSError, EOFError):
+                    return        # 정책 프로세스가 죽음 → 결정이 끊기면 게임은 기본 AI로
+                self._latest[key] = Decision(snap.t, target_x, swing)
+
+
+if __name__ == "__main__":
+    _child_main(sys.argv[1])
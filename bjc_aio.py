@@ -0,0 +1,84 @@
+import asyncio
+import sys
+import time
+import traceback
+
+# ------------------------------------------------------------------------------
+# asyncio frame pacing
+# The frame itself (events -> update -> draw) stays synchronous; between frames
+# the task awaits a future that loop.call_at() resolves at the next frame
+# deadline, so network / I/O coroutines run in the idle part of each frame and
+# never in the middle of one. Deadlines advance by a fixed period on the loop
+# clock (no drift); dt is measured with perf_counter. A coroutine that blocks
+# the loop still delays the next frame — blocking work belongs in
+# loop.run_in_executor().
+# ------------------------------------------------------------------------------
+
+def _wake(fut):
+    if not fut.done():
+        fut.set_result(None)
+
+
+class FramePacer:
+    def __init__(self, loop=None):
+        self.loop = loop or asyncio.get_running_loop()
+        self._next = None          # loop.time() 기준 다음 프레임 시각
+        self._last = None          # perf_counter 기준 직전 프레임 시작
+        self.late = 0.0            # 직전 깨어남이 예정보다 늦은 시간(초)
+        self.late_max = 0.0
+
+    async def tick(self, fps):
+        """clock.tick(fps)처럼: 다음 프레임 시각까지 다른 코루틴에 양보하고 dt(초) 반환"""
+        loop = self.loop
+        period = 1.0 / fps
+        now = loop.time()
+        if self._next is None or now - self._next > period:
+            self._next = now       # 처음이거나 한 프레임 넘게 밀림 → 몰아서 따라잡지 않음
+        target = self._next
+        if target > now:
+            fut = loop.create_future()
+            handle = loop.call_at(target, _wake, fut)
+            try:
+                await fut
+            finally:
+                handle.cancel()
+        else:
+            await asyncio.sleep(0)  # 늦었어도 I/O 코루틴에 한 번은 양보
+        self._next = target + period
+        self.late = max(0.0, loop.time() - target)
+        self.late_max = max(self.late_max, self.late)
+        t = time.perf_counter()
+        dt = t - self._last if self._last is not None else 0.0
+        self._last = t
+        return dt
+
+    async def idle(self, seconds):
+        """정적 씬 대기: seconds 동안 양보. 다음 tick의 dt가 튀지 않게 기준을 다시 잡음"""
+        await asyncio.sleep(seconds)
+        self.reset()
+
+    def reset(self):
+        self._next = None
+        self._last = time.perf_counter()
+
+
+def _report(task):
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:    # 서비스가 죽어도 게임은 계속 — 원인만 남김
+        print(f"[aio] service {task.get_name()} failed:", file=sys.stderr)
+        traceback.print_exception(type(exc), exc, exc.__traceback__, file=sys.stderr)
+
+
+def start_service(coro, name=None):
+    """게임 루프와 같이 돌 코루틴을 태스크로 시작 (예외는 stderr로 보고)"""
+    task = asyncio.get_running_loop().create_task(coro, name=name)
+    task.add_done_callback(_report)
+    return task
+
+
+async def stop_services(tasks):
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,164 @@
+import gc
+import os
+import sys
+import tracemalloc
+
+# ------------------------------------------------------------------------------
+# Per-frame allocation accounting (debug only — tracemalloc is slow)
+# begin()/end() bracket one frame. For each frame we record:
+#   blocks : net memory blocks still alive after the frame (tracemalloc)
+#   gc0    : net change of the GC generation-0 counter (what triggers collections)
+#   peak   : bytes allocated above the frame's starting level at its high
+#            point (tracemalloc peak) — temporaries freed within the frame
+# A steady-state rally should keep blocks and gc0 near zero and peak small.
+# Per-frame block counts include freelist traffic (a tuple or float freed by
+# the game and reused by the snapshot code shows up as a block that outlived
+# the frame), so they jitter by a few blocks. check_rally_allocations instead
+# compares one snapshot before and one after a long run for the blocks the
+# game keeps, and checks gc0 and the transient peak frame by frame.
+# ------------------------------------------------------------------------------
+
+# tracemalloc 내부 할당(스냅샷 자체)과 이 파일(측정기, 입력 스크립트)의 할당은 제외
+_FILTERS = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+
+
+def new_blocks(before, after):
+    """before 스냅샷 이후 늘어난 메모리 블록 수 (줄별로 늘어난 것만 합산)"""
+    diff = after.filter_traces(_FILTERS).compare_to(before.filter_traces(_FILTERS), "lineno")
+    return sum(d.count_diff for d in diff if d.count_diff > 0)
+
+
+class FrameAllocCounter:
+    def __init__(self, frames=25):
+        self.frames = frames
+        self.last_blocks = 0
+        self.last_gc0 = 0
+        self.last_peak = 0
+        self.total_blocks = 0
+        self.total_gc0 = 0
+        self.total_peak = 0
+        self.count = 0
+        self._snap = None
+        self._gc0 = 0
+        self._base = 0
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def begin(self):
+        self._snap = tracemalloc.take_snapshot()
+        self._gc0 = gc.get_count()[0]
+        tracemalloc.reset_peak()
+        self._base = tracemalloc.get_traced_memory()[0]
+
+    def end(self):
+        peak = tracemalloc.get_traced_memory()[1] - self._base
+        gc0 = gc.get_count()[0] - self._gc0
+        blocks = new_blocks(self._snap, tracemalloc.take_snapshot())
+        self._snap = None
+        self.last_blocks, self.last_gc0, self.last_peak = blocks, gc0, peak
+        self.total_blocks += blocks
+        self.total_gc0 += gc0
+        self.total_peak += peak
+        self.count += 1
+        return blocks
+
+    def average(self):
+        n = self.count or 1
+        return self.total_blocks / n, self.total_gc0 / n, self.total_peak / n
+
+    def reset(self):
+        self.total_blocks = self.total_gc0 = self.total_peak = self.count = 0
+
+    def summary(self):
+        b, g, p = self.average()
+        return (f"alloc/frame: {self.last_blocks} blocks (avg {b:.2f}), gc0 {self.last_gc0:+d} (avg {g:+.2f}), "
+                f"peak {self.last_peak} B (avg {p:.0f})")
+
+
+def check_rally_allocations(warmup=600, frames=3600, max_avg_blocks=0.05, max_avg_gc0=0.05,
+                            max_avg_peak=2048, seed=1):
+    """
+    헤드리스로 실제 경기를 돌려 update+draw의 정상 상태 할당을 확인.
+    아래쪽 선수는 입력을 스크립트로 줌: 랠리마다 정해진 횟수만큼 셔틀을 쫓아 받아 넘긴 뒤
+    피해서 실점 — 타격/불꽃, 라인 판정/먼지, 득점과 점수 깜빡임, 서브 재시작이 모두 측정 구간에 들어감.
+    random과 입자 RNG를 seed로 고정하므로 매번 같은 경기가 재생됨.
+    통과 조건 (실패는 AssertionError로 보고):
+    - 측정 구간 전후 스냅샷의 순증 블록 / 프레임 수 <= max_avg_blocks (남는 것)
+    - 프레임별 gc0 변화의 평균 <= max_avg_gc0 (측정 중에는 수거를 꺼서 카운터가 0으로 돌아가지 않게)
+    - 프레임별 할당 최고점(프레임 안에서 만들고 버린 임시 객체 포함)의 평균 <= max_avg_peak 바이트
+    반환: (평균 블록, 평균 gc0, 평균 최고점 바이트, 측정 중 득점 수, 측정 중 타격 수)
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import random
+    import pygame
+    import bjc_game as game
+    from bjc_input import InputKeys, KEY_BITS
+
+    random.seed(seed)
+    game.TELEMETRY = None
+    scene = game.GameScene(lambda: None, lambda *a: None)
+    keys = InputKeys()
+    scene.keys = keys
+    me = scene.player_bottom
+    left, right = KEY_BITS[pygame.K_LEFT], KEY_BITS[pygame.K_RIGHT]
+    surf = game.screen
+    dt = 1.0 / game.FPS
+    rallies = [0]
+    shots = [0]
+
+    def step():
+        if not scene.rally_active:
+            scene.start_rally()
+            rallies[0] += 1
+        # 이번 랠리에서 받아 넘길 횟수: 1, 3, 5, 7, 1, ... 그다음엔 셔틀을 피함
+        dx = scene.shuttle.pos[0] - me.pos[0]
+        if scene.rally_shots < 2 * (rallies[0] % 4) + 1:
+            keys.mask = right if dx > 4 else left if dx < -4 else 0
+        else:
+            keys.mask = left if dx > 0 else right
+        before = scene.rally_shots
+        scene.update(dt)
+        shots[0] += scene.rally_shots - before
+        scene.draw(surf)
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(25)
+    for _ in range(warmup):            # 캐시(점수 텍스트 등)는 측정 전에 채움
+        step()
+
+    shots[0] = 0
+    points = -(scene.score["top"] + scene.score["bottom"])
+    start = rallies[0]
+    flashes = 0
+    gc0 = peak = 0
+    before = tracemalloc.take_snapshot()
+    gc.disable()
+    try:
+        for _ in range(frames):
+            g = gc.get_count()[0]
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            step()
+            peak += tracemalloc.get_traced_memory()[1] - base
+            gc0 += gc.get_count()[0] - g
+            flashes += scene.score_flash_t > 0
+    finally:
+        gc.enable()
+    blocks = new_blocks(before, tracemalloc.take_snapshot())
+    points += scene.score["top"] + scene.score["bottom"]
+    assert rallies[0] > start + 1, "no rally finished while measuring"
+    assert flashes, "no score flash was drawn while measuring"
+
+    avg_blocks, avg_gc0, avg_peak = blocks / frames, gc0 / frames, peak / frames
+    assert avg_blocks <= max_avg_blocks, f"match keeps {avg_blocks:.2f} blocks/frame (limit {max_avg_blocks})"
+    assert avg_gc0 <= max_avg_gc0, f"match adds {avg_gc0:+.2f} gc0/frame (limit {max_avg_gc0})"
+    assert avg_peak <= max_avg_peak, f"match allocates {avg_peak:.0f} B/frame at peak (limit {max_avg_peak})"
+    return avg_blocks, avg_gc0, avg_peak, points, shots[0]
+
+
+if __name__ == "__main__":
+    b, g, p, points, shots = check_rally_allocations()
+    print(f"OK: {b:.2f} blocks/frame, gc0 {g:+.2f}/frame, peak {p:.0f} B/frame "
+          f"over {shots} shots and {points} points")
+    sys.exit(0)
@@ -0,0 +1,67 @@
+import bisect
+import math
+
+# ------------------------------------------------------------------------------
+# Racket hit broad-phase (1-axis sweep and prune)
+# Players are kept in a list sorted by x. Positions change only a little per
+# frame, so re-sorting is an insertion sort over an almost-sorted list (~O(n)).
+# A query takes the x span the shuttle swept this frame, widened by the hit
+# radius, and bisects the sorted xs to get the only players worth testing.
+# The narrow phase is time_of_impact(): the earliest point along the swept
+# segment where the shuttle enters a racket circle, so simultaneous hits are
+# settled by who the shuttle actually reaches first.
+# ------------------------------------------------------------------------------
+
+class SweepAndPrune:
+    def __init__(self, bodies, radius):
+        self.bodies = list(bodies)       # .pos[0]이 x인 객체 (Player)
+        self.radius = radius
+        self.xs = [0.0] * len(self.bodies)
+        self.update()
+
+    def update(self):
+        """현재 x 좌표로 다시 정렬 (거의 정렬된 상태라 삽입 정렬)"""
+        bodies, xs = self.bodies, self.xs
+        for i in range(len(bodies)):
+            xs[i] = bodies[i].pos[0]
+        for i in range(1, len(bodies)):
+            x = xs[i]
+            b = bodies[i]
+            j = i - 1
+            while j >= 0 and xs[j] > x:
+                xs[j + 1] = xs[j]
+                bodies[j + 1] = bodies[j]
+                j -= 1
+            xs[j + 1] = x
+            bodies[j + 1] = b
+
+    def query(self, x0, x1):
+        """x 구간 [x0, x1] (+반경)과 겹치는 bodies[lo:hi]의 (lo, hi)"""
+        if x0 > x1:
+            x0, x1 = x1, x0
+        lo = bisect.bisect_left(self.xs, x0 - self.radius)
+        hi = bisect.bisect_right(self.xs, x1 + self.radius, lo)
+        return lo, hi
+
+
+def time_of_impact(x0, y0, x1, y1, cx, cy, r):
+    """
+    선분 (x0,y0)→(x1,y1)이 원(cx,cy,r)에 처음 닿는 비율 t(0~1). 안 닿으면 None.
+    시작점이 이미 원 안이면 0.
+    """
+    fx = x0 - cx
+    fy = y0 - cy
+    c = fx * fx + fy * fy - r * r
+    if c <= 0.0:
+        return 0.0
+    dx = x1 - x0
+    dy = y1 - y0
+    a = dx * dx + dy * dy
+    b = fx * dx + fy * dy
+    if a <= 1e-12 or b >= 0.0:       # 안 움직였거나 멀어지는 중
+        return None
+    disc = b * b - a * c
+    if disc < 0.0:
+        return None
+    t = (-b - math.sqrt(disc)) / a
+    return t if t <= 1.0 else None
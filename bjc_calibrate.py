@@ -0,0 +1,251 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")   # 창 없이 시뮬레이션
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import math
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import bjc_game as game
+
+# ------------------------------------------------------------------------------
+# Difficulty calibration
+# Plays AI (top) vs a fixed reference AI (bottom) headlessly with the real
+# GameScene rules, and bisects a single "skill" knob per preset until the top
+# AI's match win rate hits the preset's target. Prints a new DIFFICULTY table.
+# Two AIs that both reach the shuttle can rally forever (every return is aimed
+# at the other player), so a rally that outlasts MAX_RALLY_SECONDS goes against
+# the side that made its worst error: the racket contact furthest off the
+# racket centre (a scramble) - better positioning makes that rarer. A rally
+# with no difference (both only ever hit dead centre) is drawn by lot, so
+# every match finishes.
+# ------------------------------------------------------------------------------
+SIM_DT = 1.0 / game.FPS          # physics is per-frame (friction), so keep 60 Hz steps
+MAX_RALLY_SECONDS = 30.0         # a rally this long is decided by the worst contact
+MAX_MATCH_SECONDS = 1800.0       # give up on a match (counted as no result)
+MAX_ROUNDS = 50                  # batch rounds per candidate before giving up on it
+UNRESOLVED = None                # estimate() verdict when the win rate cannot be measured
+
+# Reference player model: the "normal" preset of bjc_game.py
+REFERENCE = {"speed_scale": 0.9, "aim_error": 20, "predict": 0.40, "swing_prob": 0.85}
+
+# Target win rate of the AI against the reference, per preset
+TARGETS = {"easy": 0.25, "normal": 0.50, "hard": 0.75}
+
+# skill 0.0 -> WEAKEST, 1.0 -> STRONGEST (linear per parameter)
+WEAKEST   = {"speed_scale": 0.40, "aim_error": 80, "predict": 0.00, "swing_prob": 0.40}
+STRONGEST = {"speed_scale": 1.40, "aim_error":  0, "predict": 1.00, "swing_prob": 1.00}
+
+
+def params_for_skill(skill):
+    p = {}
+    for k in WEAKEST:
+        p[k] = WEAKEST[k] + (STRONGEST[k] - WEAKEST[k]) * skill
+    p["speed_scale"] = round(p["speed_scale"], 2)
+    p["aim_error"]   = int(round(p["aim_error"]))
+    p["predict"]     = round(p["predict"], 2)
+    p["swing_prob"]  = round(p["swing_prob"], 2)
+    return p
+
+
+def simulate_match(ai_diff, ref_diff, seed, target_score=None):
+    """한 경기를 헤드리스로 진행. 'top'(AI) / 'bottom'(기준) / None(무승부 처리) 반환"""
+    random.seed(seed)
+    if target_score:
+        game.TARGET_SCORE = target_score
+    result = {}
+
+    def on_gameover(score, reason, winner):
+        result["winner"] = winner.lower()
+
+    scene = game.GameScene(lambda: None, on_gameover)
+    scene.player_bottom.is_human = False
+    scene.player_bottom.diff = ref_diff
+    scene.diff = ai_diff
+
+    worst = {"top": 0.0, "bottom": 0.0}   # 이번 랠리에서 각 편이 라켓 중심에서 가장 벗어나 맞힌 거리
+    hit = scene.hit
+
+    def judged_hit(player, now):
+        miss = abs(scene.shuttle.pos[0] - player.pos[0])
+        if miss > worst[player.side]:
+            worst[player.side] = miss
+        hit(player, now)
+
+    scene.hit = judged_hit
+
+    t = rally_t = 0.0
+    while "winner" not in result and t < MAX_MATCH_SECONDS:
+        if not scene.rally_active:
+            rally_t = 0.0
+            worst["top"] = worst["bottom"] = 0.0
+            if scene.server == "bottom":
+                scene.start_rally()       # 사람 대신 기준 AI가 즉시 서브
+        else:
+            rally_t += SIM_DT
+            if rally_t > MAX_RALLY_SECONDS:
+                if worst["top"] == worst["bottom"]:
+                    winner = random.choice(("top", "bottom"))   # 둘 다 흠 없음(보통 정면 타구만 오감) → 추첨
+                else:
+                    winner = "bottom" if worst["top"] > worst["bottom"] else "top"
+                scene.award_point(winner, "Stalled rally")
+                continue
+        scene.update(SIM_DT)
+        t += SIM_DT
+    return result.get("winner")
+
+
+def run_batch(ai_diff, ref_diff, seeds, target_score=None):
+    """반환: (AI 승, 끝난 경기, 끝나지 않은 경기)"""
+    wins = played = unfinished = 0
+    for seed in seeds:
+        w = simulate_match(ai_diff, ref_diff, seed, target_score)
+        if w is None:
+            unfinished += 1
+            continue
+        played += 1
+        wins += (w == "top")
+    return wins, played, unfinished
+
+
+def wilson_interval(wins, n, z):
+    if n == 0:
+        return 0.0, 1.0
+    p = wins / n
+    denom = 1.0 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return centre - half, centre + half
+
+
+class Calibrator:
+    def __init__(self, pool, workers, batch=8, z=1.96, tol=0.05, max_matches=2000,
+                 target_score=None, seed=0, max_rounds=MAX_ROUNDS, verbose=True):
+        self.pool = pool
+        self.workers = workers
+        self.batch = batch
+        self.z = z
+        self.tol = tol
+        self.max_matches = max_matches
+        self.max_rounds = max_rounds
+        self.target_score = target_score
+        self.next_seed = seed
+        self.verbose = verbose
+
+    def _seeds(self, n):
+        s = range(self.next_seed, self.next_seed + n)
+        self.next_seed += n
+        return s
+
+    def estimate(self, ai_diff, target):
+        """
+        목표 승률과 비교가 가능해질 때까지 병렬 배치로 경기 수를 늘림.
+        반환: (승률, 판정) — 판정은 -1(목표보다 약함) / 0(허용오차 이내) / +1(목표보다 강함)
+        / UNRESOLVED(끝난 경기가 너무 적어 판정 불가, 승률은 끝난 경기가 없으면 None).
+        끝나지 않은 경기도 max_matches 예산에 들어가고, 라운드 수는 max_rounds로 제한
+        (예산이 다하면 목표와 구별되지 않는 승률이므로 0).
+        """
+        wins = n = unfinished = 0
+        for _ in range(self.max_rounds):
+            futures = [self.pool.submit(run_batch, ai_diff, REFERENCE, self._seeds(self.batch), self.target_score)
+                       for _ in range(self.workers)]
+            for f in futures:
+                w, p, u = f.result()
+                wins += w; n += p; unfinished += u
+            rate = wins / n if n else None
+            # Mostly no-result matches (e.g. rallies that never end): the rate means nothing
+            if unfinished > n or n == 0:
+                return rate, UNRESOLVED
+            lo, hi = wilson_interval(wins, n, self.z)
+            # Early stopping: CI tight enough, or it already excludes the target
+            if hi - lo <= 2 * self.tol:
+                return rate, (0 if abs(rate - target) <= self.tol else (1 if rate > target else -1))
+            if hi < target:
+                return rate, -1
+            if lo > target:
+                return rate, 1
+            if n + unfinished >= self.max_matches:
+                return rate, 0
+        return rate, 0                    # 라운드 예산 소진: 신뢰구간이 아직 목표를 포함 → 허용
+
+    def calibrate(self, name, target, max_steps=8):
+        """
+        skill 이분 탐색. 반환: (skill, 난이도, 승률) — 목표에 가장 가까웠던 후보.
+        측정이 안 되는 후보를 만나면 (skill, 난이도, None): 보정 실패
+        """
+        lo, hi = 0.0, 1.0
+        best = None
+        for _ in range(max_steps):
+            skill = (lo + hi) / 2
+            diff = params_for_skill(skill)
+            rate, verdict = self.estimate(diff, target)
+            if self.verbose:
+                shown = "unresolved" if verdict is UNRESOLVED else f"{rate:.3f}"
+                print(f"  {name:<6} skill={skill:.3f} win={shown} target={target:.2f} {diff}")
+            if verdict is UNRESOLVED:
+                return skill, diff, None
+            if best is None or abs(rate - target) < abs(best[2] - target):
+                best = (skill, diff, rate)
+            if verdict == 0:
+                break
+            if verdict < 0:
+                lo = skill
+            else:
+                hi = skill
+        return best
+
+
+def format_table(table):
+    lines = ["DIFFICULTY = {"]
+    for name, d in table.items():
+        key = f'"{name}":'
+        lines.append(
+            f'    {key:<9} {{"speed_scale": {d["speed_scale"]:.2f}, "aim_error": {d["aim_error"]:>2}, '
+            f'"predict": {d["predict"]:.2f}, "swing_prob": {d["swing_prob"]:.2f}}},'
+        )
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Calibrate DIFFICULTY presets by batch simulation")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    ap.add_argument("--batch", type=int, default=8, help="matches per worker per round")
+    ap.add_argument("--tol", type=float, default=0.05, help="accepted win-rate error")
+    ap.add_argument("--z", type=float, default=1.96, help="confidence z-score for early stopping")
+    ap.add_argument("--max-matches", type=int, default=2000, help="per candidate")
+    ap.add_argument("--max-rounds", type=int, default=MAX_ROUNDS, help="batch rounds per candidate")
+    ap.add_argument("--target-score", type=int, default=None, help="shorter matches for faster runs")
+    ap.add_argument("--seed", type=int, default=0)
+    for name, t in TARGETS.items():
+        ap.add_argument(f"--{name}", type=float, default=t, help=f"target AI win rate (default {t})")
+    args = ap.parse_args()
+
+    targets = {name: getattr(args, name) for name in TARGETS}
+    table = {}
+    unresolved = []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        cal = Calibrator(pool, args.workers, batch=args.batch, z=args.z, tol=args.tol,
+                         max_matches=args.max_matches, target_score=args.target_score, seed=args.seed,
+                         max_rounds=args.max_rounds)
+        for name, target in targets.items():
+            skill, diff, rate = cal.calibrate(name, target)
+            if rate is None:
+                print(f"{name}: unresolved at skill={skill:.3f} (too few finished matches)", file=sys.stderr)
+                unresolved.append(name)
+                continue
+            table[name] = diff
+            print(f"{name}: skill={skill:.3f} win_rate={rate:.3f} (target {target:.2f})")
+
+    if unresolved:
+        print(f"calibration failed for {', '.join(unresolved)}: no table written", file=sys.stderr)
+        return 1
+    print()
+    print(format_table(table))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import logging
+import os
+
+import pygame
+
+# ------------------------------------------------------------------------------
+# Display setup: logical resolution + hardware scaling
+# The game always draws into a surface of its logical size (all layout is in
+# those coordinates). With `scaled`, the window uses pygame's SCALED mode: the
+# SDL renderer uploads that one small surface per frame and the GPU stretches
+# it to the window / monitor, so a 1080p or 4K fullscreen costs the same CPU
+# as the 800x900 window. Mouse positions come back in logical coordinates.
+# Fullscreen always goes through SCALED (desktop resolution is never changed).
+# Scale factors are pygame's own SCALED behaviour: a window is enlarged by
+# whole-number factors (letterboxed), fullscreen fills the screen keeping the
+# aspect ratio. `sharp` picks the filter for the stretch: nearest (crisp
+# pixels) or linear (smooth). A SCALED window can be resized freely and
+# toggled to fullscreen (F11) in place; a plain window cannot, since switching
+# a window to a renderer later is not reliable in SDL. `vsync` is only
+# honoured by the SCALED renderer; if the driver refuses it the window opens
+# without it and a warning goes to the "bjc.display" logger.
+# ------------------------------------------------------------------------------
+
+
+class Display:
+    def __init__(self, size, scaled=False, fullscreen=False, vsync=False, sharp=True):
+        self.size = size             # 논리 해상도 (게임이 그리는 크기)
+        self.scaled = scaled
+        self.fullscreen = fullscreen
+        self.vsync = vsync
+        self.sharp = sharp
+        self.surface = None
+        self.log = logging.getLogger("bjc.display")
+        self.open()
+
+    def open(self):
+        """설정대로 창을 열고 그릴 표면을 반환 (한 번만 — 이후 전환은 toggle_fullscreen)"""
+        scaled = self.scaled or self.fullscreen
+        flags = 0
+        if scaled:
+            flags |= pygame.SCALED
+            # 확대 필터: nearest(선명) / linear(부드럽게) — set_mode가 텍스처를 만들 때 읽음
+            os.environ["SDL_RENDER_SCALE_QUALITY"] = "nearest" if self.sharp else "linear"
+        if self.fullscreen:
+            flags |= pygame.FULLSCREEN
+        elif scaled:
+            flags |= pygame.RESIZABLE      # 창 크기를 바꿔도 렌더러가 논리 해상도를 늘려 줌
+        vsync = int(self.vsync and scaled)
+        try:
+            self.surface = pygame.display.set_mode(self.size, flags, vsync=vsync)
+        except pygame.error:
+            if not vsync:
+                raise
+            self.log.warning("vsync not available: running without it")
+            self.vsync = False
+            self.surface = pygame.display.set_mode(self.size, flags)
+        return self.surface
+
+    def toggle_fullscreen(self):
+        """SCALED 창 <-> 전체 화면 (같은 표면 유지). 전환했으면 True"""
+        if not (self.scaled or self.fullscreen):
+            return False                      # 일반 창은 모니터 해상도를 바꿔야 해서 하지 않음
+        try:
+            pygame.display.toggle_fullscreen()
+        except pygame.error:
+            return False                      # 드라이버가 지원하지 않음 (dummy 등)
+        self.fullscreen = not self.fullscreen
+        return True
@@ -0,0 +1,155 @@
+try:
+    import numpy as np
+except ImportError:          # 드릴 모드는 NumPy가 있어야 사용 가능
+    np = None
+
+available = np is not None
+
+# ------------------------------------------------------------------------------
+# Multi-shuttle drill engine
+# - ShuttleSwarm: every shuttle lives in fixed-size arrays; the physics step is
+#   the same as Shuttle.update (per-frame friction, Euler step, speed clamp)
+#   but vectorised over all active shuttles. Shuttles leaving the court are
+#   deactivated and their slots recycled by the next launch (pool).
+# - SpatialHash: uniform grid rebuilt once per frame by sorting cell keys, so a
+#   racket query only looks at shuttles in the few cells it overlaps.
+# ------------------------------------------------------------------------------
+
+class ShuttleSwarm:
+    def __init__(self, capacity, bounds, friction, max_speed):
+        self.capacity = capacity
+        self.left, self.top, self.right, self.bottom = bounds
+        self.friction = friction
+        self.max_speed = max_speed
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.active = np.zeros(capacity, bool)
+
+    def count(self):
+        return int(self.active.sum())
+
+    def launch(self, x, y, vx, vy):
+        """빈 칸에 셔틀을 넣음. 풀이 가득 차면 -1"""
+        free = np.flatnonzero(~self.active)
+        if free.size == 0:
+            return -1
+        i = free[0]
+        self.pos[i] = (x, y)
+        self.vel[i] = (vx, vy)
+        self.active[i] = True
+        return i
+
+    def launch_many(self, x, y, vx, vy):
+        """같은 위치에서 여러 개 발사 (vx, vy 배열). 실제로 넣은 개수 반환"""
+        free = np.flatnonzero(~self.active)[:len(vx)]
+        n = free.size
+        if n:
+            self.pos[free] = (x, y)
+            self.vel[free, 0] = vx[:n]
+            self.vel[free, 1] = vy[:n]
+            self.active[free] = True
+        return n
+
+    def step(self, dt):
+        """
+        한 프레임 진행. 코트 밖으로 나간 셔틀은 회수하고
+        (위로 나감, 아래로 나감, 옆으로 나감) 개수를 반환
+        """
+        a = np.flatnonzero(self.active)
+        if a.size == 0:
+            return 0, 0, 0
+        vel = self.vel[a] * self.friction
+        pos = self.pos[a] + vel * dt
+        speed = np.hypot(vel[:, 0], vel[:, 1])
+        fast = speed > self.max_speed
+        if fast.any():
+            vel[fast] *= (self.max_speed / (speed[fast] + 1e-6))[:, None]
+        self.vel[a] = vel
+        self.pos[a] = pos
+
+        x, y = pos[:, 0], pos[:, 1]
+        out_side = (x < self.left) | (x > self.right)
+        out_top = ~out_side & (y < self.top)
+        out_bottom = ~out_side & (y > self.bottom)
+        out = out_side | out_top | out_bottom
+        if out.any():
+            self.active[a[out]] = False
+        return int(out_top.sum()), int(out_bottom.sum()), int(out_side.sum())
+
+    def clear(self):
+        self.active[:] = False
+
+
+class SpatialHash:
+    def __init__(self, bounds, cell):
+        self.x0, self.y0 = bounds[0], bounds[1]
+        self.cell = float(cell)
+        self.cols = max(1, int((bounds[2] - bounds[0]) // cell) + 1)
+        self.rows = max(1, int((bounds[3] - bounds[1]) // cell) + 1)
+        self.sorted_idx = np.zeros(0, np.intp)
+        self.starts = np.zeros(self.cols * self.rows + 1, np.intp)
+        self._cells = np.arange(self.cols * self.rows + 1)
+
+    def _cell_xy(self, x, y):
+        cx = np.clip(((x - self.x0) // self.cell).astype(np.intp), 0, self.cols - 1)
+        cy = np.clip(((y - self.y0) // self.cell).astype(np.intp), 0, self.rows - 1)
+        return cx, cy
+
+    def build(self, pos, idx):
+        """pos[idx] 위치로 격자 재구성 (칸 번호로 정렬 → 칸별 시작 위치)"""
+        if idx.size == 0:
+            self.sorted_idx = idx
+            self.starts[:] = 0
+            return
+        cx, cy = self._cell_xy(pos[idx, 0], pos[idx, 1])
+        keys = cy * self.cols + cx
+        order = np.argsort(keys, kind="stable")
+        self.sorted_idx = idx[order]
+        self.starts = np.searchsorted(keys[order], self._cells)
+
+    def query(self, x, y, r):
+        """원(x, y, r)이 걸치는 칸들의 후보 인덱스"""
+        c0 = max(0, int((x - r - self.x0) // self.cell)); c1 = min(self.cols - 1, int((x + r - self.x0) // self.cell))
+        r0 = max(0, int((y - r - self.y0) // self.cell)); r1 = min(self.rows - 1, int((y + r - self.y0) // self.cell))
+        if c0 > c1 or r0 > r1:
+            return self.sorted_idx[:0]
+        parts = []
+        for row in range(r0, r1 + 1):
+            # 한 행에서 연속된 칸들은 정렬된 배열에서도 연속 구간
+            a = self.starts[row * self.cols + c0]
+            b = self.starts[row * self.cols + c1 + 1]
+            if b > a:
+                parts.append(self.sorted_idx[a:b])
+        if not parts:
+            return self.sorted_idx[:0]
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+
+class Feeder:
+    """코트 위쪽에서 아래 하프로 셔틀을 일정 간격/묶음으로 보내는 가상 피더"""
+    def __init__(self, swarm, origin, target_rect, speed, interval=0.5, volley=5, seed=None):
+        self.swarm = swarm
+        self.origin = origin
+        self.target = target_rect          # (left, top, right, bottom) — 보낼 목표 영역
+        self.speed = speed
+        self.interval = interval
+        self.volley = volley
+        self.timer = 0.0
+        self.launched = 0
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, dt):
+        self.timer -= dt
+        if self.timer > 0:
+            return 0
+        self.timer += self.interval
+        n = self.volley
+        l, t, r, b = self.target
+        tx = self.rng.uniform(l, r, n); ty = self.rng.uniform(t, b, n)
+        ox, oy = self.origin
+        dx = tx - ox; dy = ty - oy
+        d = np.hypot(dx, dy) + 1e-6
+        sp = self.speed * self.rng.uniform(0.8, 1.1, n)
+        sent = self.swarm.launch_many(ox, oy, dx / d * sp, dy / d * sp)
+        self.launched += sent
+        return sent
@@ -0,0 +1,230 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")   # 창 없이 렌더링
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import glob
+import multiprocessing
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pygame
+
+import bjc_game as game
+import bjc_record
+
+# ------------------------------------------------------------------------------
+# Replay-to-video exporter (highlight reels)
+# Re-simulates recorded matches (bjc_record) headlessly, draws every needed
+# frame with the real GameScene.draw into an offscreen surface and streams
+# the raw RGB bytes (pygame.image.tobytes) into a local encoder process
+# (ffmpeg, rawvideo on stdin) — or writes an image sequence / one raw .rgb
+# file when no encoder is installed. Video time follows the recorded dt, so a
+# match recorded at an uneven frame rate still plays at real speed: frames are
+# repeated or dropped to hit the output fps.
+# --highlights keeps only the last seconds of every rally (found in a first,
+# draw-free pass — re-simulation is deterministic so both passes agree).
+# Each recording is an independent job; --workers N exports N at once
+# (one process per core, spawn start method so no window state is shared).
+#
+# Usage: python bjc_export.py recordings/*.bjcr [--out exports] [--format mp4|png|bmp|tga|rgb]
+#                             [--highlights] [--scale 0.5] [--fps 60] [--workers N]
+# ------------------------------------------------------------------------------
+
+HIGHLIGHT_BEFORE = 5.0     # 득점 전 몇 초를 하이라이트에 넣을지
+HIGHLIGHT_AFTER  = 1.0     # 득점 후 (점수 깜빡임까지)
+FORMATS = ("mp4", "png", "bmp", "tga", "rgb")
+
+
+def find_points(rec):
+    """1차 패스(그리기 없음): 득점이 난 시각(기록 시작부터 초) 목록"""
+    game.TELEMETRY = None
+    points = []
+    t = 0.0
+    last = None
+    for i, scene in bjc_record.replay(game, rec):
+        t += rec.dts[i]
+        total = scene.score["top"] + scene.score["bottom"]
+        if last is not None and total != last:
+            points.append(t)
+        last = total
+    return points
+
+
+def highlight_spans(points, before=HIGHLIGHT_BEFORE, after=HIGHLIGHT_AFTER):
+    """득점 시각마다 [t-before, t+after] 구간, 겹치면 합침"""
+    spans = []
+    for t in points:
+        a, b = max(0.0, t - before), t + after
+        if spans and a <= spans[-1][1]:
+            spans[-1][1] = max(spans[-1][1], b)
+        else:
+            spans.append([a, b])
+    return spans
+
+
+# --- 출력 (프레임 바이트를 받는 쪽) ------------------------------------------------
+
+class EncoderSink:
+    """로컬 인코더 프로세스(ffmpeg)의 stdin으로 rgb24 프레임을 흘려보냄"""
+    def __init__(self, path, size, fps, ffmpeg="ffmpeg"):
+        w, h = size
+        self.path = path
+        self.proc = subprocess.Popen(
+            [ffmpeg, "-loglevel", "error", "-y", "-f", "rawvideo", "-pix_fmt", "rgb24",
+             "-s", f"{w}x{h}", "-r", str(fps), "-i", "-",
+             "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p", path],
+            stdin=subprocess.PIPE)
+
+    def write(self, surf):
+        self.proc.stdin.write(pygame.image.tobytes(surf, "RGB"))
+
+    def close(self):
+        self.proc.stdin.close()
+        if self.proc.wait() != 0:
+            raise RuntimeError(f"encoder failed for {self.path} (exit {self.proc.returncode})")
+
+
+class RawSink:
+    """rgb24 프레임을 한 파일에 이어 붙임 (나중에 아무 인코더로: -f rawvideo -pix_fmt rgb24)"""
+    def __init__(self, path, size, fps):
+        self.path = path
+        self.f = open(path, "wb")
+
+    def write(self, surf):
+        self.f.write(pygame.image.tobytes(surf, "RGB"))
+
+    def close(self):
+        self.f.close()
+
+
+class ImageSequenceSink:
+    def __init__(self, directory, ext):
+        self.path = directory
+        self.ext = ext
+        self.n = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, surf):
+        pygame.image.save(surf, os.path.join(self.path, f"frame_{self.n:06d}.{self.ext}"))
+        self.n += 1
+
+    def close(self):
+        pass
+
+
+def open_sink(fmt, out_base, size, fps):
+    if fmt == "mp4":
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise RuntimeError("ffmpeg not found — use --format png/bmp/tga (image sequence) or rgb (raw)")
+        return EncoderSink(out_base + ".mp4", size, fps, ffmpeg)
+    if fmt == "rgb":
+        return RawSink(out_base + ".rgb", size, fps)
+    return ImageSequenceSink(out_base, fmt)
+
+
+# --- 한 경기 내보내기 -------------------------------------------------------------
+
+def export(path, out_dir="exports", fmt="mp4", highlights=False, scale=1.0, fps=game.FPS):
+    """기록 하나를 영상/이미지로. 결과 요약 dict 반환 (프로세스 풀에서도 그대로 호출)"""
+    t0 = time.perf_counter()
+    game.TELEMETRY = None
+    rec = bjc_record.load(path)
+    spans = highlight_spans(find_points(rec)) if highlights else [[0.0, float("inf")]]
+
+    frame = pygame.Surface((game.WIDTH, game.HEIGHT)).convert()
+    size = (max(2, int(game.WIDTH * scale) // 2 * 2), max(2, int(game.HEIGHT * scale) // 2 * 2))  # yuv420p: 짝수
+    scaled = pygame.Surface(size).convert() if size != frame.get_size() else None
+
+    os.makedirs(out_dir, exist_ok=True)
+    base = os.path.join(out_dir, os.path.splitext(os.path.basename(path))[0] + ("-highlights" if highlights else ""))
+    sink = open_sink(fmt, base, size, fps)
+    period = 1.0 / fps
+    written = drawn = 0
+    try:
+        t = 0.0
+        span = 0
+        next_out = spans[0][0] if spans else float("inf")   # 다음 출력 프레임 시각
+        for i, scene in bjc_record.replay(game, rec):
+            t += rec.dts[i]
+            while span < len(spans) and t > spans[span][1]:
+                span += 1
+                if span < len(spans):
+                    next_out = max(next_out, spans[span][0])
+            if span >= len(spans):
+                break
+            if t < next_out:
+                continue                 # 출력 fps보다 촘촘한 프레임 → 건너뜀 (그리지도 않음)
+            scene.draw(frame)
+            drawn += 1
+            out = frame
+            if scaled is not None:
+                pygame.transform.smoothscale(frame, size, scaled)
+                out = scaled
+            while t >= next_out and next_out <= spans[span][1]:
+                sink.write(out)          # 기록이 출력 fps보다 성기면 같은 프레임 반복
+                written += 1
+                next_out += period
+    finally:
+        sink.close()
+    return {"recording": path, "output": sink.path, "frames": written, "drawn": drawn,
+            "seconds": written / fps, "spans": len(spans), "elapsed": time.perf_counter() - t0}
+
+
+def export_many(paths, workers=None, **kw):
+    """여러 기록을 프로세스 풀로 동시에 (경기 하나 = 작업 하나). 실패한 기록은 error 항목으로"""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(paths) == 1:
+        for p in paths:
+            try:
+                yield export(p, **kw)
+            except (OSError, ValueError, RuntimeError) as e:
+                yield {"recording": p, "error": str(e)}
+        return
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        futures = {pool.submit(export, p, **kw): p for p in paths}
+        for fut in as_completed(futures):
+            try:
+                yield fut.result()
+            except (OSError, ValueError, RuntimeError) as e:
+                yield {"recording": futures[fut], "error": str(e)}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Export recorded matches to video / image sequences")
+    ap.add_argument("recordings", nargs="*", help=".bjcr files (default: recordings/*.bjcr)")
+    ap.add_argument("--out", default="exports")
+    ap.add_argument("--format", choices=FORMATS, default="mp4")
+    ap.add_argument("--highlights", action="store_true", help="only the end of every rally")
+    ap.add_argument("--scale", type=float, default=1.0, help="output size relative to 800x900")
+    ap.add_argument("--fps", type=int, default=game.FPS)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = ap.parse_args()
+
+    paths = args.recordings or sorted(glob.glob(os.path.join(game.RECORD_DIR or "recordings", "*.bjcr")))
+    if not paths:
+        print("no recordings", file=sys.stderr)
+        return 1
+    t0 = time.perf_counter()
+    total = failed = 0
+    for r in export_many(paths, args.workers, out_dir=args.out, fmt=args.format,
+                         highlights=args.highlights, scale=args.scale, fps=args.fps):
+        if "error" in r:
+            print(f"{r['recording']}: FAILED {r['error']}", file=sys.stderr, flush=True)
+            failed += 1
+            continue
+        total += r["frames"]
+        print(f"{r['output']}: {r['frames']} frames ({r['seconds']:.1f} s video, {r['spans']} spans) "
+              f"in {r['elapsed']:.1f} s", flush=True)
+    wall = time.perf_counter() - t0
+    print(f"{len(paths)} recordings, {total} frames in {wall:.1f} s ({total / max(wall, 1e-9):.0f} frames/s)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
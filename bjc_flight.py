@@ -0,0 +1,221 @@
+import array
+import math
+import os
+import struct
+import sys
+
+# ------------------------------------------------------------------------------
+# Shuttle flight with quadratic drag and height (z)
+# Offline: every (launch speed, elevation angle) pair on a grid is integrated
+# with RK4 (gravity + drag proportional to speed squared) and sampled every
+# TABLE_DT seconds -> distance along the ground, height and horizontal speed.
+# The table is written once to a small binary file (`python bjc_flight.py`).
+# Runtime: a hit blends the 4 neighbouring grid rows and unrolls them into
+# screen coordinates in the shuttle's own preallocated Flight buffers (once
+# per shot); each tick is then a linear interpolation in time, which is
+# cheaper than the old Euler step with its speed clamp.
+# ------------------------------------------------------------------------------
+
+GRAVITY        = 300.0                       # px/s²
+TERMINAL_SPEED = 600.0                       # 셔틀 종단 속도(px/s) — 셔틀은 금방 느려짐
+DRAG_K         = GRAVITY / TERMINAL_SPEED ** 2
+LAUNCH_Z       = 80.0                        # 타점 높이(px)
+
+SPEED_MIN, SPEED_MAX, SPEED_N = 200.0, 800.0, 13
+ANGLE_MIN, ANGLE_MAX, ANGLE_N = -20.0, 60.0, 17   # 올려 치는 각도(도)
+TABLE_DT     = 1.0 / 30
+TABLE_STEPS  = 121                           # 4초
+RK4_SUBSTEPS = 8
+
+_MAGIC  = b"BJCF"
+_HEADER = struct.Struct("<4s3I8f")   # magic, speed_n, angle_n, steps, 범위/물리 상수
+
+
+def _deriv(h, v, k, g):
+    sp = math.hypot(h, v)
+    return -k * sp * h, -g - k * sp * v
+
+
+def integrate(speed, angle, z0=LAUNCH_Z, g=GRAVITY, k=DRAG_K,
+              dt=TABLE_DT, steps=TABLE_STEPS, substeps=RK4_SUBSTEPS):
+    """
+    한 궤적을 RK4로 적분해 dt 간격 steps개의 (거리, 높이, 수평 속도) 목록 3개를 반환.
+    바닥(z=0)에 닿으면 그 지점에서 멈춘 값으로 나머지를 채움.
+    """
+    a = math.radians(angle)
+    d, z = 0.0, z0
+    h, v = speed * math.cos(a), speed * math.sin(a)
+    ds, zs, hs = [d], [z], [h]
+    sub = dt / substeps
+    landed = False
+    for _ in range(steps - 1):
+        if not landed:
+            for _ in range(substeps):
+                k1h, k1v = _deriv(h, v, k, g)
+                k2h, k2v = _deriv(h + k1h * sub / 2, v + k1v * sub / 2, k, g)
+                k3h, k3v = _deriv(h + k2h * sub / 2, v + k2v * sub / 2, k, g)
+                k4h, k4v = _deriv(h + k3h * sub, v + k3v * sub, k, g)
+                # 위치는 속도의 RK4 가중 평균으로 (d' = h, z' = v)
+                nd = d + sub * (6 * h + sub * (k1h + k2h + k3h)) / 6
+                nz = z + sub * (6 * v + sub * (k1v + k2v + k3v)) / 6
+                h += sub * (k1h + 2 * k2h + 2 * k3h + k4h) / 6
+                v += sub * (k1v + 2 * k2v + 2 * k3v + k4v) / 6
+                if nz <= 0.0:
+                    # 서브스텝 안에서 바닥을 지난 지점을 선형 보간
+                    u = z / (z - nz)
+                    d += (nd - d) * u
+                    z = h = v = 0.0
+                    landed = True
+                    break
+                d, z = nd, nz
+        ds.append(d); zs.append(z); hs.append(h)
+    return ds, zs, hs
+
+
+class Flight:
+    """
+    한 타구의 궤적 버퍼(화면 좌표로 미리 풀어 둠)와 진행 시간.
+    버퍼는 미리 할당해 타구마다 재사용 — 매 틱은 시간 보간만.
+    """
+    def __init__(self, steps=TABLE_STEPS, dt=TABLE_DT):
+        self.rate = 1.0 / dt
+        self.last = steps - 1
+        self.x  = [0.0] * steps
+        self.y  = [0.0] * steps
+        self.z  = [0.0] * steps
+        self.vx = [0.0] * steps
+        self.vy = [0.0] * steps
+        self.t = 0.0
+        self.landed = True
+        self.launch = (0.0,) * 6    # 마지막 blend 입력 (speed, angle, 원점 x/y, 방향 x/y) — 저장/복원용
+
+    def advance(self, dt, pos, vel):
+        """시간을 dt만큼 진행해 pos/vel 목록을 제자리 갱신하고 높이를 반환"""
+        t = self.t = self.t + dt
+        u = t * self.rate
+        i = int(u)
+        if i < self.last:
+            f = u - i
+        else:
+            i, f = self.last - 1, 1.0
+        x, y, z = self.x, self.y, self.z
+        x0 = x[i]; y0 = y[i]; z0 = z[i]
+        pos[0] = x0 + (x[i + 1] - x0) * f
+        pos[1] = y0 + (y[i + 1] - y0) * f
+        vel[0] = self.vx[i]
+        vel[1] = self.vy[i]
+        height = z0 + (z[i + 1] - z0) * f
+        if height > 0.0:
+            return height
+        self.landed = True
+        return 0.0
+
+
+class FlightTable:
+    def __init__(self, d, z, h, params):
+        self.d, self.z, self.h = d, z, h      # 평평한 float 배열: [(speed_i * ANGLE_N + angle_i) * steps + t]
+        self.params = params
+        (self.speed_n, self.angle_n, self.steps,
+         self.speed_min, self.speed_max, self.angle_min, self.angle_max,
+         self.dt, self.g, self.k, self.z0) = params
+        self.speed_step = (self.speed_max - self.speed_min) / (self.speed_n - 1)
+        self.angle_step = (self.angle_max - self.angle_min) / (self.angle_n - 1)
+
+    @staticmethod
+    def current_params():
+        return (SPEED_N, ANGLE_N, TABLE_STEPS, SPEED_MIN, SPEED_MAX, ANGLE_MIN, ANGLE_MAX,
+                TABLE_DT, GRAVITY, DRAG_K, LAUNCH_Z)
+
+    @classmethod
+    def build(cls):
+        params = cls.current_params()
+        d, z, h = array.array("f"), array.array("f"), array.array("f")
+        for si in range(SPEED_N):
+            speed = SPEED_MIN + (SPEED_MAX - SPEED_MIN) * si / (SPEED_N - 1)
+            for ai in range(ANGLE_N):
+                angle = ANGLE_MIN + (ANGLE_MAX - ANGLE_MIN) * ai / (ANGLE_N - 1)
+                ds, zs, hs = integrate(speed, angle)
+                d.extend(ds); z.extend(zs); h.extend(hs)
+        return cls(d, z, h, params)
+
+    def save(self, path):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, *self.params))
+            for col in (self.d, self.z, self.h):
+                f.write(col.tobytes())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """파일이 없거나 상수가 바뀌어 맞지 않으면 None"""
+        try:
+            with open(path, "rb") as f:
+                head = f.read(_HEADER.size)
+                if len(head) != _HEADER.size:
+                    return None
+                magic, *params = _HEADER.unpack(head)
+                expect = array.array("f", cls.current_params()[3:])   # float32로 저장된 값끼리 비교
+                if magic != _MAGIC or tuple(params[:3]) != cls.current_params()[:3] \
+                        or array.array("f", params[3:]) != expect:
+                    return None
+                n = params[0] * params[1] * params[2]
+                cols = []
+                for _ in range(3):
+                    col = array.array("f")
+                    col.fromfile(f, n)
+                    cols.append(col)
+        except (OSError, EOFError, struct.error):
+            return None
+        return cls(*cols, tuple(params))
+
+    @classmethod
+    def load_or_build(cls, path):
+        table = cls.load(path) if path else None
+        if table is None:
+            table = cls.build()
+            if path:
+                try:
+                    table.save(path)
+                except OSError:
+                    pass      # 저장 못 해도 이번 실행에선 메모리 표 사용
+        return table
+
+    def blend(self, speed, angle, origin, direction, out):
+        """
+        (speed, angle) 주변 격자 4줄을 이중 선형 보간하고, 발사 지점/수평 방향으로
+        화면 좌표까지 풀어 out(Flight)에 채운 뒤 비행 시작. 타구당 한 번.
+        """
+        su = (min(max(speed, self.speed_min), self.speed_max) - self.speed_min) / self.speed_step
+        au = (min(max(angle, self.angle_min), self.angle_max) - self.angle_min) / self.angle_step
+        si = min(int(su), self.speed_n - 2); sf = su - si
+        ai = min(int(au), self.angle_n - 2); af = au - ai
+        steps = self.steps
+        r00 = (si * self.angle_n + ai) * steps
+        r01 = r00 + steps
+        r10 = r00 + self.angle_n * steps
+        r11 = r10 + steps
+        w00 = (1 - sf) * (1 - af); w01 = (1 - sf) * af
+        w10 = sf * (1 - af);       w11 = sf * af
+        ox, oy = origin
+        dx, dy = direction
+        D, Z, H = self.d, self.z, self.h
+        for t in range(steps):
+            a, b, c, e = r00 + t, r01 + t, r10 + t, r11 + t
+            d = D[a] * w00 + D[b] * w01 + D[c] * w10 + D[e] * w11
+            h = H[a] * w00 + H[b] * w01 + H[c] * w10 + H[e] * w11
+            out.x[t] = ox + dx * d
+            out.y[t] = oy + dy * d
+            out.z[t] = Z[a] * w00 + Z[b] * w01 + Z[c] * w10 + Z[e] * w11
+            out.vx[t] = dx * h
+            out.vy[t] = dy * h
+        out.t = 0.0
+        out.landed = False
+        out.launch = (speed, angle, ox, oy, dx, dy)
+        return out
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "flight_table.bin"
+    table = FlightTable.build()
+    table.save(path)
+    print(f"wrote {path}: {SPEED_N} speeds x {ANGLE_N} angles x {TABLE_STEPS} samples")
@@ -1,8 +1,32 @@
 import pygame
 import sys
+import atexit
 from pygame import transform as pg_transform
 import math
 import random
+import itertools
+import struct
+import os
+import time
+import asyncio
+
+from bjc_telemetry import TelemetryRecorder
+from bjc_watchdog import FrameWatchdog
+from bjc_gc import GCPolicy
+from bjc_alloc import FrameAllocCounter
+from bjc_particles import ParticlePool, make_sprites
+import bjc_drill
+from bjc_broadphase import SweepAndPrune, time_of_impact
+from bjc_flight import Flight, FlightTable
+from bjc_linecall import first_crossing, SIDE, ShotHistory, ChallengeReplay
+from bjc_ai_worker import AIWorker, AISnapshot, predict_target_x, swing_intent
+from bjc_aio import FramePacer, start_service, stop_services
+from bjc_spectate import SpectatorServer, QUANT as SPECTATE_QUANT
+from bjc_save import MatchSaver, MATCH, SHUTTLE, PLAYER, RNG, SIDE_CODE, SIDE_NAME, peek_doubles
+from bjc_journal import Journal
+from bjc_record import MatchRecorder, RESET as RECORD_RESET, SERVE as RECORD_SERVE
+from bjc_replay import StateRing, InstantReplay
+from bjc_display import Display
 
 # =========================================================
 # 1. 기본 설정 & 전역 상수
@@ -10,11 +34,20 @@ import random
 
 pygame.mixer.pre_init(frequency=44100, size=-16, channels=2, buffer=256)
 pygame.init()
-WIDTH, HEIGHT = 800, 900
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
+WIDTH, HEIGHT = 800, 900   # 논리 해상도 — 모든 배치 좌표의 기준 (창/모니터 크기와 무관)
+# 화면: SCALED면 논리 해상도로 그린 한 장을 SDL 렌더러(GPU)가 창/모니터 크기로 늘림
+DISPLAY_SCALED     = False   # True: 크기를 바꿀 수 있는 창 + 하드웨어 확대 (저사양 PC + 큰 모니터)
+DISPLAY_FULLSCREEN = False   # 전체 화면으로 시작 (항상 SCALED — 모니터 해상도는 그대로). F11로 전환
+DISPLAY_VSYNC      = False   # 모니터 주사율에 맞춰 표시 (SCALED일 때만)
+DISPLAY_SHARP      = True    # 확대 필터: True면 nearest(선명한 픽셀), False면 linear(부드럽게)
+DISPLAY = Display((WIDTH, HEIGHT), DISPLAY_SCALED, DISPLAY_FULLSCREEN, DISPLAY_VSYNC, DISPLAY_SHARP)
+screen = DISPLAY.surface
 pygame.display.set_caption("BJC - Badminton Junkies Crew")
 clock = pygame.time.Clock()
 FPS = 60
+IDLE_WAIT_MS = 1000   # 정적 씬에서 입력 없이 잠드는 최대 시간(ms)
+IDLE_POLL    = 0.05   # asyncio 루프: 정적 씬에서 입력을 확인하는 간격(초)
+ASYNC_LOOP   = False  # True: asyncio 루프(main_async)로 실행 — 네트워크/I/O 코루틴과 같이 돌 때
 
 # 색/폰트
 WHITE = (255, 255, 255)
@@ -50,14 +83,99 @@ MIN_VY_AFTER_HIT = 320.0   # 타격 후 최소 수직 속도(상대편으로 확
 CROSS_NUDGE_PX   = 14.0    # 타격 후 새 속도 방향으로 살짝 밀어내는 거리(겹침 방지)
 COURT_OUTER_LINE_W = 6  # 바깥 라인 두께(draw의 MAIN_LINE_W와 같게 유지)
 
+# 셔틀 궤적(잔상)
+ENABLE_TRAIL      = True
+TRAIL_LEN         = 12                 # 최근 위치 개수(60FPS 기준 0.2초)
+TRAIL_COLOR       = (150, 190, 235)    # 일반 타구
+TRAIL_SMASH_COLOR = (30, 144, 255)     # 빠른 타구(스매시)
+TRAIL_SMASH_SPEED = BASE_HIT_SPEED + POWER_HIT_BONUS * 0.5
+
+# 셔틀 비행 모델
+#   "arcade": 기존 방식(프레임마다 선형 감속 + 최대 속도 제한, 높이 없음)
+#   "drag"  : 높이(z) + 2차 공기저항 — 미리 계산한 궤적표(bjc_flight)를 보간, 바닥에 떨어지면 판정
+SHUTTLE_PHYSICS = "arcade"
+FLIGHT_TABLE    = "flight_table.bin"   # 궤적표 파일 (없거나 상수가 바뀌면 한 번 만들어 저장)
+SERVE_ANGLE     = 25.0                 # 올려 치는 각도(도)
+CLEAR_ANGLE     = 30.0
+SMASH_ANGLE     = 2.0
+PLAYER_REACH_Z  = 150.0                # 이보다 높이 뜬 셔틀은 못 침(머리 위로 넘어감)
+Z_DRAW_SCALE    = 0.4                  # 높이 → 화면 위쪽 오프셋(px/px)
+SHADOW_COLOR    = (200, 208, 218)
+
+# 타격/라인 판정 파티클 (NumPy 없으면 자동으로 꺼짐)
+PARTICLE_KINDS    = [(3, (255, 190, 60)),    # 0: 타격 불꽃
+                     (4, (150, 140, 120))]   # 1: 라인 먼지
+PARTICLE_CAPACITY = 512
+PARTICLE_SPAWN_BUDGET = 64    # 프레임당 최대 생성 수
+PARTICLE_DRAW_BUDGET  = 256   # 프레임당 최대 그리기 수
+SPARK, DUST = 0, 1
+
+# 드릴(연습) 모드
+DRILL_CAPACITY  = 512                  # 동시에 날 수 있는 셔틀 최대 수(풀 크기)
+DRILL_CELL      = 64                   # 공간 해시 격자 크기(px)
+DRILL_INTENSITY = {                    # 숫자키 -> (발사 간격 초, 한 번에 보내는 수)
+    pygame.K_1: (0.8, 1),
+    pygame.K_2: (0.6, 5),
+    pygame.K_3: (0.5, 20),
+    pygame.K_4: (0.4, 60),
+}
+
+# 라인 판정 챌린지(느린 확대 리플레이)
+HISTORY_SECONDS = 4.0    # 셔틀 궤적 기록 길이(초) — 마지막 타구 리플레이용
+CHALLENGE_SPEED = 0.25   # 리플레이 재생 속도 배율
+CHALLENGE_ZOOM  = 4      # 판정 지점 주변 확대 배율
+
+# 인스턴트 리플레이(최근 몇 초를 상태 링버퍼로 다시 그림)
+INSTANT_REPLAY_SECONDS = 6.0                    # 기록 길이(초). 0이면 끔
+INSTANT_REPLAY_SPEEDS  = (0.25, 0.5, 1.0, 2.0)  # ←/→로 바꾸는 재생 속도
+
 # 점수 애니메이션
 SCORE_FLASH_DURATION = 0.45   # 깜빡임 총 시간(초)
 SCORE_MAX_SCALE      = 1.25   # 글자 최대 확대 배율
 SCORE_FLASH_COLOR    = (30, 144, 255)  # 하이라이트 색
+SCORE_FLASH_STEPS    = 16     # 점수가 바뀔 때 미리 렌더해 두는 깜빡임 단계 수
+
+# === 텔레메트리 ===
+TELEMETRY_DIR = "telemetry"   # 샷/랠리 기록 폴더. None이면 기록 안 함
+TELEMETRY = None              # main()에서 TelemetryRecorder 생성
+
+# === 프레임 멈춤 감시 ===
+WATCHDOG_LOG    = "logs/hitches.log"   # None이면 감시 안 함
+WATCHDOG_FACTOR = 3.0                  # 프레임 예산(1/FPS)의 몇 배부터 멈춤으로 볼지
+
+# === GC 정책 ===
+GC_POLICY = True   # 랠리 중 자동 GC 중지, 서브 대기/씬 전환 때 나눠서 수거
+GC_REPORT = False  # True: 종료 시 GC 멈춤 시간 요약을 stdout에 출력
+
+# === 비동기 AI ===
+AI_WORKER        = None   # None: 매 프레임 직접 계산 / "thread" / "process": 워커에 결정을 맡김
+AI_MAX_STALENESS = 0.10   # 이보다 오래된 결정(초)은 버리고 그 프레임은 기본 AI로
+
+# === 관전 방송 ===
+SPECTATE_PORT  = None          # 예: 50607 — 진행 중인 경기를 TCP로 방송 (asyncio 루프로 실행됨)
+SPECTATE_HOST  = "127.0.0.1"
+SPECTATE_KEYFRAME_EVERY = FPS  # 키프레임 간격(틱) — 나머지 틱은 델타
+
+# === 경기 저장/이어하기 ===
+SAVE_PATH      = "saves/match.bin"   # None이면 끔. ESC/득점/주기적으로 저장 → 메뉴의 Resume으로 이어하기
+AUTOSAVE_EVERY = 2.0                 # 경기 중 자동 저장 간격(초) — 정전 대비
+
+# === 세션 저널 ===
+JOURNAL_DIR    = "journal"   # None이면 끔. 날짜별 파일(리그 나이트 = 하루)에 득점/경기 종료/설정 변경 기록
+JOURNAL_GROUP  = 0.02        # 그룹 커밋 창(초): 이 안에 모인 기록은 write/fsync 한 번
+
+# === 경기 기록 (하이라이트 영상용) ===
+RECORD_DIR = "recordings"    # None이면 끔. 경기마다 시작 상태 + 프레임별 dt/입력 → bjc_export.py로 영상
+
+# === 디버그 ===
+DEBUG_ALLOC = False   # True: 프레임별 메모리 할당 수(tracemalloc)를 창 제목에 표시 (느려짐)
 
 # === 키 매핑 ===
 KEY_SERVE = pygame.K_RETURN   # Enter로 서브
 KEY_SMASH = pygame.K_SPACE    # Space는 스매시 전용
+KEY_CHALLENGE = pygame.K_c    # 직전 라인 판정 리플레이
+KEY_INSTANT_REPLAY = pygame.K_i   # 최근 몇 초 다시 보기
+KEY_FULLSCREEN = pygame.K_F11     # 창 <-> 전체 화면 (SCALED일 때)
 
 DIFFICULTY = {
     "easy":   {"speed_scale": 0.6, "aim_error": 50, "predict": 0.10, "swing_prob": 0.55},
@@ -76,17 +194,36 @@ class Button:
         self.rect = pygame.Rect(0, 0, *size)
         self.rect.center = center
         self.hovered = False
+        self.dirty = True
         self.text_surf = FONT_M.render(text, True, self.fg)
         self.text_rect = self.text_surf.get_rect(center=self.rect.center)
+        # 기본/호버 두 상태를 미리 렌더 → draw는 blit 한 번
+        hover_bg = tuple(min(255, c+25) for c in self.bg)
+        self.images = (self._render(self.bg), self._render(hover_bg))
+
+    def _render(self, color):
+        img = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        local = img.get_rect()
+        pygame.draw.rect(img, color, local, border_radius=12)
+        pygame.draw.rect(img, (0,0,0), local, width=2, border_radius=12)
+        img.blit(self.text_surf, self.text_surf.get_rect(center=local.center))
+        return img.convert_alpha()
+
+    @property
+    def image(self):
+        return self.images[1 if self.hovered else 0]
 
     def draw(self, surf):
-        color = tuple(min(255, c+25) for c in self.bg) if self.hovered else self.bg
-        pygame.draw.rect(surf, color, self.rect, border_radius=12)
-        pygame.draw.rect(surf, (0,0,0), self.rect, width=2, border_radius=12)
-        surf.blit(self.text_surf, self.text_rect)
+        surf.blit(self.image, self.rect)
 
     def update(self, mouse_pos):
-        self.hovered = self.rect.collidepoint(mouse_pos)
+        # 호버 상태가 바뀌었는지 반환 (정적 씬의 재그리기 판단용)
+        hovered = self.rect.collidepoint(mouse_pos)
+        changed = hovered != self.hovered
+        self.hovered = hovered
+        if changed:
+            self.dirty = True
+        return changed
 
     def handle_event(self, event, on_click):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and self.hovered:
@@ -96,22 +233,170 @@ class Label:
     def __init__(self, text, center, font=FONT_L, color=BLACK):
         self.font = font
         self.color = color
-        self.set_text(text)
         self.center = center
+        self.text = None
+        self.set_text(text)
 
     def set_text(self, text):
+        if text == self.text:
+            return          # 같은 글자는 다시 렌더하지 않음
         self.text = text
         self.surf = self.font.render(self.text, True, self.color)
-        self.rect = self.surf.get_rect()
+        self.rect = self.surf.get_rect(center=self.center)
+        self.dirty = True
+
+    @property
+    def image(self):
+        return self.surf
 
     def draw(self, surf):
-        self.rect.center = self.center
         surf.blit(self.surf, self.rect)
 
+class UILayer:
+    """
+    정적 UI 씬용 retained 레이어.
+    배경(채우기/고정 글자/상자)은 한 번만 그려 두고, dirty 위젯만 캐시 표면에 다시 합성한다.
+    draw()는 전체를 그렸으면 None, 아니면 바뀐 영역 목록(빈 목록 가능)을 반환 → display.update(rects)
+    """
+    def __init__(self, paint_background, widgets=()):
+        self.background = pygame.Surface((WIDTH, HEIGHT)).convert()
+        paint_background(self.background)
+        self.surface = self.background.copy()
+        self.widgets = list(widgets)
+        self.drawn = {}      # 위젯 -> 마지막으로 그린 영역 (글자 길이가 바뀌면 이전 영역도 지움)
+        self.full = True
+
+    def invalidate(self):
+        self.full = True
+
+    def draw(self, target):
+        if self.full:
+            self.surface.blit(self.background, (0, 0))
+            for w in self.widgets:
+                self.surface.blit(w.image, w.rect)
+                self.drawn[w] = w.rect.copy()
+                w.dirty = False
+            target.blit(self.surface, (0, 0))
+            self.full = False
+            return None
+
+        rects = []
+        for w in self.widgets:
+            if not w.dirty:
+                continue
+            area = w.rect.union(self.drawn.get(w, w.rect))
+            self.surface.blit(self.background, area, area)
+            self.surface.blit(w.image, w.rect)
+            self.drawn[w] = w.rect.copy()
+            w.dirty = False
+            rects.append(area)
+        for r in rects:
+            target.blit(self.surface, r, r)
+        return rects
+
 # =========================================================
 # 3. 씬(Scene) 기본 구조
 # =========================================================
+# --- 스프라이트 아틀라스 ---
+# 선수 몸통(사람/AI), 라켓 링, 셔틀을 시작할 때 한 장에 미리 그려 두고(convert_alpha),
+# 매 프레임 원 그리기 대신 subsurface를 blit만 한다.
+PLAYER_BODY_R = 16
+PLAYER_COLORS = {True: (60, 60, 60), False: (100, 100, 100)}   # is_human -> 색
+
+class SpriteAtlas:
+    def __init__(self, shuttle_radius=10):
+        specs = [   # 이름, 반지름, 색, 선 두께(0=채움)
+            ("body_human", PLAYER_BODY_R, PLAYER_COLORS[True], 0),
+            ("body_ai",    PLAYER_BODY_R, PLAYER_COLORS[False], 0),
+            ("racket",     RACKET_RADIUS, BLACK, 2),
+            ("shuttle",    shuttle_radius, PRIMARY, 0),
+        ]
+        sizes = [2 * r + 2 for _, r, _, _ in specs]
+        sheet = pygame.Surface((sum(sizes), max(sizes)), pygame.SRCALPHA)
+        self.sheet = sheet.convert_alpha()
+        self.sheet.fill((0, 0, 0, 0))
+        self.sprites = {}
+        self.offsets = {}     # 스프라이트 중심 → 좌상단 보정값
+        x = 0
+        for (name, r, color, width), size in zip(specs, sizes):
+            c = size // 2
+            pygame.draw.circle(self.sheet, color, (x + c, c), r, width)
+            self.sprites[name] = self.sheet.subsurface((x, 0, size, size))
+            self.offsets[name] = c
+            x += size
+        # 파티클은 종류 x 투명도 단계별 스프라이트 목록
+        self.particles = make_sprites(PARTICLE_KINDS)
+        self._scaled = {}     # 배율 -> (축소 시트, {이름: (스프라이트, 중심 보정)})
+
+    def scaled(self, factor):
+        """축소 화면(타일 뷰)용: 시트를 factor배로 한 번만 줄여 {이름: (스프라이트, 중심 보정)}"""
+        if factor not in self._scaled:
+            w, h = self.sheet.get_size()
+            sheet = pg_transform.smoothscale(self.sheet, (max(1, round(w * factor)), max(1, round(h * factor))))
+            bounds = sheet.get_rect()
+            out = {}
+            for name, sub in self.sprites.items():
+                x, _ = sub.get_offset()
+                sw, sh = sub.get_size()
+                r = pygame.Rect(round(x * factor), 0, max(1, round(sw * factor)), max(1, round(sh * factor)))
+                out[name] = (sheet.subsurface(r.clip(bounds)), self.offsets[name] * factor)
+            self._scaled[factor] = (sheet, out)
+        return self._scaled[factor][1]
+
+    def item(self, name):
+        # blits()용 [표면, [x, y]] 항목 (위치는 매 프레임 제자리 갱신)
+        return [self.sprites[name], [0, 0]]
+
+ATLAS = None
+
+def get_atlas():
+    global ATLAS
+    if ATLAS is None:
+        ATLAS = SpriteAtlas()
+    return ATLAS
+
+FLIGHT = None
+
+def get_flight_table():
+    global FLIGHT
+    if FLIGHT is None:
+        FLIGHT = FlightTable.load_or_build(FLIGHT_TABLE)
+    return FLIGHT
+
+AI_BRAIN = None
+
+def get_ai_worker():
+    # 모든 경기가 워커 하나(스레드 또는 프로세스)를 같이 씀
+    global AI_BRAIN
+    if AI_BRAIN is None:
+        AI_BRAIN = AIWorker(processes=(AI_WORKER == "process"))
+        atexit.register(AI_BRAIN.close)
+    return AI_BRAIN
+
+SAVER = None
+
+def get_match_saver():
+    # 이어하기 저장은 쓰기 스레드 하나가 담당 (최신 것만 디스크에)
+    global SAVER
+    if SAVER is None:
+        SAVER = MatchSaver(SAVE_PATH)
+        atexit.register(SAVER.close)   # 종료 직전 저장까지 디스크에
+    return SAVER
+
+JOURNAL = None
+
+def get_journal():
+    # 시작할 때 오늘 저널을 다시 읽어 세션 통계 복구 (정전/크래시 후에도 이어짐)
+    global JOURNAL
+    if JOURNAL is None:
+        JOURNAL = Journal(os.path.join(JOURNAL_DIR, time.strftime("%Y-%m-%d") + ".bjcj"), JOURNAL_GROUP)
+        atexit.register(JOURNAL.close)
+    return JOURNAL
+
 class Scene:
+    static = False   # True: 애니메이션이 없어 입력/타이머가 있을 때만 다시 그리면 되는 씬
+    dirty  = True    # static 씬에서 다음 프레임에 다시 그려야 하는지
+
     def update(self, dt): ...
     def draw(self, surf): ...
     def handle_event(self, event): ...
@@ -126,20 +411,30 @@ class Player:
         self.pos = [court_rect.centerx, y]
         self.swing_pressed = False
         self.last_hit_time = -999.0
+        self.diff = None                  # 선수별 난이도(없으면 씬 난이도 사용) — 보정 도구의 기준 AI용
+        self.court = "right"              # 복식: 현재 서 있는 서비스 코트(본인 기준 좌/우)
+        self.lane = None                  # 복식 AI: 맡은 x 범위 (min, max), 없으면 하프 전체
+        self.brain = None                 # AIWorker (있으면 결정을 워커에 맡김)
+        self.ai_clock = 0.0               # 워커 결정의 나이 계산용 시계
+
+        # 이동 가능 영역은 코트가 바뀌지 않는 한 고정 → 한 번만 계산
+        half = court_rect.copy()
+        half.height //= 2
+        if side == "bottom":
+            half.top = court_rect.centery
+        self._allowed = half.inflate(-PLAYER_PADDING*2, -PLAYER_PADDING*2)
+
+        atlas = get_atlas()
+        self.blit_items = [atlas.item("body_human" if is_human else "body_ai"), atlas.item("racket")]
+        self._offsets = (atlas.offsets["body_human"], atlas.offsets["racket"])
 
     def allowed_rect(self):
-        # 각 플레이어는 자기 하프에서만 이동
-        half = self.court_rect.copy()
-        if self.side == "top":
-            half.height //= 2
-        else:
-            half.height //= 2
-            half.top = self.court_rect.centery
-        # 패딩 적용
-        return half.inflate(-PLAYER_PADDING*2, -PLAYER_PADDING*2)
+        # 각 플레이어는 자기 하프에서만 이동 (캐시된 Rect — 수정하지 말 것)
+        return self._allowed
 
-    def update_human(self, dt):
-        keys = pygame.key.get_pressed()
+    def update_human(self, dt, keys=None):
+        if keys is None:
+            keys = pygame.key.get_pressed()
         dx = dy = 0.0
         if keys[pygame.K_LEFT]:  dx -= PLAYER_SPEED * dt
         if keys[pygame.K_RIGHT]: dx += PLAYER_SPEED * dt
@@ -153,19 +448,21 @@ class Player:
         self.pos[1] = max(rect.top,  min(rect.bottom, self.pos[1]))
 
     def update_ai(self, dt, shuttle, diff=None):
-        # 목표 x: 현재 x (가중) + 예측 x (가중)
+        # 목표 x: 현재 x (가중) + 예측 x (가중) + 에임 오차
         # 예측 시간: 셔틀이 내 y까지 도달하는 대략 시간
-        vy = shuttle.vel[1]
-        dy = abs(self.pos[1] - shuttle.pos[1])
-        t_to_me = dy / max(60.0, abs(vy))   # 60은 안전 최소치로 폭주 방지
-
-        predicted_x = shuttle.pos[0] + shuttle.vel[0] * t_to_me
-        predict_w   = max(0.0, min(1.0, diff["predict"]))
+        target_x = predict_target_x(self.pos[0], self.pos[1], shuttle.pos[0], shuttle.pos[1],
+                                    shuttle.vel[0], shuttle.vel[1],
+                                    diff["predict"], diff["aim_error"], random)
+        # 복식: 파트너와 겹치지 않게 자기 담당 범위 안에서만
+        if self.lane:
+            target_x = max(self.lane[0], min(self.lane[1], target_x))
+        self.move_toward(dt, target_x, diff)
 
-        target_x = (1.0 - predict_w) * shuttle.pos[0] + predict_w * predicted_x
-        # 에임 오차
-        target_x += random.uniform(-diff["aim_error"], diff["aim_error"])
+        # 스윙 확률: 셔틀이 근처일 때만 시도
+        self.swing_pressed = swing_intent(self.pos[0], self.pos[1], shuttle.pos[0], shuttle.pos[1],
+                                          RACKET_RADIUS + 20, diff["swing_prob"], random)
 
+    def move_toward(self, dt, target_x, diff):
         # 이동 속도
         ai_speed = PLAYER_SPEED * diff["speed_scale"]
         if abs(target_x - self.pos[0]) > 2:
@@ -180,38 +477,42 @@ class Player:
         self.pos[0] = max(rect.left, min(rect.right, self.pos[0]))
         self.pos[1] = max(rect.top,  min(rect.bottom, self.pos[1]))
 
-        # 스윙 확률: 셔틀이 근처일 때만 시도
-        close_x = abs(shuttle.pos[0] - self.pos[0]) <= (RACKET_RADIUS + 20)
-        close_y = abs(shuttle.pos[1] - self.pos[1]) <= 120
-        self.swing_pressed = (close_x and close_y and (random.random() < diff["swing_prob"]))
+    def update_ai_async(self, dt, shuttle, diff):
+        # 스냅샷을 워커에 넘기고, 돌아와 있는 최신 결정을 적용 (기다리지 않음)
+        self.ai_clock += dt
+        self.brain.submit(self, AISnapshot(self.ai_clock, self.pos[0], self.pos[1],
+                                           shuttle.pos[0], shuttle.pos[1], shuttle.vel[0], shuttle.vel[1],
+                                           shuttle.z, diff["predict"], diff["aim_error"], diff["swing_prob"],
+                                           self.lane))
+        d = self.brain.latest(self)
+        if d is None or self.ai_clock - d.t > AI_MAX_STALENESS:
+            self.update_ai(dt, shuttle, diff)    # 결정이 없거나 너무 늦음 → 이번 프레임은 기본 AI
+            return
+        self.move_toward(dt, d.target_x, diff)
+        self.swing_pressed = d.swing
 
 
-    def update(self, dt, shuttle, diff=None):
+    def update(self, dt, shuttle, diff=None, keys=None):
         if self.is_human:
-            self.update_human(dt)
+            self.update_human(dt, keys)
         else:
-            self.update_ai(dt, shuttle, diff if diff else DIFFICULTY["normal"])
+            diff = self.diff or diff or DIFFICULTY["normal"]
+            if self.brain:
+                self.update_ai_async(dt, shuttle, diff)
+            else:
+                self.update_ai(dt, shuttle, diff)
 
-    def can_hit(self, now, shuttle):
-        # 쿨다운 + 같은 하프에 있을 때 + 셔틀 가까이
-        if now - self.last_hit_time < HIT_COOLDOWN:
-            return False
-        if (self.side == "top" and shuttle.pos[1] >= self.court_rect.centery) or \
-           (self.side == "bottom" and shuttle.pos[1] <  self.court_rect.centery):
-            return False
-        # 거리 체크(라켓 반경 + 셔틀 반경)
-        import math
-        dx = shuttle.pos[0] - self.pos[0]
-        dy = shuttle.pos[1] - self.pos[1]
-        dist = math.hypot(dx, dy)
-        return dist <= (RACKET_RADIUS + shuttle.radius + 4)
+    def sync_blits(self):
+        # 몸통, 라켓 순서 — 위치만 제자리 갱신
+        for item, off in zip(self.blit_items, self._offsets):
+            dest = item[1]
+            dest[0] = self.pos[0] - off
+            dest[1] = self.pos[1] - off
 
     def draw(self, surf):
-        # 몸통(원), 라켓(원)
-        color = (60, 60, 60) if self.is_human else (100, 100, 100)
-        pygame.draw.circle(surf, color, (int(self.pos[0]), int(self.pos[1])), 16)
-        # 라켓 표시
-        pygame.draw.circle(surf, (0,0,0), (int(self.pos[0]), int(self.pos[1])), RACKET_RADIUS, width=2)
+        # 몸통(원), 라켓(원) — 아틀라스 스프라이트
+        self.sync_blits()
+        surf.blits(self.blit_items, doreturn=False)
 
 class Shuttle:
     def __init__(self, court_rect):
@@ -219,71 +520,182 @@ class Shuttle:
         self.radius = 10
         self.pos = [court_rect.centerx, court_rect.centery]
         self.vel = [0.0, 0.0]
+        atlas = get_atlas()
+        self.blit_items = [atlas.item("shuttle")]
+        self._offset = atlas.offsets["shuttle"]
+
+        # 포물선 모드: 타구마다 재사용하는 궤적 버퍼
+        self.z = 0.0
+        self.flight = None
+        self.flying = False
+        if SHUTTLE_PHYSICS == "drag":
+            get_flight_table()     # 첫 타구에서 표를 읽느라 멈추지 않게 미리
+            self.flight = Flight()
+        self.shadow = pygame.Rect(0, 0, 2 * self.radius, self.radius)
+
+        # 궤적 링버퍼: 길이 2N 목록의 i, i+N 칸이 같은 [x, y]를 공유 →
+        # 한 번 쓰면 trail[head:head+count]가 항상 오래된→최근 순서의 연속 구간
+        self.trail = [[0.0, 0.0] for _ in range(TRAIL_LEN)]
+        self.trail += self.trail
+        self.trail_head = 0       # 가장 오래된 점의 위치
+        self.trail_count = 0
+
+    def reset_trail(self):
+        self.trail_head = 0
+        self.trail_count = 0
+
+    def push_trail(self):
+        if self.trail_count < TRAIL_LEN:
+            slot = self.trail_head + self.trail_count
+            self.trail_count += 1
+        else:
+            slot = self.trail_head
+            self.trail_head = (self.trail_head + 1) % TRAIL_LEN
+        p = self.trail[slot % TRAIL_LEN]
+        p[0] = self.pos[0]
+        p[1] = self.pos[1] - self.z * Z_DRAW_SCALE
+
+    def draw_trail(self, surf):
+        if not ENABLE_TRAIL or self.trail_count < 2:
+            return
+        fast = self.vel[0] * self.vel[0] + self.vel[1] * self.vel[1] > TRAIL_SMASH_SPEED * TRAIL_SMASH_SPEED
+        h = self.trail_head
+        pygame.draw.aalines(surf, TRAIL_SMASH_COLOR if fast else TRAIL_COLOR, False,
+                            self.trail[h:h + self.trail_count])
 
     def clamp_speed(self):
-        import math
         speed = math.hypot(self.vel[0], self.vel[1])
         if speed > MAX_SPEED_SHUTTLE:
             k = MAX_SPEED_SHUTTLE / (speed + 1e-6)
             self.vel[0] *= k
             self.vel[1] *= k
 
+    def launch(self, angle):
+        """포물선 모드: 현재 위치에서 현재 속도(수평 방향·세기)와 올려 치는 각도로 비행 시작"""
+        speed = math.hypot(self.vel[0], self.vel[1])
+        if speed < 1e-6:
+            return
+        get_flight_table().blend(speed, angle, self.pos, (self.vel[0] / speed, self.vel[1] / speed),
+                                 self.flight)
+        self.z = self.flight.z[0]
+        self.flying = True
+
+    def stop(self):
+        self.flying = False
+        self.z = 0.0
+
     def update(self, dt):
-        # 공기 저항
-        self.vel[0] *= FRICTION_SHUTTLE
-        self.vel[1] *= FRICTION_SHUTTLE
-        self.pos[0] += self.vel[0] * dt
-        self.pos[1] += self.vel[1] * dt
-        self.clamp_speed()
+        if self.flying:
+            # 타구 때 풀어 둔 궤적을 시간 보간만 (높이는 z)
+            self.z = self.flight.advance(dt, self.pos, self.vel)
+            if self.flight.landed:
+                self.flying = False
+        else:
+            # 공기 저항
+            self.vel[0] *= FRICTION_SHUTTLE
+            self.vel[1] *= FRICTION_SHUTTLE
+            self.pos[0] += self.vel[0] * dt
+            self.pos[1] += self.vel[1] * dt
+            self.clamp_speed()
+        if ENABLE_TRAIL:
+            self.push_trail()
+
+    def draw_shadow(self, surf):
+        # 떠 있을 때 바닥 위치에 그림자 (높이가 눈에 보이게)
+        if self.z > 0.0:
+            self.shadow.center = (self.pos[0], self.pos[1])
+            pygame.draw.ellipse(surf, SHADOW_COLOR, self.shadow)
+
+    def sync_blits(self):
+        dest = self.blit_items[0][1]
+        dest[0] = self.pos[0] - self._offset
+        dest[1] = self.pos[1] - self._offset - self.z * Z_DRAW_SCALE
 
     def draw(self, surf):
-        pygame.draw.circle(surf, PRIMARY, (int(self.pos[0]), int(self.pos[1])), self.radius)
+        self.draw_shadow(surf)
+        self.draw_trail(surf)
+        self.sync_blits()
+        surf.blits(self.blit_items, doreturn=False)
 
 # =========================================================
 # 4. 메뉴 씬 (MenuScene)
 # =========================================================
 
 class MenuScene(Scene):
-    def __init__(self, go_to_game, go_to_howto):
+    static = True
+    guide_y = HEIGHT - 90     # 아래 조작 안내문 첫 줄
+
+    def __init__(self, go_to_game, go_to_howto, go_to_drill=None, go_to_doubles=None, go_to_resume=None,
+                 session=None):
         self.title = Label("TEAM BJC - Badminton Junkies Crew", center=(WIDTH//2, 120))
-        self.start_btn = Button("Game Start", center=(WIDTH//2, 300))
-        self.howto_btn = Button("How to Operate", center=(WIDTH//2, 380))
-        self.quit_btn  = Button("Game Over", center=(WIDTH//2, 460))
+        self.session = Label(session or "", center=(WIDTH//2, 200), font=FONT_S, color=(70, 70, 70))
+        self.resume_btn  = Button("Resume", center=(WIDTH//2, 300))
+        self.start_btn   = Button("Game Start", center=(WIDTH//2, 300))
+        self.doubles_btn = Button("Doubles", center=(WIDTH//2, 380))
+        self.howto_btn   = Button("How to Operate", center=(WIDTH//2, 460))
+        self.drill_btn   = Button("Drill Mode", center=(WIDTH//2, 540))
+        self.quit_btn    = Button("Game Over", center=(WIDTH//2, 620))
         self.go_to_game = go_to_game
         self.go_to_howto = go_to_howto
+        self.go_to_drill = go_to_drill
+        self.go_to_doubles = go_to_doubles
+        self.go_to_resume = go_to_resume
+        # 콜백이 있는 버튼만 (이어하기는 저장된 경기가 있을 때, 드릴 모드는 NumPy가 있을 때만), 위에서부터 80px 간격
+        # — 버튼이 많으면 마지막 버튼이 아래 안내문(HEIGHT-90) 위에서 끝나도록 간격을 줄임
+        self.buttons = [self.resume_btn] if go_to_resume else []
+        self.buttons.append(self.start_btn)
+        if go_to_doubles:
+            self.buttons.append(self.doubles_btn)
+        self.buttons.append(self.howto_btn)
+        if go_to_drill and bjc_drill.available:
+            self.buttons.append(self.drill_btn)
+        self.buttons.append(self.quit_btn)
+        last = self.guide_y - 16 - self.start_btn.rect.height // 2
+        step = min(80, (last - 300) // max(1, len(self.buttons) - 1))
+        for i, b in enumerate(self.buttons):
+            b.rect.center = (WIDTH//2, 300 + step * i)
+        self.layer = UILayer(self.paint_background, [self.title, self.session] + self.buttons)
 
     def update(self, dt):
         mouse_pos = pygame.mouse.get_pos()
-        self.start_btn.update(mouse_pos)
-        self.howto_btn.update(mouse_pos)
-        self.quit_btn.update(mouse_pos)
+        changed = False
+        for b in self.buttons:
+            changed |= b.update(mouse_pos)
+        if changed:
+            self.dirty = True
 
     def draw(self, surf):
-        surf.fill(WHITE)
-        self.title.draw(surf)
-        self.start_btn.draw(surf)
-        self.howto_btn.draw(surf)
-        self.quit_btn.draw(surf)
+        return self.layer.draw(surf)
 
+    def paint_background(self, surf):
+        surf.fill(WHITE)
         guide = [
             "Controls ←/→/↑/↓ : Move, Enter = Serve, Space = Smash, ESC = Menu",
             f"Target Score : {TARGET_SCORE} / Two-Point Rule : {'ON' if TWO_POINT_RULE else 'OFF'}",
         ]
         for i, line in enumerate(guide):
             gsurf = FONT_S.render(line, True, (70,70,70))
-            surf.blit(gsurf, (20, HEIGHT-90 + i*22))
+            surf.blit(gsurf, (20, self.guide_y + i*22))
 
         # 하단 크레딧
         credit = FONT_M.render("© BJC - Badminton Junkies Crew", True, (80,80,80))
         surf.blit(credit, (20, HEIGHT-40))
 
     def handle_event(self, event):
+        if self.resume_btn in self.buttons:
+            self.resume_btn.handle_event(event, self.go_to_resume)
         self.start_btn.handle_event(event, self.go_to_game)
+        if self.doubles_btn in self.buttons:
+            self.doubles_btn.handle_event(event, self.go_to_doubles)
         self.howto_btn.handle_event(event, self.go_to_howto)
+        if self.drill_btn in self.buttons:
+            self.drill_btn.handle_event(event, self.go_to_drill)
         self.quit_btn.handle_event(event, lambda: sys.exit(0))
 
 class HowToScene(Scene):
     """조작법/규칙 안내 씬"""
+    static = True
+
     def __init__(self, go_back_menu):
         self.go_back_menu = go_back_menu
         self.title = Label("Instructions for operation", center=(WIDTH//2, 90))
@@ -301,13 +713,17 @@ class HowToScene(Scene):
         ]
         # 미리 렌더
         self.text_surfs = [FONT_S.render(t, True, (40,40,40)) for t in self.lines]
+        self.layer = UILayer(self.paint_background, [self.title, self.back_btn])
 
     def update(self, dt):
-        self.back_btn.update(pygame.mouse.get_pos())
+        if self.back_btn.update(pygame.mouse.get_pos()):
+            self.dirty = True
 
     def draw(self, surf):
+        return self.layer.draw(surf)
+
+    def paint_background(self, surf):
         surf.fill((248, 250, 253))
-        self.title.draw(surf)
 
         # 텍스트 블록 표시
         x = WIDTH//2 - 280
@@ -323,8 +739,6 @@ class HowToScene(Scene):
         for i, ts in enumerate(self.text_surfs):
             surf.blit(ts, (x, y + i*line_h))
 
-        self.back_btn.draw(surf)
-
     def handle_event(self, event):
         self.back_btn.handle_event(event, self.go_back_menu)
         if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
@@ -335,8 +749,24 @@ class HowToScene(Scene):
 # 5. 게임 씬 (GameScene)
 # =========================================================
 
+def score_flash_color(t):
+    """점수 깜빡임 진행도 t(0→1)의 글자색: BLACK -> SCORE_FLASH_COLOR -> BLACK"""
+    # ease-out-in 느낌
+    ease = 0.5 - 0.5 * math.cos(math.pi * t)  # 0→1 부드럽게
+    def lerp(a,b,u): return int(a + (b-a)*u)
+    # 왕복 느낌: 앞 절반 up, 뒤 절반 down
+    updown = (ease if ease <= 0.5 else 1.0 - (ease-0.5)*2)
+    u = updown * 2.0 if ease <= 0.5 else (1.0 - updown) * 2.0
+    u = max(0.0, min(1.0, u))
+    return tuple(lerp(0, c, u) for c in SCORE_FLASH_COLOR)
+
+# 깜빡임 단계별 글자색 (점수와 무관 → 한 번만 계산)
+SCORE_FLASH_COLORS = [score_flash_color((i + 0.5) / SCORE_FLASH_STEPS) for i in range(SCORE_FLASH_STEPS)]
+
 class GameScene(Scene):
-    def __init__(self, go_to_menu, go_to_gameover):
+    _background = None   # 코트 배경은 모든 경기가 같음 → 한 장을 공유
+
+    def __init__(self, go_to_menu, go_to_gameover, doubles=False):
         self.go_to_menu = go_to_menu
         self.go_to_gameover = go_to_gameover
         self.info = Label("", center=(WIDTH//2, 40), font=FONT_M)
@@ -357,11 +787,12 @@ class GameScene(Scene):
                     pass
             return None  # 실패 시 None
 
-        # 업로드된 파일(/mnt/data) 우선, 같은 폴더 파일명 후순위
-        self.snd_receive = pygame.mixer.Sound("C:/Users/basra/OneDrive/바탕 화면/Gist/BJC/Python Program/badminton-83559.mp3")
-        self.snd_smash = pygame.mixer.Sound("C:/Users/basra/OneDrive/바탕 화면/Gist/BJC/Python Program/table-smash-47690.mp3")
-        self.snd_fail = pygame.mixer.Sound("C:/Users/basra/OneDrive/바탕 화면/Gist/BJC/Python Program/cartoon-fail-trumpet-278822.mp3")
-        self.snd_win = pygame.mixer.Sound("C:/Users/basra/OneDrive/바탕 화면/Gist/BJC/Python Program/you-win-sequence-1-183948.mp3")
+        # 같은 폴더 파일명 우선, 기존 개발 PC 경로 후순위 (없으면 무음 — 헤드리스 시뮬레이션용)
+        SOUND_DIR = "C:/Users/basra/OneDrive/바탕 화면/Gist/BJC/Python Program/"
+        self.snd_receive = _load_sound(["badminton-83559.mp3", SOUND_DIR + "badminton-83559.mp3"])
+        self.snd_smash   = _load_sound(["table-smash-47690.mp3", SOUND_DIR + "table-smash-47690.mp3"])
+        self.snd_fail    = _load_sound(["cartoon-fail-trumpet-278822.mp3", SOUND_DIR + "cartoon-fail-trumpet-278822.mp3"])
+        self.snd_win     = _load_sound(["you-win-sequence-1-183948.mp3", SOUND_DIR + "you-win-sequence-1-183948.mp3"])
 
         # 볼륨 (원하면 수치 조정)
         if self.snd_receive: self.snd_receive.set_volume(0.75)
@@ -377,11 +808,51 @@ class GameScene(Scene):
         self.court_rect = pygame.Rect(self.court_x, self.court_y, self.COURT_W, self.COURT_H)
         self.cy = self.court_rect.centery            # 가로 중앙(= 네트)
         self.center_x = self.court_rect.centerx
+        self.halves = {}
+        for side in ("top", "bottom"):
+            r = self.court_rect.copy()
+            r.height //= 2
+            if side == "bottom":
+                r.top = self.cy
+            self.halves[side] = r
+
+        # 스코어 보드 위치 + 정적 배경(코트 라인/보드 틀/도움말) 미리 그리기
+        BOARD_W, BOARD_H = 120, 60
+        self.board_rect = pygame.Rect(self.court_rect.right + 10, self.court_rect.centery - BOARD_H // 2, BOARD_W, BOARD_H)
+        if GameScene._background is None:
+            GameScene._background = self.build_background()
+        self.background = GameScene._background   # 경기마다 화면 크기 표면을 새로 만들지 않음
+        self._score_key  = None     # 마지막으로 렌더한 점수
+        self._score_surf = None
+        self._score_pos  = (0, 0)
+        self._flash_frames = []     # 깜빡임 단계별 표면 — 점수가 바뀔 때만 렌더
 
         # 오브젝트
         self.shuttle = Shuttle(self.court_rect)
         self.player_bottom = Player("bottom", self.court_rect, is_human=True)
         self.player_top    = Player("top",    self.court_rect, is_human=False)
+        # 편별 선수 목록 (복식이면 AI 파트너 추가). player_top/bottom은 각 편 첫 선수
+        self.doubles = doubles
+        self.teams = {"top": [self.player_top], "bottom": [self.player_bottom]}
+        if doubles:
+            for side in ("top", "bottom"):
+                partner = Player(side, self.court_rect, is_human=False)
+                partner.court = "left"
+                self.teams[side].append(partner)
+        self.players = self.teams["top"] + self.teams["bottom"]
+        if AI_WORKER:
+            for p in self.players:
+                if not p.is_human:
+                    p.brain = get_ai_worker()
+        allowed = self.player_bottom.allowed_rect()
+        self.lanes = ((allowed.left, self.center_x), (self.center_x, allowed.right))
+        # 라켓 타격 broad-phase: 선수 수가 늘어도 프레임 비용이 거의 일정
+        self.broadphase = SweepAndPrune(self.players, RACKET_RADIUS + self.shuttle.radius + 4)
+        self.particles = ParticlePool(get_atlas().particles, PARTICLE_CAPACITY,
+                                      PARTICLE_SPAWN_BUDGET, PARTICLE_DRAW_BUDGET,
+                                      seed=random.getrandbits(32))   # random.seed를 따르도록
+        # 오브젝트 스프라이트를 그리는 순서 그대로 한 목록에 (프레임마다 blits 한 번)
+        self.sprite_batch = [item for p in self.players for item in p.blit_items] + self.shuttle.blit_items
 
         # ===== 경기 상태 =====
         self.score = {"top": 0, "bottom": 0}
@@ -393,10 +864,33 @@ class GameScene(Scene):
         self.score_flash_t  = 0.0      # 남은 깜빡이 시간
         self.last_scored    = None     # 'top' or 'bottom' (누가 득점했는지)
 
+        # 랠리 통계(텔레메트리)
+        self.rally_shots   = 0
+        self.rally_start_t = 0.0
+
+        # 라인 판정: 셔틀 궤적 기록 + 마지막 판정 (x, y, 사유, 득점 편) + 진행 중인 챌린지
+        self.history   = ShotHistory(int(HISTORY_SECONDS * FPS))
+        self.last_call = None
+        self.challenge = None
+
+        # 인스턴트 리플레이: 틱마다 상태 한 행 (링은 메인 앱에서 붙임) + 재생 중인 리플레이 + 재생용 씬
+        self.replay_ring = None
+        self.instant = None
+        self._replay_view = None
+
+        # 키 상태 (None이면 이 창의 키보드) — 서버처럼 원격 입력을 넣을 때 keys[K_...] 형태 객체
+        self.keys = None
+
+        # 이어하기 저장/세션 저널 (메인 앱에서만 붙임 — 도구/서버/관전 씬은 기록 안 함)
+        self.saver = None
+        self.journal = None
+        self.recorder = None
+        self.save_timer = AUTOSAVE_EVERY
+
         # ==== 난이도 ====
         self.diff_mode = "normal"          # "easy" / "normal" / "hard"
         self.diff      = DIFFICULTY[self.diff_mode]
-        self.info.set_text(f"Difficulty: {self.diff_mode.upper()}  |  Space serve")
+        self.info.set_text(f"Difficulty: {self.diff_mode.upper()}  |  {'Doubles' if doubles else 'Space serve'}")
 
         self.reset_serve(keep_server=True)
 
@@ -416,12 +910,8 @@ class GameScene(Scene):
     
     # --- 코트 하프(Rect) 도우미 ---
     def half_rect_for(self, side: str) -> pygame.Rect:
-        r = self.court_rect.copy()
-        r.height //= 2
-        if side == "bottom":
-            r.top = self.cy
-        # side == "top"이면 위 하프 그대로
-        return r
+        # __init__에서 만든 하프 Rect (읽기 전용)
+        return self.halves[side]
 
     # --- 서비스 지점 계산 ---
     # rule: 자신의 점수가 짝수면 '오른쪽', 홀수면 '왼쪽' (서버 '본인 기준'의 좌/우)
@@ -451,6 +941,31 @@ class GameScene(Scene):
             y = half.centery
         return int(x), int(y)
 
+    # --- 복식: 서버/리시버의 파트너 대기 지점 (반대쪽 서비스 코트, 조금 뒤) ---
+    def partner_spot(self, side: str) -> tuple[int, int]:
+        even = (self.score[self.server] % 2 == 0)
+        x, y = self.side_spot(side, "left" if even else "right")
+        back = int(self.half_rect_for(side).height * 0.2)
+        return x, (y + back if side == "bottom" else y - back)
+
+    # --- 서브 순서: 지금 점수 짝/홀에 맞는 서비스 코트에 서 있는 선수 ---
+    # 단식은 편마다 한 명뿐이라 항상 그 선수.
+    # 복식은 서브권을 가진 편이 득점하면 그 편 두 선수가 코트를 바꾸고(award_point),
+    # 서브권을 되찾은 편은 자리를 그대로 둔 채 해당 코트의 선수가 서브.
+    def serving_player(self):
+        return self._player_in_court(self.server)
+
+    def receiving_player(self):
+        return self._player_in_court("top" if self.server == "bottom" else "bottom")
+
+    def _player_in_court(self, side):
+        team = self.teams[side]
+        which = "right" if self.score[self.server] % 2 == 0 else "left"
+        for p in team:
+            if p.court == which:
+                return p
+        return team[0]
+
     # --- (server 기준) 리시브 시작 지점: 대각 서비스 코트 ---
     def receive_spot(self, server_side: str) -> tuple[int, int]:
         """
@@ -470,10 +985,13 @@ class GameScene(Scene):
         sx, sy = self.serve_spot(self.server)              # 서버 위치
         rx, ry = self.receive_spot(self.server)            # 리시버(대각) 위치
 
-        server_player   = self.player_bottom if self.server == "bottom" else self.player_top
-        receiver_player = self.player_top    if self.server == "bottom" else self.player_bottom
+        server_player   = self.serving_player()
+        receiver_player = self.receiving_player()
 
-        # 플레이어들을 해당 위치로 배치
+        # 플레이어들을 해당 위치로 배치 (복식 파트너는 반대 코트 뒤쪽)
+        for p in self.players:
+            if p is not server_player and p is not receiver_player:
+                p.pos[0], p.pos[1] = self.partner_spot(p.side)
         server_player.pos[0], server_player.pos[1]   = sx, sy
         receiver_player.pos[0], receiver_player.pos[1] = rx, ry
 
@@ -483,6 +1001,8 @@ class GameScene(Scene):
         else:
             self.shuttle.pos = [sx, sy + 36]  # 위쪽 서버는 아래쪽으로 36px
         self.shuttle.vel = [0.0, 0.0]
+        self.shuttle.stop()
+        self.shuttle.reset_trail()   # 위치가 순간 이동했으니 잔상 초기화
 
 
     def reset_serve(self, keep_server=False):
@@ -493,25 +1013,36 @@ class GameScene(Scene):
 
         # 🟢 추가: 랠리 시작 전 상태 초기화
         self.last_hitter = None
-        self.player_bottom.swing_pressed = False
-        self.player_top.swing_pressed = False
-        self.player_bottom.last_hit_time = -999.0
-        self.player_top.last_hit_time = -999.0
+        for p in self.players:
+            p.swing_pressed = False
+            p.last_hit_time = -999.0
 
-        # 안내 + AI 자동 서브 타이머
-        if self.server == "bottom":
-            self.info.set_text("Wait for the serve : BOTTOM – Press Enter to start")
-            self.ai_serve_timer = 0.0
-        else:
-            self.info.set_text("Wait for the serve : TOP – AI will serve soon")
+        # 안내 + AI 자동 서브 타이머 (복식에서 AI 파트너가 서버면 자동 서브)
+        if self.show_serve_info():
             self.ai_serve_timer = 0.6   # AI가 서버면 0.6초 후 자동 서브
+        else:
+            self.ai_serve_timer = 0.0
+
+    def show_serve_info(self):
+        # 서브 대기 안내. AI가 서브하면 True
+        if self.server == "bottom" and self.serving_player().is_human:
+            self.info.set_text("Wait for the serve : BOTTOM – Press Enter to start")
+            return False
+        self.info.set_text(f"Wait for the serve : {self.server.upper()} – AI will serve soon")
+        return True
 
     def start_rally(self):
         self.rally_active = True
         speed = BASE_HIT_SPEED + 80
         # 서버가 위/아래에 따라 초기 방향
         self.shuttle.vel = [0.0, -speed] if self.server == "bottom" else [0.0, speed]
+        if self.shuttle.flight is not None:
+            self.shuttle.launch(SERVE_ANGLE)
         self.info.set_text("Rally in progress")
+        self.rally_shots   = 0
+        self.rally_start_t = self.time_elapsed
+        self.history.clear()
+        self.history.push(self.time_elapsed, self.shuttle.pos[0], self.shuttle.pos[1], self.shuttle.z)
 
         # 🟢 추가: 서버가 첫 타자
         self.last_hitter = self.server
@@ -521,6 +1052,15 @@ class GameScene(Scene):
 
     def award_point(self, winner, reason):
         self.score[winner] += 1
+        if self.journal:
+            self.journal.point(winner, reason, self.score)
+        # 라인 판정 지점에 먼지 효과 (코트 안쪽으로 당겨서 보이게)
+        px = max(self.court_rect.left, min(self.court_rect.right, self.shuttle.pos[0]))
+        py = max(self.court_rect.top,  min(self.court_rect.bottom, self.shuttle.pos[1]))
+        self.particles.burst(px, py, 24, DUST, speed=120.0, life=0.6)
+        if TELEMETRY:
+            TELEMETRY.record_rally(self.time_elapsed, winner, reason, self.rally_shots,
+                                   self.time_elapsed - self.rally_start_t, self.score)
         # 플레이어(bottom) 기준 승/패 사운드
         if winner == "bottom":
             self.play_win()
@@ -529,14 +1069,27 @@ class GameScene(Scene):
         # --- 점수 애니메이션 시작 ---
         self.last_scored   = winner
         self.score_flash_t = SCORE_FLASH_DURATION
+        if winner == self.server and len(self.teams[winner]) > 1:
+            for p in self.teams[winner]:   # 복식: 서브 편 득점 → 두 선수 코트 교대
+                p.court = "left" if p.court == "right" else "right"
         self.server = winner
         if self.is_game_over():
             w = "TOP" if self.score["top"] > self.score["bottom"] else "BOTTOM"
+            if TELEMETRY:
+                TELEMETRY.flush()
+            if self.saver:
+                self.saver.discard()      # 끝난 경기는 이어하기 대상 아님
+            if self.journal:
+                self.journal.game_over(w.lower(), reason, self.score, self.time_elapsed)
+            if self.recorder:
+                self.recorder.finish("doubles" if self.doubles else "singles")
             self.go_to_gameover({"top": self.score["top"], "bottom": self.score["bottom"]}, reason, w)
             return
         
         # 다음 서브로 전환
         self.reset_serve(keep_server=True)
+        if self.saver:
+            self.autosave()
 
     def is_game_over(self):
         t = self.score["top"]; b = self.score["bottom"]
@@ -550,23 +1103,53 @@ class GameScene(Scene):
             return mx >= TARGET_SCORE
         
     # ------------ 충돌/타격 ------------
-    def try_hit(self, player, now):
-
-        # 같은 편이 연속으로 치는 것 잠깐 금지(셔틀이 아직 자기 하프에 있으면)
-        if self.last_hitter == player.side and self.side_of_y(self.shuttle.pos[1]) == player.side:
-            return
-
-        # 기본 충돌 가능 체크(쿨다운/반경/하프)
-        if not player.can_hit(now, self.shuttle):
-            return
+    def resolve_hits(self, now, x0, y0):
+        """
+        이번 프레임 셔틀 이동 구간 (x0,y0)→현재 위치에 대해
+        broad-phase로 후보 선수만 고르고, 라켓 원에 먼저 닿는(time of impact) 선수 한 명만 타격.
+        쳤으면 True
+        """
+        sh = self.shuttle
+        if sh.z > PLAYER_REACH_Z:      # 아무도 닿지 않는 높이
+            return False
+        x1, y1 = sh.pos
+        bp = self.broadphase
+        bp.update()
+        lo, hi = bp.query(x0, x1)
+        best = None
+        best_t = 2.0
+        for i in range(lo, hi):
+            p = bp.bodies[i]
+            # 쿨다운 + 같은 편 연속 타격 금지
+            if now - p.last_hit_time < HIT_COOLDOWN or self.last_hitter == p.side:
+                continue
+            t = time_of_impact(x0, y0, x1, y1, p.pos[0], p.pos[1], bp.radius)
+            if t is None or t >= best_t:
+                continue
+            # 닿는 지점이 자기 하프여야 함
+            if self.side_of_y(y0 + (y1 - y0) * t) != p.side:
+                continue
+            best, best_t = p, t
+        if best is None:
+            return False
+        # 닿은 지점으로 되돌린 뒤 타격 (판정은 위에서 끝났으므로 바로 hit)
+        sh.pos[0] = x0 + (x1 - x0) * best_t
+        sh.pos[1] = y0 + (y1 - y0) * best_t
+        self.hit(best, now)
+        return True
 
+    def hit(self, player, now):
         # === 리시브/스매시 판단 ===
         # 사람: 스페이스 누르면 스매시, 아니면 자동 리시브
         # AI: update_ai에서 swing_pressed 결정(스매시 확률/상황), 아니면 자동 리시브
         is_smash = player.swing_pressed
 
-        # 목표 x: 상대 위치를 살짝 겨냥(너무 정확하지 않게 살짝만 보정)
-        opponent = self.player_top if player.side == "bottom" else self.player_bottom
+        # 목표 x: 상대 위치를 살짝 겨냥(너무 정확하지 않게 살짝만 보정) — 복식은 셔틀에 가까운 상대
+        opponents = self.teams["top" if player.side == "bottom" else "bottom"]
+        opponent = opponents[0]
+        for o in opponents:
+            if abs(o.pos[0] - self.shuttle.pos[0]) < abs(opponent.pos[0] - self.shuttle.pos[0]):
+                opponent = o
         target_x = opponent.pos[0]
         nx = max(-1.0, min(1.0, (target_x - self.shuttle.pos[0]) / 120.0))
 
@@ -586,11 +1169,14 @@ class GameScene(Scene):
         if abs(vy) < MIN_VY:
             vy = MIN_VY * vy_sign
 
-        # 속도 적용
-        self.shuttle.vel = [vx, vy]
+        # 속도 적용 (텔레메트리는 맞기 직전 속도를 기록)
+        self.rally_shots += 1
+        if TELEMETRY:
+            TELEMETRY.record_shot(now, player.side, is_smash, math.hypot(*self.shuttle.vel))
+        self.shuttle.vel[0] = vx
+        self.shuttle.vel[1] = vy
 
         # 약간 앞으로 밀어 겹침/재히트 방지
-        import math
         speed = math.hypot(vx, vy)
         try:
             NUDGE = CROSS_NUDGE_PX
@@ -599,10 +1185,17 @@ class GameScene(Scene):
         if speed > 1e-6:
             self.shuttle.pos[0] += (vx / speed) * NUDGE
             self.shuttle.pos[1] += (vy / speed) * NUDGE
+        if self.shuttle.flight is not None:
+            self.shuttle.launch(SMASH_ANGLE if is_smash else CLEAR_ANGLE)
 
         # 상태 갱신
         player.last_hit_time = now
         self.last_hitter = player.side
+        self.history.mark_shot()
+
+        # 타격 불꽃: 새 진행 방향으로 퍼짐 (스매시는 더 많이/빠르게)
+        self.particles.burst(self.shuttle.pos[0], self.shuttle.pos[1], 20 if is_smash else 10, SPARK,
+                             speed=260.0 if is_smash else 160.0, direction=math.atan2(vy, vx), spread=0.9)
 
         # 타구 사운드
         if player.is_human:
@@ -613,15 +1206,37 @@ class GameScene(Scene):
 
 
     def update(self, dt):
-        now = pygame.time.get_ticks() / 1000.0
+        # 챌린지 리플레이 중에는 경기 정지
+        if self.challenge:
+            self.challenge.update(dt)
+            if self.challenge.done:
+                self.challenge = None
+            return
+        if self.instant:
+            self.instant.update(dt)
+            if self.instant.done:
+                self.instant = None
+            return
+
+        if self.replay_ring is not None:
+            self.replay_ring.push(self.time_elapsed, spectator_state(self)[0])
+        # 씬 내부 시계 사용 (고정 dt 일괄 시뮬레이션에서도 쿨다운이 동일하게 동작)
         self.time_elapsed += dt
+        now = self.time_elapsed
+        if self.saver:
+            self.save_timer -= dt
+            if self.save_timer <= 0:
+                self.autosave()
+        self.particles.update(dt)   # 서브 대기 중에도 효과는 계속 흐름
 
-        keys = pygame.key.get_pressed()
+        keys = self.keys if self.keys is not None else pygame.key.get_pressed()
+        if self.recorder:
+            self.recorder.frame(dt, keys)
 
         # ─ 서브 대기 상태 ─
         if not self.rally_active:
-            # AI가 서버면 자동 서브 타이머
-            if self.server == "top":
+            # AI가 서버면 자동 서브 타이머 (복식 파트너 포함)
+            if not self.serving_player().is_human:
                 if self.ai_serve_timer > 0:
                     self.ai_serve_timer -= dt
                     if self.ai_serve_timer <= 0:
@@ -647,62 +1262,76 @@ class GameScene(Scene):
                 self.shuttle.vel[1] *= 2  # y축 속도 두 배
                 self.rally_active = True  # 스매시 후에도 랠리 계속
 
-        # 셔틀 이동
+        # 셔틀 이동 (이동 전 위치는 타격 판정의 선분 시작점)
+        x0, y0 = self.shuttle.pos
         self.shuttle.update(dt)
 
         # 플레이어 입력/AI
         self.player_bottom.swing_pressed = keys[pygame.K_SPACE]
-
-        self.player_bottom.update(dt, self.shuttle, self.diff)
-        self.player_top.update(dt, self.shuttle, self.diff)
-
-        # 라켓 타격 판정(먼저 상대 쪽, 동시에 두 번 치는 걸 줄이기 위해 순서)
-        if self.side_of_y(self.shuttle.pos[1]) == "bottom":
-            self.try_hit(self.player_bottom, now)
-            self.try_hit(self.player_top, now)
-        else:
-            self.try_hit(self.player_top, now)
-            self.try_hit(self.player_bottom, now)
-
-        # ---- 간단판 OUT/LINE 판정 ----
-        # 규칙:
-        # - 좌/우 사이드: 선에 닿거나(라인 밴드) 밖으로 나가면 → 마지막 타자의 '상대' 득점
-        # - 위/아래 베이스: '밖으로 넘어가면'만 → 못 친 쪽(= 마지막 타자의 상대) 패 → 마지막 타자 득점
-        r = self.shuttle.radius
-        cx, cy = self.shuttle.pos
-        outer = self.court_rect
-        line_w = COURT_OUTER_LINE_W if 'COURT_OUTER_LINE_W' in globals() else 6
-
-        # 1) 바깥으로 '넘어감'
-        if cx < outer.left or cx > outer.right or cy < outer.top or cy > outer.bottom:
-            # 1-a) 좌/우로 나감 → 사이드 아웃: 마지막 타자의 '상대' 득점
-            if cx < outer.left or cx > outer.right:
-                hitter = self.last_hitter or self.server
-                winner = "top" if hitter == "bottom" else "bottom"
-                self.award_point(winner, "Side out")
-                return
-            # 1-b) 위/아래로 나감 → 베이스 아웃: 마지막 타자 득점(= 수신측 패)
-            hitter = self.last_hitter or self.server
-            self.award_point(hitter, "Baseline out")
-            return
-
-        # 2) 코트 안이지만 '사이드 라인 밴드'에 닿음 (베이스 라인 접촉은 인으로 취급)
-        on_left_side_line  = (outer.left <= cx <= outer.left + line_w)
-        on_right_side_line = (outer.right - line_w <= cx <= outer.right)
-        if on_left_side_line or on_right_side_line:
-            hitter = self.last_hitter or self.server
-            winner = "top" if hitter == "bottom" else "bottom"
-            self.award_point(winner, "Side line")
+        if self.doubles:
+            self.assign_lanes()
+        for p in self.players:
+            p.update(dt, self.shuttle, self.diff, keys)
+
+        # 라켓 타격 판정: 후보만 골라 먼저 닿는 선수 한 명
+        sh = self.shuttle
+        if self.resolve_hits(now, x0, y0):
+            x0, y0 = sh.pos          # 방금 친 지점부터 다시 판정
+        self.history.push(now, sh.pos[0], sh.pos[1], sh.z)
+
+        # 포물선 모드에서는 셔틀이 떠 있는 동안 라인 판정 없음 (떨어진 지점으로 판정)
+        if not sh.flying and self.judge_lines(x0, y0):
             return
         # 점수 깜빡이 타이머 감소
         if self.score_flash_t > 0:
             self.score_flash_t = max(0.0, self.score_flash_t - dt)
 
-
-
-    def draw(self, surf):
+    def judge_lines(self, x0, y0):
+        """
+        이번 프레임 이동 구간 (x0,y0)→현재 위치에서 처음 난 라인 판정으로 득점 처리. 득점이 났으면 True
+        규칙:
+        - 좌/우 사이드: 선에 닿거나(라인 밴드) 밖으로 나가면 → 마지막 타자의 '상대' 득점
+        - 위/아래 베이스: '밖으로 넘어가면'만 → 못 친 쪽(= 마지막 타자의 상대) 패 → 마지막 타자 득점
+        - 포물선 모드: 떨어진 한 점으로 판정 — 코트 안이면 마지막 타자 득점,
+          사이드/베이스 밖이면 친 공이 나간 것이므로 마지막 타자의 상대 득점
+        """
+        cx, cy = self.shuttle.pos
+        if self.shuttle.flight is not None:
+            x0, y0 = cx, cy
+        outer = self.court_rect
+        hitter = self.last_hitter or self.server
+        opponent = "top" if hitter == "bottom" else "bottom"
+        call = first_crossing(x0, y0, cx, cy, outer, COURT_OUTER_LINE_W)
+        if call is None:
+            if self.shuttle.flight is None:
+                return False
+            winner, reason = hitter, "Landed in"
+            px, py = cx, cy
+        else:
+            t, kind = call
+            px = x0 + (cx - x0) * t
+            py = y0 + (cy - y0) * t
+            if kind == SIDE:
+                winner = opponent
+                reason = "Side line" if outer.left <= px <= outer.right else "Side out"   # 닿은 지점 기준
+            else:
+                # 포물선: 친 공이 베이스라인 밖에 떨어짐 / 아케이드: 받을 쪽이 놓쳐 넘어감
+                winner = opponent if self.shuttle.flight is not None else hitter
+                reason = "Baseline out"
+        self.last_call = (px, py, reason, winner)
+        self.award_point(winner, reason)
+        return True
+
+    def assign_lanes(self):
+        # 복식 AI: 파트너보다 왼쪽에 있으면 왼쪽 절반, 아니면 오른쪽 절반 담당
+        for a, b in (self.teams["top"], self.teams["bottom"]):
+            left, right = (a, b) if a.pos[0] <= b.pos[0] else (b, a)
+            left.lane, right.lane = self.lanes
+
+    def build_background(self):
+        # 매 프레임 같은 그림(코트 라인, 점수판 틀, 도움말)은 한 장으로 미리 그림
+        surf = pygame.Surface((WIDTH, HEIGHT)).convert()
         surf.fill((245, 250, 255))
-        self.info.draw(surf)
 
         # ===== 스타일 =====
         MAIN_LINE_COLOR = (0, 0, 0)  # 바깥 코트 테두리 & 가로 중앙선(네트)
@@ -737,78 +1366,302 @@ class GameScene(Scene):
         # 세로 중앙선
         pygame.draw.line(surf, SUB_LINE_COLOR, (center_x, court_rect.top), (center_x, court_rect.bottom), width=SUB_LINE_W)
 
-        # 오브젝트
-        self.player_top.draw(surf)
-        self.player_bottom.draw(surf)
-        self.shuttle.draw(surf)
+        # 스코어/상태 보드 틀
+        pygame.draw.rect(surf, (255, 255, 255), self.board_rect, border_radius=12)
+        pygame.draw.rect(surf, (0, 0, 0), self.board_rect, width=2, border_radius=12)
 
-        # 스코어/상태 보드
-        BOARD_W, BOARD_H = 120, 60
-        margin_court = 10
-
-        x_left = court_rect.right + margin_court
-        y_top  = court_rect.centery - BOARD_H // 2
-        board_rect = pygame.Rect(x_left, y_top, BOARD_W, BOARD_H)
-
-        pygame.draw.rect(surf, (255, 255, 255), board_rect, border_radius=12)
-        pygame.draw.rect(surf, (0, 0, 0), board_rect, width=2, border_radius=12)
+        # 하단 도움말
+        help1 = FONT_S.render("←/→/↑/↓ : Adjust movement | Enter : Serve | Space : Smash | C : Challenge | I : Replay | ESC : Menu", True, (80,80,80))
+        surf.blit(help1, (WIDTH//2 - help1.get_width()//2, HEIGHT - 36))
+        return surf
 
-        # --- 애니메이션용 색/스케일 계산 ---
-        # t=0~1로 정규화, 앞/뒤로 부드럽게 펄스(색+스케일)
-        if self.score_flash_t > 0:
-            t = 1.0 - (self.score_flash_t / SCORE_FLASH_DURATION)  # 진행도 0→1
-            # ease-out-in 느낌
-            import math
-            ease = 0.5 - 0.5 * math.cos(math.pi * t)  # 0→1 부드럽게
-
-            # 색 보간: BLACK -> SCORE_FLASH_COLOR -> BLACK
-            def lerp(a,b,u): return int(a + (b-a)*u)
-            # 왕복 느낌: 앞 절반 up, 뒤 절반 down
-            updown = (ease if ease <= 0.5 else 1.0 - (ease-0.5)*2)
-            u = updown * 2.0 if ease <= 0.5 else (1.0 - updown) * 2.0
-            u = max(0.0, min(1.0, u))
-
-            col = tuple(lerp(0, c, u) for c in SCORE_FLASH_COLOR)
-
-            # 스케일: 1.0 -> SCORE_MAX_SCALE -> 1.0
-            scale = 1.0 + (SCORE_MAX_SCALE - 1.0) * (1.0 - abs(1.0 - 2.0*ease))
-        else:
-            col = (0, 0, 0)
-            scale = 1.0
+    def draw(self, surf):
+        if self.instant:
+            self.instant.draw(surf)     # 리플레이는 기록된 상태를 재생용 씬으로 그림
+            return
+        self.draw_match(surf)
+        if self.challenge:
+            self.challenge.draw(surf)   # 챌린지 리플레이는 경기 화면 위에
 
-        # 점수 문자열
-        score_text = f"{self.score['top']} : {self.score['bottom']}"
+    def draw_match(self, surf):
+        surf.blit(self.background, (0, 0))
+        self.info.draw(surf)
 
-        # 기본 렌더 후 스케일
-        text_surface = FONT_M.render(score_text, True, col)
-        if scale != 1.0:
-            w, h = text_surface.get_size()
-            text_surface = pg_transform.smoothscale(text_surface, (w, h))
+        # 셔틀 그림자/잔상(aalines 한 번) → 오브젝트 (아틀라스 스프라이트 일괄 blit)
+        self.shuttle.draw_shadow(surf)
+        self.shuttle.draw_trail(surf)
+        for p in self.players:
+            p.sync_blits()
+        self.shuttle.sync_blits()
+        surf.blits(self.sprite_batch, doreturn=False)
+        self.particles.draw(surf)
 
+        # 스코어/상태 보드
+        # 점수가 바뀔 때만 렌더 (평소 표면 + 깜빡임 단계들) → 랠리/깜빡임 중에는 캐시된 표면 blit만
+        key = (self.score["top"], self.score["bottom"])
+        if key != self._score_key:
+            self._score_key = key
+            self.render_score(key)
+        if self.score_flash_t <= 0:
+            surf.blit(self._score_surf, self._score_pos)
+            return
+        t = 1.0 - (self.score_flash_t / SCORE_FLASH_DURATION)  # 진행도 0→1
+        surf.blit(self._flash_frames[min(SCORE_FLASH_STEPS - 1, int(t * SCORE_FLASH_STEPS))], self._score_pos)
+
+    def render_score(self, key):
+        # 평소(검정) 표면 + 깜빡임 단계별 색 표면 — 같은 글자라 크기/위치는 모두 같음
+        text = f"{key[0]} : {key[1]}"
+        self._score_surf = FONT_M.render(text, True, (0, 0, 0))
+        self._flash_frames = [FONT_M.render(text, True, col) for col in SCORE_FLASH_COLORS]
+        self._score_pos = (self.board_rect.centerx - self._score_surf.get_width() // 2,
+                           self.board_rect.centery - self._score_surf.get_height() // 2)
+
+    # ------------ 저장/이어하기 ------------
+    def autosave(self):
+        self.save_timer = AUTOSAVE_EVERY
+        self.saver.save(self.snapshot())
+
+    def snapshot(self):
+        """경기 전체 상태(점수, 서버, 위치, 속도, 타이머, 난수 상태)를 작은 바이너리로"""
+        nan = float("nan")
+        sh = self.shuttle
+        fl = sh.flight
+        parts = [
+            MATCH.pack(self.doubles, list(DIFFICULTY).index(self.diff_mode), SIDE_CODE[self.server],
+                       self.rally_active, SIDE_CODE[self.last_hitter], SIDE_CODE[self.last_scored],
+                       self.score["top"], self.score["bottom"],
+                       self.time_elapsed, self.ai_serve_timer, self.score_flash_t,
+                       nan if self.round_time_left is None else self.round_time_left,
+                       min(self.rally_shots, 0xFFFF), self.rally_start_t, len(self.players)),
+            SHUTTLE.pack(sh.pos[0], sh.pos[1], sh.vel[0], sh.vel[1], sh.z, sh.flying,
+                         fl.t if fl else 0.0, *(fl.launch if fl else (0.0,) * 6)),
+        ]
+        for p in self.players:
+            parts.append(PLAYER.pack(p.pos[0], p.pos[1], p.last_hit_time,
+                                     p.court == "left", p.is_human, bool(p.swing_pressed)))
+        version, words, gauss = random.getstate()
+        parts.append(RNG.pack(version, *words, nan if gauss is None else gauss))
+        return b"".join(parts)
+
+    def restore(self, payload):
+        """snapshot()으로 만든 상태로 되돌림 (같은 단식/복식 씬에서). 맞지 않으면 ValueError"""
+        (doubles, diff_i, server, rally, last_hitter, last_scored, top, bottom,
+         t, ai_timer, flash, round_left, shots, rally_start, n) = MATCH.unpack_from(payload, 0)
+        if bool(doubles) != self.doubles or n != len(self.players) \
+                or len(payload) != MATCH.size + SHUTTLE.size + n * PLAYER.size + RNG.size:
+            raise ValueError("saved match does not fit this scene")
+        self.diff_mode = list(DIFFICULTY)[diff_i]
+        self.diff = DIFFICULTY[self.diff_mode]
+        self.server = SIDE_NAME[server]
+        self.rally_active = bool(rally)
+        self.last_hitter = SIDE_NAME[last_hitter]
+        self.last_scored = SIDE_NAME[last_scored]
+        self.score["top"], self.score["bottom"] = top, bottom
+        self.time_elapsed = t
+        self.ai_serve_timer = ai_timer
+        self.score_flash_t = flash
+        self.round_time_left = None if math.isnan(round_left) else round_left
+        self.rally_shots = shots
+        self.rally_start_t = rally_start
+        off = MATCH.size
+
+        px, py, vx, vy, z, flying, ft, *launch = SHUTTLE.unpack_from(payload, off)
+        off += SHUTTLE.size
+        sh = self.shuttle
+        sh.pos[0], sh.pos[1] = px, py
+        sh.vel[0], sh.vel[1] = vx, vy
+        sh.stop()
+        if flying and sh.flight is not None:
+            speed, angle, ox, oy, dx, dy = launch   # 궤적 버퍼는 발사 값으로 다시 풀고 시간만 맞춤
+            get_flight_table().blend(speed, angle, (ox, oy), (dx, dy), sh.flight)
+            sh.flight.t = ft
+            sh.flying = True
+        sh.z = z
+        sh.reset_trail()
+
+        for p in self.players:
+            p.pos[0], p.pos[1], p.last_hit_time, left, _, swing = PLAYER.unpack_from(payload, off)
+            off += PLAYER.size
+            p.court = "left" if left else "right"
+            p.swing_pressed = bool(swing)
+
+        version, *words, gauss = RNG.unpack_from(payload, off)
+        random.setstate((version, tuple(words), None if math.isnan(gauss) else gauss))
+
+        self.history.clear()
+        self.last_call = None
+        if self.replay_ring is not None:
+            self.replay_ring.clear()
+        self.save_timer = AUTOSAVE_EVERY
+        if self.rally_active:
+            self.info.set_text("Rally in progress")
+        else:
+            self.show_serve_info()
 
-        # 중앙 배치
-        surf.blit(
-            text_surface,
-            (board_rect.centerx - text_surface.get_width() // 2,
-            board_rect.centery - text_surface.get_height() // 2)
-        )
-        # 하단 도움말
-        help1 = FONT_S.render("←/→/↑/↓ : Adjust movement | Enter : Serve | Space : Smash | ESC : Menu", True, (80,80,80))
-        surf.blit(help1, (WIDTH//2 - help1.get_width()//2, HEIGHT - 36))
+    def start_challenge(self):
+        # 직전 판정의 마지막 타구를 느리게/확대해서 다시 보기 (서브 대기 중에만)
+        if self.rally_active or not self.last_call:
+            return
+        samples = self.history.last_shot()
+        if len(samples) < 2:
+            return
+        px, py, reason, winner = self.last_call
+        self.challenge = ChallengeReplay(self.background, samples, (px, py), f"{reason} — point {winner.upper()}",
+                                         FONT_M, speed=CHALLENGE_SPEED, zoom=CHALLENGE_ZOOM,
+                                         z_scale=Z_DRAW_SCALE)
+
+    def start_instant_replay(self):
+        # 최근 INSTANT_REPLAY_SECONDS를 다시 보기 (그동안 경기 정지, 시뮬레이션 없이 그리기만)
+        ring = self.replay_ring
+        if ring is None or ring.count < 2:
+            return
+        if self._replay_view is None:
+            self._replay_view = GameScene(lambda: None, lambda *a: None, self.doubles)
+        view = self._replay_view
+        view.shuttle.reset_trail()
+        view.spectate_tick = None
+        # 보간: 셔틀 x/y/z, 깜빡임, 선수 위치 (점수/잔상 개수는 틱 값 그대로)
+        self.instant = InstantReplay(ring, view, apply_spectator_state, FONT_S, INSTANT_REPLAY_SPEEDS,
+                                     interpolate=(0, 1, 2, 8) + tuple(range(_SPECTATE_HEAD, ring.width)))
 
     def handle_event(self, event):
+        if self.challenge:
+            if event.type == pygame.KEYDOWN and event.key in (pygame.K_ESCAPE, KEY_CHALLENGE):
+                self.challenge = None
+            return
+        if self.instant:
+            if event.type == pygame.KEYDOWN:
+                if event.key in (pygame.K_ESCAPE, KEY_INSTANT_REPLAY):
+                    self.instant = None
+                elif event.key == pygame.K_LEFT:
+                    self.instant.slower()
+                elif event.key == pygame.K_RIGHT:
+                    self.instant.faster()
+            return
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
+                if self.saver:
+                    self.autosave()       # 경기를 버리지 않고 멈춤 → 메뉴에서 Resume
+                if self.recorder:
+                    self.recorder.finish("paused")   # 여기까지 기록 (이어하면 새 기록으로)
                 self.go_to_menu()
+            elif event.key == KEY_CHALLENGE:
+                self.start_challenge()
+            elif event.key == KEY_INSTANT_REPLAY:
+                self.start_instant_replay()
             elif event.key == pygame.K_r:
+                if self.recorder:
+                    self.recorder.event(RECORD_RESET)
                 self.reset_serve(keep_server=True)
-            elif (event.key == KEY_SERVE) and (not self.rally_active) and (self.server == "bottom"):
+            elif (event.key == KEY_SERVE) and (not self.rally_active) and self.serving_player().is_human:
+                if self.recorder:
+                    self.recorder.event(RECORD_SERVE)
                 self.start_rally()
 
+# =========================================================
+# 5.4 드릴(연습) 씬 — 피더가 셔틀 여러 개를 한꺼번에 보냄
+# =========================================================
+class DrillScene(Scene):
+    """
+    셔틀 물리는 bjc_drill.ShuttleSwarm으로 한꺼번에(벡터) 처리하고,
+    라켓 타격 후보는 공간 해시 격자로 좁힌 뒤에만 거리 검사.
+    """
+    def __init__(self, go_to_menu):
+        self.go_to_menu = go_to_menu
+        self.journal = None
+        self.COURT_H = 780
+        self.COURT_W = int(self.COURT_H / 1.5)
+        self.court_rect = pygame.Rect((WIDTH - self.COURT_W) // 2, (HEIGHT - self.COURT_H) // 2,
+                                      self.COURT_W, self.COURT_H)
+        cr = self.court_rect
+        bounds = (cr.left, cr.top, cr.right, cr.bottom)
+        self.player = Player("bottom", cr, is_human=True)
+        self.swarm = bjc_drill.ShuttleSwarm(DRILL_CAPACITY, bounds, FRICTION_SHUTTLE, MAX_SPEED_SHUTTLE)
+        self.grid = bjc_drill.SpatialHash(bounds, DRILL_CELL)
+        self.feeder = bjc_drill.Feeder(self.swarm, (cr.centerx, cr.top + 40),
+                                       (cr.left + 40, cr.centery + 40, cr.right - 40, cr.bottom - 60),
+                                       speed=BASE_HIT_SPEED)
+        self.set_intensity(pygame.K_2)
+
+        atlas = get_atlas()
+        self.shuttle_sprite = atlas.sprites["shuttle"]
+        self.shuttle_off = atlas.offsets["shuttle"]
+        self.hit_r = RACKET_RADIUS + 10 + 4         # 라켓 + 셔틀 반경 + 여유 (GameScene 타격 판정과 동일)
+        self.returned = self.missed = self.hits = 0
+
+        self.background = pygame.Surface((WIDTH, HEIGHT)).convert()
+        self.background.fill((245, 250, 255))
+        pygame.draw.rect(self.background, BLACK, cr, width=6, border_radius=18)
+        pygame.draw.line(self.background, BLACK, (cr.left, cr.centery), (cr.right, cr.centery), width=6)
+        help1 = FONT_S.render("←/→/↑/↓ : Move | Space : Smash | 1~4 : Feed rate | ESC : Menu", True, (80,80,80))
+        self.background.blit(help1, (WIDTH//2 - help1.get_width()//2, HEIGHT - 36))
+        self.info = Label("", center=(WIDTH//2, 40), font=FONT_M)
+        self.stats_t = 0.0
+
+    def set_intensity(self, key):
+        self.feeder.interval, self.feeder.volley = DRILL_INTENSITY[key]
+        self.feeder.timer = 0.0
+        if self.journal:
+            self.journal.setting("drill_intensity", pygame.key.name(key))
+
+    def update(self, dt):
+        keys = pygame.key.get_pressed()
+        self.feeder.update(dt)
+        out_top, out_bottom, out_side = self.swarm.step(dt)
+        self.returned += out_top
+        self.missed += out_bottom + out_side
+
+        self.player.update(dt, None, None, keys)
+        self.try_hits(keys[pygame.K_SPACE])
+
+        self.stats_t -= dt
+        if self.stats_t <= 0:   # 글자 렌더는 0.25초마다만
+            self.stats_t = 0.25
+            self.info.set_text(f"In air {self.swarm.count()}  |  Hits {self.hits}  |  "
+                               f"Returned {self.returned}  |  Missed {self.missed}")
+
+    def try_hits(self, smash):
+        sw = self.swarm
+        active = bjc_drill.np.flatnonzero(sw.active)
+        self.grid.build(sw.pos, active)
+        px, py = self.player.pos
+        cand = self.grid.query(px, py, self.hit_r)
+        if cand.size == 0:
+            return
+        d = sw.pos[cand] - (px, py)
+        # 라켓 반경 안 + 아래로 오는 중(이미 받아친 셔틀은 위로 감)
+        hit = cand[((d * d).sum(axis=1) <= self.hit_r * self.hit_r) & (sw.vel[cand, 1] > 0)]
+        if hit.size == 0:
+            return
+        power = BASE_HIT_SPEED + (POWER_HIT_BONUS if smash else 0.0)
+        nx = bjc_drill.np.clip((self.court_rect.centerx - sw.pos[hit, 0]) / 120.0, -1.0, 1.0)
+        sw.vel[hit, 0] = power * 0.6 * nx
+        sw.vel[hit, 1] = -max(power, MIN_VY_AFTER_HIT)
+        sw.pos[hit, 1] -= CROSS_NUDGE_PX
+        self.hits += int(hit.size)
+
+    def draw(self, surf):
+        surf.blit(self.background, (0, 0))
+        self.info.draw(surf)
+        self.player.draw(surf)
+        idx = bjc_drill.np.flatnonzero(self.swarm.active)
+        if idx.size:
+            coords = (self.swarm.pos[idx] - self.shuttle_off).astype(int).tolist()
+            surf.blits(zip(itertools.repeat(self.shuttle_sprite), coords), doreturn=False)
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                self.go_to_menu()
+            elif event.key in DRILL_INTENSITY:
+                self.set_intensity(event.key)
+
 # =========================================================
 # 5.5 GameOverScene
 # =========================================================
 class GameOverScene(Scene):
+    static = True
+
     def __init__(self, score, reason, winner, go_to_menu, go_to_game):
         self.title = Label("GAME OVER", center=(WIDTH//2, 120))
         detail = f"Reason: {reason} | Winner: {winner} | TOP {score['top']} : {score['bottom']} BOTTOM"
@@ -817,18 +1670,18 @@ class GameOverScene(Scene):
         self.retry_btn = Button("Retry", center=(WIDTH//2 + 150, 320))
         self.go_to_menu = go_to_menu
         self.go_to_game = go_to_game
+        self.layer = UILayer(lambda s: s.fill(WHITE),
+                             [self.title, self.detail, self.menu_btn, self.retry_btn])
 
     def update(self, dt):
         mouse_pos = pygame.mouse.get_pos()
-        self.menu_btn.update(mouse_pos)
-        self.retry_btn.update(mouse_pos)
+        changed  = self.menu_btn.update(mouse_pos)
+        changed |= self.retry_btn.update(mouse_pos)
+        if changed:
+            self.dirty = True
 
     def draw(self, surf):
-        surf.fill(WHITE)
-        self.title.draw(surf)
-        self.detail.draw(surf)
-        self.menu_btn.draw(surf)
-        self.retry_btn.draw(surf)
+        return self.layer.draw(surf)
 
     def handle_event(self, event):
         self.menu_btn.handle_event(event, self.go_to_menu)
@@ -837,33 +1690,260 @@ class GameOverScene(Scene):
 # =========================================================
 # 6. 메인 실행 루프
 # =========================================================
-def main():
-    # 씬 전환 콜백 정의
-    current_scene = {"scene": None}
-    def go_to_menu():
-        current_scene["scene"] = MenuScene(go_to_game, go_to_howto)
-    def go_to_game():
-        current_scene["scene"] = GameScene(go_to_menu, go_to_gameover)
-
-    def go_to_howto():
-        current_scene["scene"] = HowToScene(go_to_menu)
-
-    def go_to_gameover(score, reason, winner):
-        current_scene["scene"] = GameOverScene(score, reason, winner, go_to_menu, go_to_game)
-
+def describe_scene(scene):
+    # 워치독 스레드에서 호출 — 값만 읽어서 한 줄로
+    name = type(scene).__name__
+    if isinstance(scene, GameScene):
+        sh = scene.shuttle
+        return (f"{name} score={scene.score} server={scene.server} rally={scene.rally_active} "
+                f"last_hitter={scene.last_hitter} t={scene.time_elapsed:.2f} "
+                f"shuttle=({sh.pos[0]:.0f},{sh.pos[1]:.0f}) v=({sh.vel[0]:.0f},{sh.vel[1]:.0f})")
+    return name
+
+# 관전: 방송할 값 배치 — 셔틀 x, y, z, vx, vy, 잔상 개수, 점수 top/bottom, 깜빡임(ms), 선수별 x, y
+_SPECTATE_HEAD = 9
+
+def spectator_state(scene):
+    """경기 씬의 그릴 상태를 양자화된 정수 목록 + info 글자로 (경기 씬이 아니면 None)"""
+    if not isinstance(scene, GameScene):
+        return None
+    sh = scene.shuttle
+    q = SPECTATE_QUANT
+    values = [round(sh.pos[0] * q), round(sh.pos[1] * q), round(sh.z * q),
+              round(sh.vel[0]), round(sh.vel[1]), sh.trail_count,
+              scene.score["top"], scene.score["bottom"], round(scene.score_flash_t * 1000)]
+    for p in scene.players:
+        values.append(round(p.pos[0] * q))
+        values.append(round(p.pos[1] * q))
+    return values, scene.info.text
+
+def spectator_fits(scene, values):
+    return len(values) == _SPECTATE_HEAD + 2 * len(scene.players)
+
+def spectator_scene(values):
+    # 시청자 쪽 씬: 시뮬레이션은 돌리지 않고 받은 상태로 draw만
+    return GameScene(lambda: None, lambda *a: None, doubles=(len(values) - _SPECTATE_HEAD) // 2 == 4)
+
+def apply_spectator_state(scene, values, text, tick):
+    q = SPECTATE_QUANT
+    sh = scene.shuttle
+    sh.pos[0] = values[0] / q
+    sh.pos[1] = values[1] / q
+    sh.z = values[2] / q
+    sh.vel[0] = values[3]
+    sh.vel[1] = values[4]
+    if values[5] == 0:
+        sh.reset_trail()
+    elif tick != getattr(scene, "spectate_tick", None):
+        sh.push_trail()      # 새 틱을 받았을 때만 잔상 추가
+    scene.spectate_tick = tick
+    scene.score["top"] = values[6]
+    scene.score["bottom"] = values[7]
+    scene.score_flash_t = values[8] / 1000.0
+    for i, p in enumerate(scene.players):
+        p.pos[0] = values[_SPECTATE_HEAD + 2 * i] / q
+        p.pos[1] = values[_SPECTATE_HEAD + 2 * i + 1] / q
+    scene.info.set_text(text)
+
+def spectator_service(app):
+    # main_async 서비스: 매 프레임 끝에 상태를 넘기고, 전송은 프레임 사이에
+    server = SpectatorServer(spectator_state, SPECTATE_HOST, SPECTATE_PORT, SPECTATE_KEYFRAME_EVERY)
+    app.frame_hooks.append(server.publish)
+    return server.serve()
+
+class App:
+    """씬 전환 콜백 + 프레임 처리. 동기 main()과 asyncio main_async()가 같이 씀"""
+    def __init__(self):
+        global TELEMETRY
+        if TELEMETRY_DIR and TELEMETRY is None:
+            TELEMETRY = TelemetryRecorder(TELEMETRY_DIR)
+            atexit.register(TELEMETRY.close)   # 메뉴 종료/창 닫기 모두 남은 배치 기록
+
+        self.scene = None
+        self.scene_switched = False   # 이번 프레임에 씬이 바뀜 → 프레임 끝에 GC 전환 수거
+        self.frame_hooks = []   # 프레임 끝에 hook(scene) 호출 (관전 방송 등)
+        self.journal = get_journal() if JOURNAL_DIR else None
+        get_atlas()       # 스프라이트 아틀라스는 시작할 때 한 번 생성
+        self.go_to_menu() # 시작은 메뉴
+
+        # 폰트/메뉴 등 초기 자산 로드 이후 살아 있는 객체는 GC 대상에서 제외(freeze)
+        self.gc_policy = GCPolicy().start() if GC_POLICY else None
+        if self.gc_policy and GC_REPORT:
+            atexit.register(lambda: print("[GC]", self.gc_policy.report()))
+
+        self.alloc_counter = FrameAllocCounter() if DEBUG_ALLOC else None
+
+        self.watchdog = None
+        if WATCHDOG_LOG:
+            self.watchdog = FrameWatchdog(WATCHDOG_LOG, budget=1.0 / FPS, factor=WATCHDOG_FACTOR,
+                                          state_fn=lambda: describe_scene(self.scene)).start()
+
+    # --- 씬 전환 콜백 -----------------------------------------------------------
+    def switch_to(self, scene):
+        """모든 씬 전환이 지나는 곳 (이벤트 처리 중이든 update 중 득점→게임 오버든)"""
+        self.scene = scene
+        self.scene_switched = True
+
+    def go_to_menu(self):
+        resume = self.go_to_resume if SAVE_PATH and get_match_saver().exists() else None
+        session = self.journal.stats.summary() if self.journal else None
+        self.switch_to(MenuScene(self.go_to_game, self.go_to_howto, self.go_to_drill,
+                               lambda: self.go_to_game(doubles=True), resume, session))
+
+    def go_to_game(self, doubles=False):
+        self.switch_to(GameScene(self.go_to_menu, self.go_to_gameover, doubles))
+        if SAVE_PATH:
+            self.scene.saver = get_match_saver()
+        if self.journal:
+            self.scene.journal = self.journal
+            self.journal.setting("match", f"{'doubles' if doubles else 'singles'} "
+                                          f"{self.scene.diff_mode} {SHUTTLE_PHYSICS}")
+        if INSTANT_REPLAY_SECONDS:
+            self.scene.replay_ring = StateRing(int(INSTANT_REPLAY_SECONDS * FPS),
+                                               _SPECTATE_HEAD + 2 * len(self.scene.players))
+        if RECORD_DIR and not AI_WORKER:   # 워커 AI는 비동기라 다시 시뮬레이션할 수 없음
+            self.scene.recorder = MatchRecorder(RECORD_DIR, SHUTTLE_PHYSICS)
+            self.scene.recorder.start(self.scene.snapshot())
+
+    def go_to_resume(self):
+        # 저장된 경기(ESC로 멈춘 것 또는 정전 전 자동 저장)를 그대로 이어서
+        saver = get_match_saver()
+        payload = saver.load()
+        if payload is None:
+            self.go_to_menu()
+            return
+        self.go_to_game(peek_doubles(payload))
+        try:
+            self.scene.restore(payload)
+        except (ValueError, struct.error):
+            saver.discard()           # 버전이 다른 등 못 쓰는 저장 → 버리고 메뉴로
+            self.go_to_menu()
+            return
+        if self.scene.recorder:
+            self.scene.recorder.start(self.scene.snapshot())   # 복원한 상태부터 기록
+
+    def go_to_howto(self):
+        self.switch_to(HowToScene(self.go_to_menu))
+
+    def go_to_drill(self):
+        self.switch_to(DrillScene(self.go_to_menu))
+        self.scene.journal = self.journal
+
+    def go_to_gameover(self, score, reason, winner):
+        doubles = getattr(self.scene, "doubles", False)   # Retry는 같은 모드로
+        self.switch_to(GameOverScene(score, reason, winner, self.go_to_menu,
+                                     lambda: self.go_to_game(doubles)))
+
+    # --- 프레임 ---------------------------------------------------------------
+    def idle(self):
+        """정적 씬이 다시 그릴 것도 없으면 True (워치독에는 의도적인 대기로 알림)"""
+        scene = self.scene
+        if scene.static and not scene.dirty:
+            if self.watchdog:
+                self.watchdog.idle()
+            return True
+        return False
+
+    def frame(self, dt, events):
+        """이벤트 → update → draw 한 프레임. 창을 닫으면 False"""
+        if self.watchdog:
+            self.watchdog.beat()
+        alloc_counter = self.alloc_counter
+        if alloc_counter:
+            alloc_counter.begin()
+
+        scene = self.scene
+        exposed = False
+        for event in events:
+            if event.type == pygame.QUIT:
+                return False
+            if event.type == pygame.VIDEOEXPOSE:
+                exposed = True
+            if event.type == pygame.KEYDOWN and event.key == KEY_FULLSCREEN:
+                if DISPLAY.toggle_fullscreen():
+                    exposed = True          # 화면 전체를 다시 올림
+                    scene.dirty = True
+                continue
+            if event.type != pygame.MOUSEMOTION:
+                scene.dirty = True      # 호버 변화는 update에서 판단, 그 외 이벤트는 다시 그림
+            scene.handle_event(event)
+
+        scene = self.scene               # 이벤트 처리 중 씬이 바뀌었을 수 있음
+        scene.update(dt)
+        if self.gc_policy:
+            self.gc_policy.frame(isinstance(scene, GameScene) and scene.rally_active)
+        for hook in self.frame_hooks:
+            hook(scene)
+        if self.scene_switched and self.scene is not scene:
+            scene = self.scene           # update 중 씬이 바뀜(게임 오버 등) → 지난 씬 말고 새 씬을 바로 그림
+        if not scene.static or scene.dirty:
+            # UILayer 씬은 바뀐 영역만 반환 → 그 부분만 화면 갱신
+            rects = scene.draw(screen)
+            if rects is None or exposed:
+                pygame.display.flip()
+            elif rects:
+                pygame.display.update(rects)
+            scene.dirty = False
+        if alloc_counter:
+            alloc_counter.end()
+            if alloc_counter.count % 30 == 0:
+                pygame.display.set_caption(alloc_counter.summary())
+        if self.scene_switched:
+            # 씬 전환(이벤트든 update 중이든): 화면이 바뀌는 김에 전체 수거 — 이전 씬을 놓은 뒤에
+            self.scene_switched = False
+            scene = None
+            if self.gc_policy:
+                self.gc_policy.transition()
+        return True
 
-    go_to_menu()  # 시작은 메뉴
 
+def main():
+    app = App()
     while True:
-        dt = clock.tick(FPS) / 1000.0  # 초 단위
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
-            current_scene["scene"].handle_event(event)
-
-        current_scene["scene"].update(dt)
-        current_scene["scene"].draw(screen)
-        pygame.display.flip()
+        if app.idle():
+            # 정적 씬: 입력(또는 타이머 이벤트)이 올 때까지 잠듦 → 메뉴 대기 중 CPU 거의 0
+            first = pygame.event.wait(IDLE_WAIT_MS)
+            events = pygame.event.get()
+            if first.type != pygame.NOEVENT:
+                events.insert(0, first)
+            clock.tick()   # 잠든 시간이 다음 dt로 튀지 않게 기준 재설정
+            dt = 0.0
+        else:
+            dt = clock.tick(FPS) / 1000.0  # 초 단위
+            events = pygame.event.get()
+        if not app.frame(dt, events):
+            pygame.quit(); sys.exit()
+
+
+async def main_async(*services):
+    """
+    asyncio 버전 메인 루프. services는 app을 받아 코루틴을 돌려주는 함수들
+    (네트워크, 로컬 수집기로 텔레메트리 전송 등) — 프레임 사이 남는 시간에 같이 돈다.
+    """
+    app = App()
+    pacer = FramePacer()
+    tasks = [start_service(make(app), getattr(make, "__name__", None)) for make in services]
+    try:
+        while True:
+            if app.idle():
+                # 이벤트 대기로 막을 수 없으니 짧게 양보하며 확인 (그동안 I/O 코루틴이 돎)
+                await pacer.idle(IDLE_POLL)
+                events = pygame.event.get()
+                if not events:
+                    continue
+                dt = 0.0
+            else:
+                dt = await pacer.tick(FPS)
+                events = pygame.event.get()
+            if not app.frame(dt, events):
+                break
+    finally:
+        await stop_services(tasks)
+    pygame.quit()
 
 if __name__ == "__main__":
-    main()
+    services = [spectator_service] if SPECTATE_PORT else []
+    if ASYNC_LOOP or services:
+        asyncio.run(main_async(*services))
+    else:
+        main()
@@ -3,6 +3,9 @@ import sys
 from pygame import transform as pg_transform
 import math
 import random
+import atexit
+
+from bjc_scores import ScoreStore, format_row
 # =========================================================
 # 1. 기본 설정 & 전역 상수
 # =========================================================
@@ -53,6 +56,11 @@ SCORE_FLASH_DURATION = 0.45   # 깜빡임 총 시간(초)
 SCORE_MAX_SCALE      = 1.25   # 글자 최대 확대 배율
 SCORE_FLASH_COLOR    = (30, 144, 255)  # 하이라이트 색
 
+# === 기록(하이스코어) ===
+SCORE_DB = "bjc_scores.db"   # 경기 기록 SQLite 파일. None이면 기록 안 함
+SCORES   = None              # main()에서 ScoreStore 생성
+LEADERBOARD_N = 5            # 화면에 보일 순위 수
+
 # === 키 매핑 ===
 KEY_SERVE = pygame.K_RETURN   # Enter로 서브
 KEY_SMASH = pygame.K_SPACE    # Space는 스매시 전용
@@ -106,6 +114,35 @@ class Label:
         self.rect.center = self.center
         surf.blit(self.surf, self.rect)
 
+class LeaderboardPanel:
+    """ScoreStore 스냅샷의 한 목록을 보여주는 패널 (스냅샷이 바뀔 때만 다시 렌더)"""
+    def __init__(self, title, rows_of, topleft, width=420):
+        self.title = title
+        self.rows_of = rows_of          # snapshot -> rows
+        self.rect = pygame.Rect(topleft[0], topleft[1], width, 40 + 26 * LEADERBOARD_N)
+        self.version = -1
+        self.surfs = []
+
+    def update(self):
+        snap = SCORES.snapshot if SCORES else None
+        if snap is None or snap.version == self.version:
+            return
+        self.version = snap.version
+        rows = self.rows_of(snap)
+        lines = [format_row(i + 1, r) for i, r in enumerate(rows)] or ["기록 없음"]
+        self.surfs = [FONT_M.render(self.title, True, BLACK)] + \
+                     [FONT_S.render(t, True, (60,60,60)) for t in lines]
+
+    def draw(self, surf):
+        if not self.surfs:
+            return
+        pygame.draw.rect(surf, (240,244,250), self.rect, border_radius=12)
+        pygame.draw.rect(surf, (0,0,0), self.rect, width=2, border_radius=12)
+        x, y = self.rect.left + 16, self.rect.top + 8
+        for i, s in enumerate(self.surfs):
+            surf.blit(s, (x, y))
+            y += 34 if i == 0 else 26
+
 # =========================================================
 # 3. 씬(Scene) 기본 구조
 # =========================================================
@@ -249,12 +286,14 @@ class MenuScene(Scene):
         self.quit_btn  = Button("종료", center=(WIDTH//2, 460))
         self.go_to_game = go_to_game
         self.go_to_howto = go_to_howto
+        self.board = LeaderboardPanel("명예의 전당 (점수 차)", lambda s: s.top, (WIDTH//2 - 210, 530))
 
     def update(self, dt):
         mouse_pos = pygame.mouse.get_pos()
         self.start_btn.update(mouse_pos)
         self.howto_btn.update(mouse_pos)
         self.quit_btn.update(mouse_pos)
+        self.board.update()
 
     def draw(self, surf):
         surf.fill(WHITE)
@@ -262,6 +301,7 @@ class MenuScene(Scene):
         self.start_btn.draw(surf)
         self.howto_btn.draw(surf)
         self.quit_btn.draw(surf)
+        self.board.draw(surf)
 
         guide = [
             "조작: ←/→/↑/↓ 이동, Enter=서브, Space 스매시, R 랠리리셋, ESC 메뉴",
@@ -424,7 +464,9 @@ class GameScene(Scene):
         self.server = winner
         if self.is_game_over():
             w = "TOP" if self.score["top"] > self.score["bottom"] else "BOTTOM"
-            self.go_to_gameover({"top": self.score["top"], "bottom": self.score["bottom"]}, reason, w)
+            if SCORES:
+                SCORES.record_match(self.score, w, reason, self.diff_mode, self.time_elapsed)  # 큐에 넣기만 함
+            self.go_to_gameover({"top": self.score["top"], "bottom": self.score["bottom"]}, reason, w, self.diff_mode)
             return
         
         # 다음 서브로 전환
@@ -692,7 +734,7 @@ class GameScene(Scene):
 # 5.5 GameOverScene
 # =========================================================
 class GameOverScene(Scene):
-    def __init__(self, score, reason, winner, go_to_menu, go_to_game):
+    def __init__(self, score, reason, winner, go_to_menu, go_to_game, difficulty="normal"):
         self.title = Label("GAME OVER", center=(WIDTH//2, 120))
         detail = f"Reason: {reason} | Winner: {winner} | TOP {score['top']} : {score['bottom']} BOTTOM"
         self.detail = Label(detail, center=(WIDTH//2, 180), font=FONT_M)
@@ -700,11 +742,18 @@ class GameOverScene(Scene):
         self.retry_btn = Button("다시하기", center=(WIDTH//2 + 150, 320))
         self.go_to_menu = go_to_menu
         self.go_to_game = go_to_game
+        # 방금 경기는 쓰기 스레드가 반영하는 대로 다음 스냅샷에 나타남
+        self.boards = [
+            LeaderboardPanel(f"{difficulty.upper()} 순위", lambda s: s.by_difficulty.get(difficulty, ()),
+                             (WIDTH//2 - 210, 420)),
+            LeaderboardPanel("오늘의 순위", lambda s: s.today, (WIDTH//2 - 210, 640)),
+        ]
 
     def update(self, dt):
         mouse_pos = pygame.mouse.get_pos()
         self.menu_btn.update(mouse_pos)
         self.retry_btn.update(mouse_pos)
+        for b in self.boards: b.update()
 
     def draw(self, surf):
         surf.fill(WHITE)
@@ -712,6 +761,7 @@ class GameOverScene(Scene):
         self.detail.draw(surf)
         self.menu_btn.draw(surf)
         self.retry_btn.draw(surf)
+        for b in self.boards: b.draw(surf)
 
     def handle_event(self, event):
         self.menu_btn.handle_event(event, self.go_to_menu)
@@ -721,6 +771,11 @@ class GameOverScene(Scene):
 # 6. 메인 실행 루프
 # =========================================================
 def main():
+    global SCORES
+    if SCORE_DB and SCORES is None:
+        SCORES = ScoreStore(SCORE_DB, top_n=LEADERBOARD_N, difficulties=DIFFICULTY.keys())
+        atexit.register(SCORES.close)
+
     # 씬 전환 콜백 정의
     current_scene = {"scene": None}
     def go_to_menu():
@@ -731,8 +786,8 @@ def main():
     def go_to_howto():
         current_scene["scene"] = HowToScene(go_to_menu)
 
-    def go_to_gameover(score, reason, winner):
-        current_scene["scene"] = GameOverScene(score, reason, winner, go_to_menu, go_to_game)
+    def go_to_gameover(score, reason, winner, difficulty="normal"):
+        current_scene["scene"] = GameOverScene(score, reason, winner, go_to_menu, go_to_game, difficulty)
 
 
     go_to_menu()  # 시작은 메뉴
@@ -0,0 +1,80 @@
+import gc
+import time
+
+# ------------------------------------------------------------------------------
+# GC-aware frame scheduling
+# - freeze(): after assets are loaded, move everything alive into the permanent
+#   generation so later collections never rescan fonts/surfaces/modules.
+# - Automatic collection is disabled for the whole session. Instead:
+#     * during a rally: nothing runs (unless gen0 grows past a safety limit)
+#     * during serve waits / static scenes: one young-generation step per frame
+#     * on scene transitions: a full collection (the screen changes anyway)
+# - Every collection is timed through gc.callbacks and summarised by report().
+# ------------------------------------------------------------------------------
+
+class GCPolicy:
+    def __init__(self, rally_limit=50):
+        th0, th1, _ = gc.get_threshold()
+        self.gen0_step = th0                 # step when gen0 has this many allocations
+        self.gen1_every = max(1, th1)        # every N gen0 steps, also gen1
+        self.rally_limit = th0 * rally_limit # safety valve for very long rallies
+        self.in_rally = False
+        self._steps = 0
+        self._t0 = 0.0
+        # generation -> [count, total_s, max_s]
+        self.stats = {0: [0, 0.0, 0.0], 1: [0, 0.0, 0.0], 2: [0, 0.0, 0.0]}
+        self.rally_collections = 0
+        self.active = False
+
+    def start(self):
+        gc.collect()
+        gc.freeze()
+        gc.disable()
+        gc.callbacks.append(self._on_gc)
+        self.active = True
+        return self
+
+    def stop(self):
+        if not self.active:
+            return
+        gc.callbacks.remove(self._on_gc)
+        gc.unfreeze()
+        gc.enable()
+        self.active = False
+
+    # --- called from the main loop --------------------------------------------
+    def frame(self, in_rally):
+        self.in_rally = in_rally
+        count0 = gc.get_count()[0]
+        if in_rally:
+            if count0 > self.rally_limit:
+                gc.collect(0)          # 최후의 수단: 메모리가 한없이 늘지 않게
+            return
+        if count0 >= self.gen0_step:
+            self._steps += 1
+            gc.collect(1 if self._steps % self.gen1_every == 0 else 0)
+
+    def transition(self):
+        self.in_rally = False
+        gc.collect()
+
+    # --- reporting -----------------------------------------------------------
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._t0 = time.perf_counter()
+            return
+        dt = time.perf_counter() - self._t0
+        st = self.stats[info["generation"]]
+        st[0] += 1; st[1] += dt
+        if dt > st[2]:
+            st[2] = dt
+        if self.in_rally:
+            self.rally_collections += 1
+
+    def report(self):
+        parts = []
+        for gen, (n, total, mx) in self.stats.items():
+            avg = (total / n * 1000.0) if n else 0.0
+            parts.append(f"gen{gen}: n={n} avg={avg:.2f}ms max={mx * 1000.0:.2f}ms")
+        parts.append(f"during rally: {self.rally_collections}")
+        return " | ".join(parts)
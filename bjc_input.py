@@ -0,0 +1,25 @@
+import pygame
+
+# ------------------------------------------------------------------------------
+# Input bitmask
+# One byte per frame describes the keys a player holds: arrows, smash and the
+# serve key press. The server reads it from clients, recordings store it per
+# frame and headless tools (tile viewer, allocation check) drive players with
+# it. InputKeys exposes a mask in the keys[K_...] shape GameScene.keys expects,
+# so the unchanged scene code reads it like pygame.key.get_pressed().
+# ------------------------------------------------------------------------------
+
+LEFT, RIGHT, UP, DOWN, SWING, SERVE = 1, 2, 4, 8, 16, 32
+KEY_BITS = {pygame.K_LEFT: LEFT, pygame.K_RIGHT: RIGHT, pygame.K_UP: UP,
+            pygame.K_DOWN: DOWN, pygame.K_SPACE: SWING}
+
+
+class InputKeys:
+    """입력 비트마스크를 keys[K_...] 모양으로 — GameScene.keys에 넣음"""
+    __slots__ = ("mask",)
+
+    def __init__(self):
+        self.mask = 0
+
+    def __getitem__(self, key):
+        return (self.mask & KEY_BITS.get(key, 0)) != 0
@@ -0,0 +1,176 @@
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+
+from bjc_telemetry import REASONS, SIDES
+
+# ------------------------------------------------------------------------------
+# Session journal (write-ahead, append-only)
+# Every point, game over and settings change becomes one record:
+#   record := size:u32 crc32:u32 body[size]      body := kind:u8 t:f64 data
+# The game thread only packs the record and puts it on a queue. A writer thread
+# group-commits: it takes everything queued within `group_window` seconds,
+# appends it with one write() and one fsync(). On startup the file is replayed
+# to rebuild SessionStats; a torn or corrupt tail (crash mid-write) ends the
+# replay and is truncated so later appends stay readable.
+# ------------------------------------------------------------------------------
+
+POINT, GAME_OVER, SETTING = 1, 2, 3
+
+_REC    = struct.Struct("<II")
+_HEAD   = struct.Struct("<Bd")
+_POINT  = struct.Struct("<BBHH")      # winner, reason (255=기타), score top/bottom
+_OVER   = struct.Struct("<BBHHf")     # + 경기 시간(초)
+
+
+def _reason_code(reason):
+    return REASONS.index(reason) if reason in REASONS else 255
+
+
+def encode(kind, t, data):
+    body = _HEAD.pack(kind, t) + data
+    return _REC.pack(len(body), zlib.crc32(body)) + body
+
+
+def read_records(path):
+    """(kind, t, data) 목록과 마지막 온전한 레코드 끝 위치"""
+    try:
+        with open(path, "rb") as f:
+            buf = f.read()
+    except FileNotFoundError:
+        return [], 0
+    out = []
+    off = 0
+    while off + _REC.size <= len(buf):
+        size, crc = _REC.unpack_from(buf, off)
+        start = off + _REC.size
+        end = start + size
+        if size < _HEAD.size or end > len(buf):
+            break                       # 쓰다 끊긴 꼬리
+        body = buf[start:end]
+        if zlib.crc32(body) != crc:
+            break                       # 깨진 레코드 — 여기서부터는 믿지 않음
+        kind, t = _HEAD.unpack_from(body)
+        out.append((kind, t, body[_HEAD.size:]))
+        off = end
+    return out, off
+
+
+class SessionStats:
+    """저널 레코드로 쌓는 세션 통계 (재생/실시간 같은 코드)"""
+    def __init__(self):
+        self.games = 0
+        self.wins = {"top": 0, "bottom": 0}
+        self.points = {"top": 0, "bottom": 0}
+        self.reasons = {}
+        self.score = (0, 0)             # 마지막 점수 (진행 중이던 경기)
+        self.settings = {}
+        self.version = 0                # 바뀔 때마다 증가 → UI가 다시 렌더
+
+    def apply(self, kind, t, data):
+        if kind == POINT:
+            w, r, top, bottom = _POINT.unpack(data)
+            self.points[SIDES[w]] += 1
+            name = REASONS[r] if r < len(REASONS) else "other"
+            self.reasons[name] = self.reasons.get(name, 0) + 1
+            self.score = (top, bottom)
+        elif kind == GAME_OVER:
+            w, r, top, bottom, _ = _OVER.unpack(data)
+            self.games += 1
+            self.wins[SIDES[w]] += 1
+            self.score = (0, 0)
+        elif kind == SETTING:
+            key, _, value = data.decode("utf-8").partition("=")
+            self.settings[key] = value
+        self.version += 1
+
+    def summary(self):
+        return (f"Session: {self.games} games  |  BOTTOM {self.wins['bottom']} - {self.wins['top']} TOP  |  "
+                f"points {self.points['bottom']} : {self.points['top']}")
+
+
+class Journal:
+    def __init__(self, path, group_window=0.02, fsync=True):
+        self.path = path
+        self.group_window = group_window
+        self.fsync = fsync
+        self.stats = SessionStats()
+        self.batches = 0
+        self.records = 0
+        self.fsync_max = 0.0
+        self.replay()
+        self._q = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._writer, name="journal-writer", daemon=True)
+        self._thread.start()
+
+    def replay(self):
+        """시작할 때 한 번: 기록을 다시 읽어 통계 재구성 + 깨진 꼬리 잘라내기"""
+        records, good = read_records(self.path)
+        for rec in records:
+            self.stats.apply(*rec)
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        if os.path.exists(self.path) and os.path.getsize(self.path) != good:
+            with open(self.path, "r+b") as f:
+                f.truncate(good)
+        return len(records)
+
+    # --- game side (never blocks on the disk) ------------------------------------
+    def point(self, winner, reason, score):
+        self._append(POINT, _POINT.pack(SIDES.index(winner), _reason_code(reason),
+                                        score["top"], score["bottom"]))
+
+    def game_over(self, winner, reason, score, duration):
+        self._append(GAME_OVER, _OVER.pack(SIDES.index(winner), _reason_code(reason),
+                                           score["top"], score["bottom"], duration))
+
+    def setting(self, key, value):
+        self._append(SETTING, f"{key}={value}".encode("utf-8"))
+
+    def close(self, timeout=2.0):
+        self._q.put(None)
+        self._thread.join(timeout)
+
+    def _append(self, kind, data):
+        t = time.time()
+        self.stats.apply(kind, t, data)
+        self._q.put(encode(kind, t, data))
+
+    # --- writer thread -------------------------------------------------------------
+    def _writer(self):
+        with open(self.path, "ab") as f:
+            while True:
+                item = self._q.get()
+                if item is None:
+                    return
+                batch = [item]
+                # 그룹 커밋: 잠깐 더 모아서 write 한 번 + fsync 한 번
+                deadline = time.monotonic() + self.group_window
+                stop = False
+                while True:
+                    left = deadline - time.monotonic()
+                    try:
+                        item = self._q.get(timeout=left) if left > 0 else self._q.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stop = True
+                        break
+                    batch.append(item)
+                try:
+                    f.write(b"".join(batch))
+                    f.flush()
+                    if self.fsync:
+                        t0 = time.perf_counter()
+                        os.fsync(f.fileno())
+                        self.fsync_max = max(self.fsync_max, time.perf_counter() - t0)
+                except OSError:
+                    pass            # 디스크 문제로 게임을 멈추지 않음
+                self.batches += 1
+                self.records += len(batch)
+                if stop:
+                    return
@@ -0,0 +1,170 @@
+import array
+
+import pygame
+
+# ------------------------------------------------------------------------------
+# Sub-frame line calls + challenge replay
+# first_crossing() judges the segment the shuttle travelled this frame
+# (previous -> current position) instead of the end sample alone, and returns
+# where along it the shuttle first touched a side line band or crossed a
+# baseline. The call no longer depends on how far the shuttle moved per tick.
+# ShotHistory keeps the last few seconds of shuttle samples in preallocated
+# arrays (no per-frame objects); ChallengeReplay plays the last shot back
+# slowed down and zoomed in on the computed impact point.
+# ------------------------------------------------------------------------------
+
+SIDE, BASELINE = "side", "baseline"
+
+
+def _enter(a0, a1, edge, below):
+    """a0→a1 구간에서 edge를 넘어서는(below면 a <= edge, 아니면 a >= edge) 비율 t, 없으면 None"""
+    if (a0 <= edge) if below else (a0 >= edge):
+        return 0.0
+    if (a1 <= edge) if below else (a1 >= edge):
+        return (a0 - edge) / (a0 - a1)
+    return None
+
+
+def _earliest(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return a if a <= b else b
+
+
+def first_crossing(x0, y0, x1, y1, rect, line_w):
+    """
+    (x0,y0)→(x1,y1) 이동 중 처음 난 판정 (t, SIDE|BASELINE), 없으면 None.
+    SIDE     : 좌/우 사이드 라인 밴드(바깥 line_w px)에 닿음 — 밖으로 나간 것 포함
+    BASELINE : 위/아래 베이스 라인 밖으로 넘어감 (라인 접촉은 인)
+    같은 시점이면 기존 판정 순서대로: 사이드 바깥 > 베이스 아웃 > 사이드 라인 밴드
+    """
+    t_side = _earliest(_enter(x0, x1, rect.left + line_w, True),
+                       _enter(x0, x1, rect.right - line_w, False))
+    t_base = _earliest(_enter(y0, y1, rect.top, True),
+                       _enter(y0, y1, rect.bottom, False))
+    if t_side is None and t_base is None:
+        return None
+    if t_base is None or (t_side is not None and t_side < t_base):
+        return t_side, SIDE
+    if t_side is None or t_base < t_side:
+        return t_base, BASELINE
+    # 같은 t (보통 한 점 판정): 그 지점이 사이드 바깥이면 SIDE
+    x = x0 + (x1 - x0) * t_side
+    return t_side, (SIDE if x < rect.left or x > rect.right else BASELINE)
+
+
+class ShotHistory:
+    """최근 셔틀 샘플 (t, x, y, z) 링버퍼 — array('d')라 기록해도 객체가 쌓이지 않음"""
+    def __init__(self, capacity=240):
+        self.capacity = capacity
+        self.t = array.array("d", bytes(8 * capacity))
+        self.x = array.array("d", bytes(8 * capacity))
+        self.y = array.array("d", bytes(8 * capacity))
+        self.z = array.array("d", bytes(8 * capacity))
+        self.count = 0          # 지금까지 넣은 총 개수
+        self.shot_start = 0     # 마지막 타구가 시작된 샘플 번호
+
+    def clear(self):
+        self.count = 0
+        self.shot_start = 0
+
+    def push(self, t, x, y, z=0.0):
+        i = self.count % self.capacity
+        self.t[i] = t; self.x[i] = x; self.y[i] = y; self.z[i] = z
+        self.count += 1
+
+    def mark_shot(self):
+        # 다음에 넣을 샘플(타구 직후 위치)부터가 이번 타구
+        self.shot_start = self.count
+
+    def last_shot(self):
+        """마지막 타구부터 지금까지 [(t, x, y, z), ...] (버퍼에 남은 만큼)"""
+        start = max(self.shot_start, self.count - self.capacity)
+        out = []
+        for n in range(start, self.count):
+            i = n % self.capacity
+            out.append((self.t[i], self.x[i], self.y[i], self.z[i]))
+        return out
+
+
+class ChallengeReplay:
+    """
+    마지막 타구를 느리게, 판정 지점 주변을 확대해서 다시 보여줌.
+    background: 코트가 그려진 화면 크기 표면, samples: ShotHistory.last_shot()
+    """
+    def __init__(self, background, samples, point, verdict, font,
+                 speed=0.25, zoom=4, panel=(640, 480), hold=1.5, z_scale=0.0):
+        self.background = background
+        self.samples = samples
+        self.point = point
+        self.verdict = verdict
+        self.speed = speed
+        self.hold = hold
+        self.z_scale = z_scale
+        self.t0 = samples[0][0] if samples else 0.0
+        self.t_end = samples[-1][0] if samples else 0.0
+        self.t = self.t0
+        self.hold_left = hold
+        self.done = False
+
+        sw, sh = background.get_size()
+        self.panel = pygame.Rect(0, 0, *panel)
+        self.panel.center = (sw // 2, sh // 2)
+        # 판정 지점을 중심으로 한 원본 영역(화면 밖으로 나가지 않게)
+        self.crop = pygame.Rect(0, 0, panel[0] // zoom, panel[1] // zoom)
+        self.crop.center = (int(point[0]), int(point[1]))
+        self.crop.clamp_ip(background.get_rect())
+        self.zoom = zoom
+        self.work = pygame.Surface(self.crop.size).convert()
+        self.scaled = pygame.Surface(self.panel.size).convert()
+        self.title = font.render(f"CHALLENGE — {verdict}", True, (255, 255, 255))
+        self.points = []        # 확대 좌표로 바꾼 경로 (재생 시간까지)
+
+    def update(self, dt):
+        if self.t < self.t_end:
+            self.t = min(self.t_end, self.t + dt * self.speed)
+        else:
+            self.hold_left -= dt
+            if self.hold_left <= 0:
+                self.done = True
+
+    def _local(self, x, y, z):
+        return x - self.crop.left, y - z * self.z_scale - self.crop.top
+
+    def draw(self, surf):
+        work = self.work
+        work.blit(self.background, (0, 0), self.crop)
+        # 재생 시간까지의 경로 + 현재 셔틀
+        pts = self.points
+        pts.clear()
+        cur = None
+        prev = None
+        for t, x, y, z in self.samples:
+            if t > self.t:
+                if prev is not None:   # 두 샘플 사이는 보간
+                    pt, px, py, pz = prev
+                    u = (self.t - pt) / (t - pt) if t > pt else 1.0
+                    cur = self._local(px + (x - px) * u, py + (y - py) * u, pz + (z - pz) * u)
+                    pts.append(cur)
+                break
+            cur = self._local(x, y, z)
+            pts.append(cur)
+            prev = (t, x, y, z)
+        if len(pts) >= 2:
+            pygame.draw.lines(work, (30, 144, 255), False, pts, 1)
+        if cur is not None:
+            pygame.draw.circle(work, (30, 144, 255), (int(cur[0]), int(cur[1])), 3)
+        # 판정 지점 (재생이 끝나면 표시)
+        if self.t >= self.t_end:
+            ix, iy = self.point[0] - self.crop.left, self.point[1] - self.crop.top
+            pygame.draw.line(work, (220, 40, 40), (ix - 4, iy - 4), (ix + 4, iy + 4), 1)
+            pygame.draw.line(work, (220, 40, 40), (ix - 4, iy + 4), (ix + 4, iy - 4), 1)
+
+        pygame.transform.scale(work, self.panel.size, self.scaled)
+        surf.blit(self.scaled, self.panel)
+        pygame.draw.rect(surf, (0, 0, 0), self.panel, width=3)
+        bar = pygame.Rect(self.panel.left, self.panel.top - 32, self.panel.width, 32)
+        pygame.draw.rect(surf, (40, 40, 40), bar)
+        surf.blit(self.title, (bar.left + 10, bar.centery - self.title.get_height() // 2))
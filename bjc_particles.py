@@ -0,0 +1,166 @@
+from itertools import islice
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:          # NumPy 없으면 효과만 끔 (게임은 그대로)
+    np = None
+
+# ------------------------------------------------------------------------------
+# Pooled particle system
+# Fixed-size structure-of-arrays pool (position, velocity, life) updated with
+# vectorised NumPy ops. Live particles are kept packed at the front of the
+# arrays (a dead particle's slot is refilled from the back), so spawning and
+# update work on slices and write into preallocated buffers — no arrays are
+# created per frame. Drawing maps each live particle to a pre-rendered sprite
+# (per kind and fade level), converts the sprite numbers and coordinates to
+# Python lists once per frame (no per-element NumPy scalars) and issues a
+# single Surface.blits call over reused [sprite, Rect] entries. Spawning and
+# drawing both have hard per-frame budgets, so bursts degrade gracefully
+# instead of costing frames. The RNG takes a seed so runs are reproducible.
+# ------------------------------------------------------------------------------
+FADE_LEVELS = 4
+
+
+def make_sprites(kinds):
+    """kinds: [(radius, (r, g, b)), ...] -> 종류별 FADE_LEVELS 단계 알파 스프라이트 (흐린→진한 순)"""
+    sprites = []
+    for radius, color in kinds:
+        size = 2 * radius + 2
+        for level in range(FADE_LEVELS):
+            alpha = int(255 * (level + 1) / FADE_LEVELS)
+            s = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(s, (*color, alpha), (size // 2, size // 2), radius)
+            sprites.append(s.convert_alpha() if pygame.display.get_surface() else s)
+    return sprites
+
+
+class ParticlePool:
+    def __init__(self, sprites, capacity=512, spawn_budget=64, draw_budget=256,
+                 drag=0.90, gravity=0.0, seed=None):
+        self.available = np is not None
+        self.sprites = sprites
+        self.capacity = capacity
+        self.spawn_budget = spawn_budget
+        self.draw_budget = draw_budget
+        self.drag = drag
+        self.gravity = gravity
+        self.spawned_this_frame = 0
+        self.dropped = 0
+        self.count = 0               # 살아 있는 입자 수 — 항상 앞쪽 [0, count) 칸에 모여 있음
+        if not self.available:
+            return
+        self.rng = np.random.default_rng(seed)
+        self.pos  = np.zeros((capacity, 2), np.float32)
+        self.vel  = np.zeros((capacity, 2), np.float32)
+        self.life = np.zeros(capacity, np.float32)      # 남은 수명(초)
+        self.max_life = np.ones(capacity, np.float32)
+        self.base = np.zeros(capacity, np.int32)        # 종류의 첫 스프라이트 번호 (kind * FADE_LEVELS)
+        self.offset = np.zeros(capacity, np.float32)    # 중심 → 좌상단
+        self.offsets = [s.get_width() // 2 for s in sprites]
+        self.columns = (self.pos, self.vel, self.life, self.max_life, self.base, self.offset)
+        # 프레임마다 쓰는 작업 버퍼 (ufunc out=으로만 채움 — 생성/갱신/그리기 중 배열 할당 없음)
+        self._rand = [np.zeros(capacity, np.float32) for _ in range(3)]   # 각도, 속력, 수명
+        self._step = np.zeros((capacity, 2), np.float32)
+        self._alive = np.zeros(capacity, bool)
+        self._frac = np.zeros(capacity, np.float32)
+        self._level = np.zeros(capacity, np.int32)
+        self._x = np.zeros(capacity, np.float32)
+        self._y = np.zeros(capacity, np.float32)
+        # blits용 [표면, Rect] 항목 (재사용 — 좌표는 Rect에 제자리로), 앞에서부터 살아 있는 수만큼 그림
+        self._entries = [[sprites[0], pygame.Rect(0, 0, 0, 0)] for _ in range(min(draw_budget, capacity))]
+
+    def _uniform(self, j, n, lo, hi):
+        """작업 버퍼 j의 앞 n칸에 [lo, hi) 균등 난수 (새 배열 없이)"""
+        r = self._rand[j][:n]
+        self.rng.random(dtype=np.float32, out=r)
+        r *= hi - lo
+        r += lo
+        return r
+
+    def burst(self, x, y, count, kind=0, speed=180.0, life=0.45, direction=None, spread=3.1416):
+        if not self.available:
+            return 0
+        n = min(count, self.spawn_budget - self.spawned_this_frame)
+        if n <= 0:
+            self.dropped += count
+            return 0
+        n = min(n, self.capacity - self.count)
+        self.dropped += count - n
+        if n == 0:
+            return 0
+        self.spawned_this_frame += n
+        free = slice(self.count, self.count + n)
+        self.count += n
+        base = 0.0 if direction is None else direction
+        ang = self._uniform(0, n, base - spread, base + spread)
+        spd = self._uniform(1, n, 0.35 * speed, speed)
+        self.pos[free, 0] = x
+        self.pos[free, 1] = y
+        vx, vy = self.vel[free, 0], self.vel[free, 1]
+        np.cos(ang, out=vx)
+        np.sin(ang, out=vy)
+        vx *= spd
+        vy *= spd
+        lf = self._uniform(2, n, 0.6 * life, life)
+        self.life[free] = lf
+        self.max_life[free] = lf
+        self.base[free] = kind * FADE_LEVELS
+        self.offset[free] = self.offsets[kind * FADE_LEVELS]
+        return n
+
+    def update(self, dt):
+        self.spawned_this_frame = 0
+        n = self.count
+        if not self.available or n == 0:
+            return
+        pos, vel, life = self.pos[:n], self.vel[:n], self.life[:n]
+        step = self._step[:n]
+        np.multiply(vel, dt, out=step)
+        pos += step
+        vel *= self.drag
+        if self.gravity:
+            vel[:, 1] += self.gravity * dt
+        life -= dt
+        alive = self._alive
+        np.greater(life, 0.0, out=alive[:n])
+        k = int(np.count_nonzero(alive[:n]))
+        # 죽은 입자 자리에 맨 뒤의 입자를 옮겨 채움 (죽은 게 있는 프레임만, 죽은 수만큼)
+        while n > k:
+            i = int(alive[:n].argmin())
+            n -= 1
+            if i != n:
+                for col in self.columns:
+                    col[i] = col[n]
+                alive[i] = alive[n]
+        self.count = n
+
+    def clear(self):
+        if self.available:
+            self.count = 0
+            self.life[:] = 0.0
+
+    def draw(self, surf):
+        if not self.available:
+            return
+        n = min(self.count, len(self._entries))
+        if n == 0:
+            return
+        # 스프라이트 번호 = 종류 첫 번호 + 남은 수명 비율의 단계 (흐린→진한)
+        frac, level = self._frac[:n], self._level[:n]
+        np.divide(self.life[:n], self.max_life[:n], out=frac)
+        frac *= FADE_LEVELS
+        level[:] = frac
+        np.minimum(level, FADE_LEVELS - 1, out=level)
+        level += self.base[:n]
+        xs, ys = self._x[:n], self._y[:n]
+        np.subtract(self.pos[:n, 0], self.offset[:n], out=xs)
+        np.subtract(self.pos[:n, 1], self.offset[:n], out=ys)
+        sprites = self.sprites
+        for entry, lv, x, y in zip(self._entries, level.tolist(), xs.tolist(), ys.tolist()):
+            entry[0] = sprites[lv]
+            dest = entry[1]
+            dest.x = x                   # Rect가 정수로 반올림
+            dest.y = y
+        surf.blits(islice(self._entries, n), doreturn=False)
@@ -0,0 +1,154 @@
+import array
+import os
+import struct
+import threading
+import time
+import zlib
+
+import pygame
+
+from bjc_save import write_atomic
+from bjc_input import InputKeys, KEY_BITS, SERVE
+
+# ------------------------------------------------------------------------------
+# Match recordings (input log for deterministic re-simulation)
+# A recording is the GameScene.snapshot() taken when the match starts (score,
+# positions, difficulty and the `random` state the AI draws from) followed by
+# one entry per simulated frame: the frame's dt (f64, exactly what update()
+# got) and an input byte (arrow/smash keys held + serve/reset key presses since
+# the previous frame). Feeding the same dt and inputs into a fresh scene
+# restored from the snapshot reproduces the match bit for bit, so a recording
+# is ~9 bytes per frame (~0.5 MB per 15-minute match) instead of video.
+# Frames paused by a line-call challenge are not recorded (the rules do not
+# run then). Recording is skipped with AI_WORKER: worker decisions arrive
+# asynchronously and cannot be replayed.
+#
+# File := magic:4s version:u16 crc32:u32 physics:u8 snapshot:u32 frames:u32
+#         snapshot[..] dt:f64[frames] input:u8[frames]
+# ------------------------------------------------------------------------------
+
+MAGIC = b"BJCR"
+VERSION = 1
+_HEAD = struct.Struct("<4sHIBII")
+
+RESET = 64                     # R 키 (서브 다시 놓기) — bjc_input의 입력 비트 다음 칸
+PHYSICS = ("arcade", "drag")
+_KEY_ITEMS = tuple(KEY_BITS.items())
+
+
+class Recording:
+    def __init__(self, physics, snapshot, dts, inputs):
+        self.physics = physics       # SHUTTLE_PHYSICS 이름
+        self.snapshot = snapshot     # 시작 상태 (GameScene.restore용)
+        self.dts = dts               # array('d')
+        self.inputs = inputs         # bytes
+
+    def __len__(self):
+        return len(self.dts)
+
+    @property
+    def duration(self):
+        return sum(self.dts)
+
+
+def encode(physics, snapshot, dts, inputs):
+    body = snapshot + dts.tobytes() + bytes(inputs)
+    return _HEAD.pack(MAGIC, VERSION, zlib.crc32(body), PHYSICS.index(physics),
+                      len(snapshot), len(dts)) + body
+
+
+def load(path):
+    """기록 파일 읽기. 깨졌거나 버전이 다르면 ValueError"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < _HEAD.size:
+        raise ValueError(f"{path}: not a match recording")
+    magic, version, crc, physics, snap_len, frames = _HEAD.unpack_from(data)
+    body = memoryview(data)[_HEAD.size:]
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path}: not a match recording (or another version)")
+    if len(body) != snap_len + 9 * frames or zlib.crc32(body) != crc:
+        raise ValueError(f"{path}: recording is truncated or corrupt")
+    dts = array.array("d")
+    dts.frombytes(body[snap_len:snap_len + 8 * frames])
+    return Recording(PHYSICS[physics], bytes(body[:snap_len]), dts, bytes(body[snap_len + 8 * frames:]))
+
+
+class MatchRecorder:
+    """경기 씬에 붙여 쓰는 기록기. 프레임당 비용은 array/bytearray에 한 칸씩 추가뿐"""
+    def __init__(self, directory, physics):
+        self.directory = directory
+        self.physics = physics
+        self.snapshot = None
+        self.dts = array.array("d")
+        self.inputs = bytearray()
+        self.pending = 0             # 다음 프레임에 같이 기록할 키 누름(서브/리셋)
+        self.saved = None            # 마지막으로 쓴 파일 경로
+
+    def start(self, snapshot):
+        """(다시) 기록 시작 — 이어하기면 복원한 상태부터"""
+        self.snapshot = snapshot
+        del self.dts[:]
+        del self.inputs[:]
+        self.pending = 0
+
+    def event(self, bit):
+        self.pending |= bit
+
+    def frame(self, dt, keys):
+        mask = self.pending
+        self.pending = 0
+        for key, bit in _KEY_ITEMS:
+            if keys[key]:
+                mask |= bit
+        self.dts.append(dt)
+        self.inputs.append(mask)
+
+    def finish(self, tag="match"):
+        """기록을 파일로 (쓰기는 스레드에서 — 프레임을 막지 않음). 기록이 없으면 None"""
+        if self.snapshot is None or not self.dts:
+            return None
+        data = encode(self.physics, self.snapshot, self.dts, self.inputs)
+        path = os.path.join(self.directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{tag}.bjcr")
+        n = 1
+        while os.path.exists(path):
+            n += 1
+            path = os.path.join(self.directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{tag}-{n}.bjcr")
+        threading.Thread(target=write_atomic, args=(path, data, False), name="recording-writer").start()
+        self.snapshot = None
+        self.saved = path
+        return path
+
+
+def replay(game, rec, on_game_over=None):
+    """
+    기록을 새 씬에서 다시 시뮬레이션하는 제너레이터: 프레임마다 (index, scene).
+    game은 bjc_game 모듈 (헤드리스로 import된 것). 경기가 끝나면 멈춤.
+    """
+    from bjc_save import peek_doubles
+    game.SHUTTLE_PHYSICS = rec.physics     # Shuttle이 만들 때 읽으므로 씬 생성 전에
+    over = []
+
+    def _over(score, reason, winner):
+        over.append(True)
+        if on_game_over:
+            on_game_over(score, reason, winner)
+
+    scene = game.GameScene(lambda: None, _over, doubles=peek_doubles(rec.snapshot))
+    scene.restore(rec.snapshot)
+    keys = InputKeys()
+    scene.keys = keys
+    serve = pygame.event.Event(pygame.KEYDOWN, key=game.KEY_SERVE)
+    reset = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_r)
+    inputs = rec.inputs
+    for i, dt in enumerate(rec.dts):
+        mask = inputs[i]
+        if mask & RESET:
+            scene.handle_event(reset)
+        if mask & SERVE:
+            scene.handle_event(serve)
+        keys.mask = mask
+        scene.update(dt)
+        yield i, scene
+        if over:
+            return
@@ -0,0 +1,120 @@
+import array
+
+import pygame
+
+# ------------------------------------------------------------------------------
+# Instant replay
+# StateRing keeps the last N ticks of the match as fixed-width rows of small
+# ints (the spectator layout: quantized shuttle/player positions, speeds,
+# trail count, score, flash timer) in one preallocated array('i') plus an
+# array('d') of tick times — a few tens of KB for several seconds, recorded
+# with one row write per tick and no per-tick objects kept.
+# InstantReplay plays those rows back through a viewer scene (draw only, no
+# simulation), interpolating between ticks so slow motion stays smooth; the
+# speed can be changed while it plays.
+# ------------------------------------------------------------------------------
+
+
+class StateRing:
+    def __init__(self, capacity, width):
+        self.capacity = capacity
+        self.width = width
+        self.data = array.array("i", bytes(4 * capacity * width))
+        self.t = array.array("d", bytes(8 * capacity))
+        self.count = 0              # 지금까지 넣은 총 행 수
+
+    @property
+    def nbytes(self):
+        return self.data.itemsize * len(self.data) + self.t.itemsize * len(self.t)
+
+    def clear(self):
+        self.count = 0
+
+    def push(self, t, values):
+        i = self.count % self.capacity
+        self.t[i] = t
+        data = self.data
+        o = i * self.width
+        for v in values:
+            data[o] = v
+            o += 1
+        self.count += 1
+
+    def first(self):
+        """버퍼에 남아 있는 가장 오래된 행 번호"""
+        return max(0, self.count - self.capacity)
+
+    def time(self, n):
+        return self.t[n % self.capacity]
+
+    def value(self, n, j):
+        return self.data[(n % self.capacity) * self.width + j]
+
+
+class InstantReplay:
+    """
+    ring의 최근 행을 view 씬으로 다시 그림. apply(view, values, text, tick)가 값을 씬에 넣고
+    (관전 화면과 같은 함수), interpolate에 든 열은 두 틱 사이를 보간함(위치 등).
+    """
+    def __init__(self, ring, view, apply, font, speeds=(0.25, 0.5, 1.0, 2.0), speed=1.0,
+                 interpolate=(), hold=0.75):
+        self.ring = ring
+        self.view = view
+        self.apply = apply
+        self.font = font
+        self.speeds = speeds
+        self.speed_i = speeds.index(speed) if speed in speeds else 0
+        self.interpolate = interpolate
+        self.hold_left = hold
+        self.first = ring.first()
+        self.last = ring.count - 1      # 재생 중에도 링은 더 쌓이지 않음 (경기 정지)
+        self.n = self.first             # 현재 행
+        self.t = ring.time(self.first)
+        self.t_end = ring.time(self.last)
+        self.values = [0] * ring.width
+        self.done = self.last <= self.first
+        self._title_key = None
+        self._title = None
+
+    @property
+    def speed(self):
+        return self.speeds[self.speed_i]
+
+    def faster(self):
+        self.speed_i = min(len(self.speeds) - 1, self.speed_i + 1)
+
+    def slower(self):
+        self.speed_i = max(0, self.speed_i - 1)
+
+    def update(self, dt):
+        if self.t < self.t_end:
+            self.t = min(self.t_end, self.t + dt * self.speed)
+            ring = self.ring
+            while self.n < self.last and ring.time(self.n + 1) <= self.t:
+                self.n += 1
+        else:
+            self.hold_left -= dt
+            if self.hold_left <= 0:
+                self.done = True
+
+    def draw(self, surf):
+        ring, n = self.ring, self.n
+        vals = self.values
+        for j in range(ring.width):
+            vals[j] = ring.value(n, j)
+        if n < self.last:
+            t0, t1 = ring.time(n), ring.time(n + 1)
+            u = (self.t - t0) / (t1 - t0) if t1 > t0 else 0.0
+            for j in self.interpolate:
+                vals[j] += (ring.value(n + 1, j) - vals[j]) * u
+        key = self.speed
+        if key != self._title_key:
+            self._title_key = key
+            self._title = self.font.render(f"INSTANT REPLAY  x{key:g}   (←/→ speed, ESC close)", True,
+                                           (255, 255, 255))
+        self.apply(self.view, vals, "", n)
+        self.view.draw(surf)
+        bar = pygame.Rect(0, 0, surf.get_width(), 32)
+        pygame.draw.rect(surf, (200, 40, 40), bar)
+        surf.blit(self._title, (bar.centerx - self._title.get_width() // 2,
+                                bar.centery - self._title.get_height() // 2))
@@ -0,0 +1,167 @@
+import os
+import struct
+import threading
+import time
+import zlib
+
+# ------------------------------------------------------------------------------
+# Suspend / resume of an in-progress match
+# GameScene.snapshot() packs the full match state with the fixed structs below
+# (a few KB, most of it the Mersenne Twister state of `random`, which the AI
+# draws from). The frame thread only packs and hands the blob to a saver
+# thread that keeps just the newest one and writes it atomically:
+# tmp file -> fsync -> os.replace -> fsync(dir). A power cut leaves either the
+# previous save or the new one, never a torn file; the CRC catches the rest.
+#
+# File := magic:4s version:u16 crc32:u32 size:u32 payload[size]
+# ------------------------------------------------------------------------------
+
+MAGIC = b"BJCS"
+VERSION = 1
+_FILE = struct.Struct("<4sHII")
+
+# doubles, diff index, server, rally_active, last_hitter, last_scored (0=top 1=bottom 255=None),
+# score top/bottom, time_elapsed, ai_serve_timer, score_flash_t, round_time_left (NaN=None),
+# rally_shots, rally_start_t, player count
+MATCH   = struct.Struct("<6B2H4dHdB")
+# pos x/y, vel x/y, z, flying, flight t, launch speed/angle/origin x,y/direction x,y
+SHUTTLE = struct.Struct("<5dBd6d")
+# pos x/y, last_hit_time, court (0=right 1=left), is_human, swing_pressed
+PLAYER  = struct.Struct("<3d3B")
+# random.getstate(): version, 625 words (624 + index), gauss_next (NaN=None)
+RNG     = struct.Struct("<B625Id")
+
+SIDE_CODE = {"top": 0, "bottom": 1, None: 255}
+SIDE_NAME = {0: "top", 1: "bottom", 255: None}
+
+
+def write_atomic(path, data, fsync=True):
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+    if fsync and hasattr(os, "O_DIRECTORY"):
+        fd = os.open(d or ".", os.O_RDONLY | os.O_DIRECTORY)   # 이름 바뀐 것까지 디스크에
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def wrap(payload):
+    return _FILE.pack(MAGIC, VERSION, zlib.crc32(payload), len(payload)) + payload
+
+
+def read_payload(path):
+    """저장 파일의 payload, 없거나 깨졌거나 버전이 다르면 None"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < _FILE.size:
+        return None
+    magic, version, crc, size = _FILE.unpack_from(data)
+    payload = data[_FILE.size:]
+    if magic != MAGIC or version != VERSION or size != len(payload) or zlib.crc32(payload) != crc:
+        return None
+    return payload
+
+
+def peek_doubles(payload):
+    return bool(payload[0])
+
+
+_DISCARD = object()
+
+
+class MatchSaver:
+    def __init__(self, path, fsync=True):
+        self.path = path
+        self.fsync = fsync
+        self.latest = None           # 마지막으로 맡긴 payload (디스크 쓰기 전이어도 이어하기에 씀)
+        self.discarded = False       # 경기가 끝남 → 파일이 아직 지워지기 전이어도 이어하기 없음
+        self.saves = 0
+        self.write_max = 0.0         # 가장 오래 걸린 디스크 쓰기(초)
+        self._pending = None
+        self._busy = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="match-saver", daemon=True)
+        self._thread.start()
+
+    # --- game side (never blocks on the disk) ------------------------------------
+    def save(self, payload):
+        self.latest = payload
+        self.discarded = False
+        with self._cond:
+            self._pending = payload     # 밀린 저장은 최신 것으로 덮어씀
+            self._cond.notify()
+
+    def discard(self):
+        """경기가 정상 종료 → 이어하기 파일 삭제"""
+        self.latest = None
+        self.discarded = True
+        with self._cond:
+            self._pending = _DISCARD
+            self._cond.notify()
+
+    def load(self):
+        if self.discarded:
+            return None
+        if self.latest is not None:
+            return self.latest
+        return read_payload(self.path)
+
+    def exists(self):
+        return self.load() is not None
+
+    def flush(self, timeout=2.0):
+        end = time.monotonic() + timeout
+        with self._cond:
+            while self._pending is not None or self._busy:
+                left = end - time.monotonic()
+                if left <= 0:
+                    return False
+                self._cond.wait(left)
+        return True
+
+    def close(self, timeout=2.0):
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    # --- saver thread -------------------------------------------------------------
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                item, self._pending = self._pending, None
+                self._busy = True
+            t0 = time.perf_counter()
+            try:
+                if item is _DISCARD:
+                    try:
+                        os.remove(self.path)
+                    except FileNotFoundError:
+                        pass
+                else:
+                    write_atomic(self.path, wrap(item), self.fsync)
+                    self.saves += 1
+            except OSError:
+                pass            # 저장 실패해도 경기는 계속 (다음 저장에서 다시 시도)
+            self.write_max = max(self.write_max, time.perf_counter() - t0)
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
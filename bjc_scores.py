@@ -0,0 +1,121 @@
+import datetime
+import queue
+import sqlite3
+import threading
+import time
+
+# ------------------------------------------------------------------------------
+# Match history / leaderboard (SQLite, WAL mode)
+# All database access happens on one writer thread. The game only enqueues
+# finished matches and reads an immutable snapshot of the last query results,
+# so neither game over nor scene drawing ever waits on the disk.
+# ------------------------------------------------------------------------------
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    id           INTEGER PRIMARY KEY,
+    played_at    REAL    NOT NULL,
+    day          TEXT    NOT NULL,
+    difficulty   TEXT    NOT NULL,
+    winner       TEXT    NOT NULL,
+    reason       TEXT    NOT NULL,
+    score_top    INTEGER NOT NULL,
+    score_bottom INTEGER NOT NULL,
+    margin       INTEGER NOT NULL,   -- bottom(player) - top(AI)
+    duration     REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_matches_margin      ON matches(margin DESC, played_at);
+CREATE INDEX IF NOT EXISTS idx_matches_diff_margin ON matches(difficulty, margin DESC, played_at);
+CREATE INDEX IF NOT EXISTS idx_matches_day_margin  ON matches(day, margin DESC, played_at);
+"""
+
+_COLS = "played_at, difficulty, winner, score_top, score_bottom, margin"
+
+
+class Snapshot:
+    """쿼리 결과 캐시 (읽기 전용). version이 바뀌면 UI가 다시 렌더"""
+    def __init__(self, version=0, top=(), by_difficulty=None, today=(), total=0):
+        self.version = version
+        self.top = top                          # [(played_at, diff, winner, top, bottom, margin), ...]
+        self.by_difficulty = by_difficulty or {}
+        self.today = today
+        self.total = total
+
+
+class ScoreStore:
+    def __init__(self, path="bjc_scores.db", top_n=5, difficulties=("easy", "normal", "hard")):
+        self.path = path
+        self.top_n = top_n
+        self.difficulties = tuple(difficulties)
+        self.snapshot = Snapshot()
+        self._q = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="score-writer", daemon=True)
+        self._thread.start()
+
+    # --- game side (non-blocking) ------------------------------------------------
+    def record_match(self, score, winner, reason, difficulty, duration):
+        self._q.put((time.time(), difficulty, winner, reason,
+                     int(score["top"]), int(score["bottom"]), float(duration)))
+
+    def close(self, timeout=2.0):
+        self._q.put(None)
+        self._thread.join(timeout)
+
+    # --- writer thread -------------------------------------------------------------
+    def _run(self):
+        try:
+            db = sqlite3.connect(self.path)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(SCHEMA)
+            self._refresh(db)
+        except sqlite3.Error:
+            return   # 기록 없이도 게임은 계속
+        while True:
+            item = self._q.get()
+            if item is None:
+                break
+            batch = [item]
+            # 밀린 기록은 한 트랜잭션으로 묶어서 기록
+            while True:
+                try:
+                    nxt = self._q.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    self._q.put(None)
+                    break
+                batch.append(nxt)
+            try:
+                with db:
+                    db.executemany(
+                        "INSERT INTO matches (played_at, day, difficulty, winner, reason,"
+                        " score_top, score_bottom, margin, duration) VALUES (?,?,?,?,?,?,?,?,?)",
+                        [(t, _day(t), d, w, r, st, sb, sb - st, dur) for t, d, w, r, st, sb, dur in batch])
+                self._refresh(db)
+            except sqlite3.Error:
+                pass
+        db.close()
+
+    def _refresh(self, db):
+        n = self.top_n
+        top = db.execute(f"SELECT {_COLS} FROM matches ORDER BY margin DESC, played_at LIMIT ?", (n,)).fetchall()
+        by_diff = {
+            d: db.execute(f"SELECT {_COLS} FROM matches WHERE difficulty = ?"
+                          " ORDER BY margin DESC, played_at LIMIT ?", (d, n)).fetchall()
+            for d in self.difficulties
+        }
+        today = db.execute(f"SELECT {_COLS} FROM matches WHERE day = ?"
+                           " ORDER BY margin DESC, played_at LIMIT ?", (_day(time.time()), n)).fetchall()
+        total = db.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+        # 참조 교체 한 번으로 게시 (읽는 쪽은 잠금 불필요)
+        self.snapshot = Snapshot(self.snapshot.version + 1, top, by_diff, today, total)
+
+
+def _day(t):
+    return datetime.date.fromtimestamp(t).isoformat()
+
+
+def format_row(i, row):
+    played_at, diff, winner, st, sb, margin = row
+    when = time.strftime("%m-%d %H:%M", time.localtime(played_at))
+    return f"{i}. {sb} : {st}  ({margin:+d})  {diff.upper():<6} {when}"
@@ -0,0 +1,308 @@
+import asyncio
+import multiprocessing
+import os
+import random
+import socket
+import sys
+import time
+
+import pygame
+
+from bjc_aio import FramePacer
+from bjc_input import LEFT, RIGHT, SWING, SERVE, KEY_BITS, InputKeys
+from bjc_spectate import StateEncoder, StateDecoder, connect
+
+# ------------------------------------------------------------------------------
+# Authoritative multi-match server (no window)
+# Every TCP connection gets its own match (client = bottom player, AI = top)
+# running the unchanged GameScene rules. Clients only send input bitmasks
+# (one byte, whenever the keys change); the server keeps the latest mask per
+# match and, on a fixed 60 Hz tick, steps every match in one pass and then
+# writes each match's state as a quantized delta (bjc_spectate encoder), so a
+# client renders exactly what a spectator would. Finished matches restart.
+# One process = one core (GIL); --workers N starts N processes sharing the
+# port through SO_REUSEPORT so the kernel spreads connections across cores.
+#
+# Server:  python bjc_server.py [port] [--workers N]
+# Client:  python bjc_server.py --play [host] [port]
+# Bench:   python bjc_server.py --bench [seconds]   (matches per core at 60 Hz)
+# ------------------------------------------------------------------------------
+
+DEFAULT_HOST, DEFAULT_PORT = "127.0.0.1", 50700
+TICK_RATE = 60
+
+
+def _headless():
+    # 창 없는 서버: pygame은 더미 드라이버로 (bjc_game import 전에)
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+class Match:
+    def __init__(self, server, transport):
+        self.server = server
+        self.transport = transport
+        self.keys = InputKeys()
+        self.serve_held = False
+        self.synced = False          # 클라이언트가 키프레임을 받았는지 (밀리면 다시 False)
+        self.finished = 0
+        self.scene = None
+        self.encoder = None
+        self.restart()
+
+    def restart(self):
+        game = self.server.game
+        self.scene = game.GameScene(lambda: None, self._game_over)
+        self.scene.keys = self.keys
+        self.scene.particles.available = False    # 효과는 화면용 — 서버에선 계산하지 않음
+        self.encoder = StateEncoder(self.server.keyframe_every)
+        self.synced = False
+        self.over = False
+
+    def _game_over(self, score, reason, winner):
+        self.over = True
+        self.finished += 1
+
+    def step(self, dt):
+        scene = self.scene
+        serve = self.keys.mask & SERVE
+        if serve and not self.serve_held:        # 누르는 순간만 (키 이벤트처럼)
+            scene.handle_event(self.server.serve_event)
+        self.serve_held = serve
+        scene.update(dt)
+        if self.over:
+            self.restart()
+
+    def send(self):
+        msg = self.encoder.encode(*self.server.game.spectator_state(self.scene))
+        t = self.transport
+        if t.is_closing():
+            return
+        if t.get_write_buffer_size() > self.server.max_buffer:
+            self.synced = False          # 못 읽는 클라이언트 때문에 서버가 막히지 않게 건너뜀
+            return
+        if self.synced:
+            t.write(msg)
+        else:
+            t.write(self.encoder.keyframe())
+            self.synced = True
+
+
+class _Connection(asyncio.Protocol):
+    def __init__(self, server):
+        self.server = server
+        self.match = None
+
+    def connection_made(self, transport):
+        sock = transport.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.match = self.server.add(transport)
+
+    def data_received(self, data):
+        self.match.keys.mask = data[-1]       # 마지막 바이트가 최신 입력
+
+    def connection_lost(self, exc):
+        self.server.remove(self.match)
+
+
+class MatchServer:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, tick_rate=TICK_RATE,
+                 keyframe_every=TICK_RATE, max_buffer=32 * 1024):
+        _headless()
+        import bjc_game as game
+        game.TELEMETRY = None
+        self.game = game
+        self.host, self.port = host, port
+        self.dt = 1.0 / tick_rate
+        self.tick_rate = tick_rate
+        self.keyframe_every = keyframe_every
+        self.max_buffer = max_buffer
+        self.serve_event = pygame.event.Event(pygame.KEYDOWN, key=game.KEY_SERVE)
+        self.matches = []
+        self.ticks = 0
+        self.work = []               # 최근 틱 처리 시간(초) — 보고 때 비움
+
+    def add(self, transport):
+        m = Match(self, transport)
+        self.matches.append(m)
+        return m
+
+    def remove(self, match):
+        if match in self.matches:
+            self.matches.remove(match)
+
+    def step_all(self):
+        """한 틱: 모든 경기를 먼저 진행하고, 그다음 상태를 한꺼번에 전송"""
+        t0 = time.perf_counter()
+        dt = self.dt
+        matches = self.matches
+        for m in matches:
+            m.step(dt)
+        for m in matches:
+            m.send()
+        self.ticks += 1
+        self.work.append(time.perf_counter() - t0)
+
+    def report(self):
+        w = sorted(self.work)
+        self.work.clear()
+        if not w:
+            return ""
+        budget = self.dt
+        over = sum(1 for x in w if x > budget)
+        return (f"[server {os.getpid()}] {len(self.matches)} matches, tick work avg "
+                f"{sum(w) / len(w) * 1000:.2f} ms p99 {w[int(len(w) * 0.99)] * 1000:.2f} ms, "
+                f"over budget {over}/{len(w)}")
+
+    async def run(self, reuse_port=False, report_every=5.0):
+        loop = asyncio.get_running_loop()
+        server = await loop.create_server(lambda: _Connection(self), self.host, self.port,
+                                          reuse_port=reuse_port)
+        pacer = FramePacer()
+        next_report = time.monotonic() + report_every
+        try:
+            while True:
+                await pacer.tick(self.tick_rate)
+                self.step_all()
+                if time.monotonic() >= next_report:
+                    next_report += report_every
+                    print(self.report(), flush=True)
+        finally:
+            server.close()
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, reuse_port=False):
+    try:
+        asyncio.run(MatchServer(host, port).run(reuse_port))
+    except KeyboardInterrupt:
+        pass
+
+
+def serve_workers(workers, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    # 코어마다 서버 프로세스 하나, 같은 포트(SO_REUSEPORT) — 연결은 커널이 나눠 줌
+    reuse = hasattr(socket, "SO_REUSEPORT")
+    if not reuse and workers > 1:
+        print("SO_REUSEPORT not available: running one worker", file=sys.stderr)
+        workers = 1
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=serve, args=(host, port, reuse), daemon=True) for _ in range(workers - 1)]
+    for p in procs:
+        p.start()
+    serve(host, port, reuse)
+
+
+# --- client -----------------------------------------------------------------------
+
+def run_client(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    import bjc_game as game
+
+    sock = connect(host, port)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setblocking(False)
+    decoder = StateDecoder()
+    scene = None
+    sent = None
+    pygame.display.set_caption(f"BJC - playing on {host}:{port}")
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit(); return
+        keys = pygame.key.get_pressed()
+        mask = sum(bit for key, bit in KEY_BITS.items() if keys[key])
+        if keys[game.KEY_SERVE]:
+            mask |= SERVE
+        if mask != sent:
+            sock.send(bytes((mask,)))     # 바뀔 때만 1바이트
+            sent = mask
+        try:
+            while True:
+                data = sock.recv(65536)
+                if not data:
+                    pygame.quit(); return
+                decoder.feed(data)
+        except BlockingIOError:
+            pass
+        if decoder.values is not None:
+            if scene is None or not game.spectator_fits(scene, decoder.values):
+                scene = game.spectator_scene(decoder.values)
+            game.apply_spectator_state(scene, decoder.values, decoder.text, decoder.tick)
+            scene.draw(game.screen)
+            pygame.display.flip()
+        game.clock.tick(game.FPS)
+
+
+# --- benchmark --------------------------------------------------------------------
+
+class _Sink:
+    """벤치용 가짜 transport: 보낸 바이트 수만 셈"""
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, data):
+        self.bytes += len(data)
+
+    def is_closing(self):
+        return False
+
+    def get_write_buffer_size(self):
+        return 0
+
+
+def bench(seconds=3.0, headroom=0.8, seed=1):
+    """
+    소켓 없이 같은 step_all()로 경기 수를 늘려 가며 틱 처리 시간을 잼.
+    입력은 봇(무작위로 좌우 이동/스윙/서브)이 매 틱 바꿔 넣음. p99가 예산(1/60초)의
+    headroom 이하인 최대 경기 수 = 코어당 경기 수.
+    """
+    random.seed(seed)
+    server = MatchServer()
+    budget = server.dt * headroom
+    rng = random.Random(seed)
+    sinks = []
+    best = 0
+    n = 8
+    while True:
+        while len(server.matches) < n:
+            sink = _Sink()
+            sinks.append(sink)
+            server.add(sink)
+        for _ in range(TICK_RATE):                 # 1초 워밍업
+            server.step_all()
+        server.work.clear()
+        ticks = int(seconds * TICK_RATE)
+        for _ in range(ticks):
+            for m in server.matches:
+                if rng.random() < 0.1:
+                    m.keys.mask = rng.choice((LEFT, RIGHT, LEFT | SWING, RIGHT | SWING, SERVE, 0))
+            server.step_all()
+        w = sorted(server.work)
+        avg, p99 = sum(w) / len(w), w[int(len(w) * 0.99)]
+        sent = sum(s.bytes for s in sinks)
+        for s in sinks:
+            s.bytes = 0
+        ok = p99 <= budget
+        print(f"{n:5d} matches: tick avg {avg * 1000:6.2f} ms  p99 {p99 * 1000:6.2f} ms  "
+              f"({avg / n * 1e6:5.1f} us/match)  out {sent / (ticks / TICK_RATE) / 1024:7.1f} KiB/s  "
+              f"{'ok' if ok else 'over budget'}", flush=True)
+        if not ok:
+            break
+        best = n
+        n *= 2
+    print(f"~{best}+ matches per core at {TICK_RATE} Hz (p99 tick <= {headroom:.0%} of {server.dt * 1000:.1f} ms)")
+    return best
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args[:1] == ["--bench"]:
+        bench(float(args[1]) if len(args) > 1 else 3.0)
+    elif args[:1] == ["--play"]:
+        run_client(args[1] if len(args) > 1 else DEFAULT_HOST, int(args[2]) if len(args) > 2 else DEFAULT_PORT)
+    else:
+        workers = 1
+        if "--workers" in args:
+            i = args.index("--workers")
+            workers = int(args[i + 1])
+            del args[i:i + 2]
+        serve_workers(workers, DEFAULT_HOST, int(args[0]) if args else DEFAULT_PORT)
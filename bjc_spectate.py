@@ -0,0 +1,348 @@
+import asyncio
+import collections
+import os
+import socket
+import struct
+import subprocess
+import sys
+import time
+
+# ------------------------------------------------------------------------------
+# Spectator broadcast
+# The host match publishes its drawable state once per tick as a list of small
+# ints (positions quantized to 1/QUANT px, speeds to 1 px/s, flash timer in ms)
+# plus the `info` text. Each tick is encoded ONCE into a delta against the
+# previous tick (changed-field bitmask + int16 per changed field); a keyframe
+# (all fields as int32 + text) goes out every `keyframe_every` ticks, whenever
+# the text changes, and when a delta would overflow int16.
+# The frame only encodes and queues; an asyncio sender fans the same bytes out
+# to every viewer between frames. A viewer whose socket buffer backs up is
+# skipped and resynced with a keyframe once it drains, so slow viewers never
+# stall the host.
+#
+# Wire format (little endian):
+#   msg   := size:u16 kind:u8 tick:u32 payload[size]
+#   KEY   := n:u8 value:i32[n] text:utf-8
+#   DELTA := mask:u32 delta:i16[popcount(mask)]
+#
+# Viewer:  python bjc_spectate.py [host] [port]          (renders with GameScene.draw)
+# Bench:   python bjc_spectate.py --bench 100 [seconds]  (host frame time with N viewers)
+# ------------------------------------------------------------------------------
+
+KEY, DELTA = 1, 2
+QUANT = 4                     # 위치 양자화: 1/4 px
+MAX_FIELDS = 32               # 델타 마스크 비트 수
+_MSG = struct.Struct("<HBI")
+_MASK = struct.Struct("<I")
+_INT16 = struct.Struct("<h")
+
+DEFAULT_HOST, DEFAULT_PORT = "127.0.0.1", 50607
+
+
+class StateEncoder:
+    def __init__(self, keyframe_every=60):
+        self.keyframe_every = keyframe_every
+        self.tick = 0
+        self.prev = None          # 직전 틱 값 (델타 기준)
+        self.text = None
+        self._since_key = 0
+        self._key = None          # 현재 틱 키프레임 (재동기용, 필요할 때 만듦)
+
+    def keyframe(self):
+        """현재 상태 전체 — 새로 들어온/밀렸던 시청자 재동기용"""
+        if self._key is None:
+            vals, text = self.prev, self.text.encode("utf-8")
+            payload = struct.pack(f"<B{len(vals)}i", len(vals), *vals) + text
+            self._key = _MSG.pack(len(payload), KEY, self.tick) + payload
+        return self._key
+
+    def encode(self, values, text):
+        """이번 틱 상태를 한 번 인코딩해 보낼 메시지(bytes)를 반환"""
+        self.tick += 1
+        prev = self.prev
+        self._key = None
+        self._since_key += 1
+        if (prev is None or len(prev) != len(values) or len(values) > MAX_FIELDS or text != self.text
+                or self._since_key >= self.keyframe_every):
+            return self._keyframe_from(values, text)
+        mask = 0
+        parts = []
+        for i, v in enumerate(values):
+            d = v - prev[i]
+            if d:
+                if not -32768 <= d <= 32767:
+                    return self._keyframe_from(values, text)   # 순간 이동 등 → 키프레임
+                mask |= 1 << i
+                parts.append(_INT16.pack(d))
+        prev[:] = values
+        payload = _MASK.pack(mask) + b"".join(parts)
+        return _MSG.pack(len(payload), DELTA, self.tick) + payload
+
+    def _keyframe_from(self, values, text):
+        self.prev = list(values)
+        self.text = text
+        self._since_key = 0
+        return self.keyframe()
+
+
+class StateDecoder:
+    """바이트 스트림을 받아 값 목록/텍스트를 갱신. 키프레임을 받기 전 델타는 버림"""
+    def __init__(self):
+        self.buf = bytearray()
+        self.values = None
+        self.text = ""
+        self.tick = 0
+        self.keyframes = 0
+        self.deltas = 0
+
+    def feed(self, data):
+        """받은 데이터 처리 후 새로 적용된 틱 수 반환"""
+        buf = self.buf
+        buf += data
+        applied = 0
+        off = 0
+        while len(buf) - off >= _MSG.size:
+            size, kind, tick = _MSG.unpack_from(buf, off)
+            end = off + _MSG.size + size
+            if len(buf) < end:
+                break
+            p = off + _MSG.size
+            if kind == KEY:
+                n = buf[p]
+                self.values = list(struct.unpack_from(f"<{n}i", buf, p + 1))
+                self.text = bytes(buf[p + 1 + 4 * n:end]).decode("utf-8")
+                self.keyframes += 1
+                self.tick = tick
+                applied += 1
+            elif kind == DELTA and self.values is not None:
+                (mask,) = _MASK.unpack_from(buf, p)
+                q = p + _MASK.size
+                vals = self.values
+                i = 0
+                while mask:
+                    if mask & 1:
+                        vals[i] += _INT16.unpack_from(buf, q)[0]
+                        q += 2
+                    mask >>= 1
+                    i += 1
+                self.deltas += 1
+                self.tick = tick
+                applied += 1
+            off = end
+        del buf[:off]
+        return applied
+
+
+class _Viewer:
+    __slots__ = ("writer", "synced")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.synced = False       # 키프레임을 받아야 델타를 이해할 수 있음
+
+
+class SpectatorServer:
+    """
+    state_fn(scene) -> (values, text) 또는 None(경기 씬이 아님).
+    publish()는 게임 프레임에서, serve()는 asyncio 서비스로.
+    """
+    def __init__(self, state_fn, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                 keyframe_every=60, max_buffer=64 * 1024):
+        self.state_fn = state_fn
+        self.host, self.port = host, port
+        self.max_buffer = max_buffer
+        self.encoder = StateEncoder(keyframe_every)
+        self.viewers = []
+        self.pending = collections.deque()
+        self.resyncs = 0
+        self._ready = None
+
+    def publish(self, scene):
+        """프레임 끝에서 호출 — 인코딩 한 번 + 큐에 넣기만 (전송은 프레임 밖)"""
+        if not self.viewers:
+            return
+        state = self.state_fn(scene)
+        if state is None:
+            return
+        self.pending.append(self.encoder.encode(*state))
+        self._ready.set()
+
+    async def serve(self):
+        self._ready = asyncio.Event()
+        server = await asyncio.start_server(self._accept, self.host, self.port)
+        try:
+            while True:
+                await self._ready.wait()
+                self._ready.clear()
+                self._flush()
+        finally:
+            server.close()
+            for v in self.viewers:
+                v.writer.close()
+
+    async def _accept(self, reader, writer):
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        v = _Viewer(writer)
+        self.viewers.append(v)
+        try:
+            while await reader.read(256):   # 시청자는 보내는 게 없음 — 연결 종료만 감지
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self.viewers.remove(v)
+            writer.close()
+
+    def _flush(self):
+        if not self.pending:
+            return
+        blob = b"".join(self.pending) if len(self.pending) > 1 else self.pending[0]
+        self.pending.clear()
+        key = None
+        for v in self.viewers:
+            transport = v.writer.transport
+            if transport.is_closing():
+                continue
+            if transport.get_write_buffer_size() > self.max_buffer:
+                v.synced = False        # 밀린 시청자: 델타는 건너뛰고 나중에 키프레임으로
+                continue
+            if v.synced:
+                transport.write(blob)
+            else:
+                if key is None:
+                    key = self.encoder.keyframe()
+                transport.write(key)
+                v.synced = True
+                self.resyncs += 1
+
+
+# --- viewer -----------------------------------------------------------------------
+
+def connect(host, port, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return socket.create_connection((host, port), timeout=1.0)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def run_viewer(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    import pygame
+    import bjc_game as game
+
+    sock = connect(host, port)
+    sock.setblocking(False)
+    decoder = StateDecoder()
+    scene = None
+    pygame.display.set_caption(f"BJC - spectating {host}:{port}")
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit(); return
+        try:
+            while True:
+                data = sock.recv(65536)
+                if not data:
+                    pygame.quit(); return      # 호스트 종료
+                decoder.feed(data)
+        except BlockingIOError:
+            pass
+        if decoder.values is not None:
+            if scene is None or not game.spectator_fits(scene, decoder.values):
+                scene = game.spectator_scene(decoder.values)
+            game.apply_spectator_state(scene, decoder.values, decoder.text, decoder.tick)
+            scene.draw(game.screen)
+            pygame.display.flip()
+        game.clock.tick(game.FPS)
+
+
+def run_counter(host, port):
+    """벤치용 가벼운 시청자: 호스트가 끊을 때까지 디코드만 하고 받은 틱 수를 출력"""
+    sock = connect(host, port, timeout=30.0)
+    sock.settimeout(None)
+    decoder = StateDecoder()
+    while True:
+        try:
+            data = sock.recv(65536)
+        except ConnectionError:
+            break
+        if not data:
+            break
+        decoder.feed(data)
+    print(decoder.keyframes, decoder.deltas, flush=True)
+
+
+# --- benchmark --------------------------------------------------------------------
+
+async def _bench_host(viewers, seconds, port):
+    import bjc_game as game
+    from bjc_aio import FramePacer, start_service, stop_services
+
+    game.TELEMETRY = None
+    scene = game.GameScene(lambda: None, lambda *a: None)
+    scene.player_bottom.is_human = False
+    server = SpectatorServer(game.spectator_state, port=port)
+    tasks = [start_service(server.serve(), "spectate")]
+    await asyncio.sleep(0.2)
+    procs = [subprocess.Popen([sys.executable, __file__, "--count", DEFAULT_HOST, str(port)],
+                              stdout=subprocess.PIPE, text=True) for _ in range(viewers)]
+    deadline = time.monotonic() + 30     # 시청자 프로세스가 다 붙은 뒤부터 측정
+    while len(server.viewers) < viewers and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+
+    pacer = FramePacer()
+    work = []
+    dt = 1.0 / game.FPS
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        await pacer.tick(game.FPS)
+        t0 = time.perf_counter()
+        if not scene.rally_active:
+            scene.score_flash_t = 0.0
+            scene.start_rally()
+        scene.update(dt)
+        scene.draw(game.screen)
+        server.publish(scene)
+        work.append(time.perf_counter() - t0)
+    connected = len(server.viewers)
+    await stop_services(tasks)       # 연결을 닫으면 시청자 프로세스가 끝남
+    ticks = []
+    for p in procs:
+        out, _ = p.communicate()
+        k, d = (int(x) for x in out.split()) if out.strip() else (0, 0)
+        ticks.append(k + d)
+    work.sort()
+    return {
+        "frames": len(work),
+        "p50_ms": work[len(work) // 2] * 1000,
+        "p99_ms": work[int(len(work) * 0.99)] * 1000,
+        "late_max_ms": pacer.late_max * 1000,
+        "viewers": connected,
+        "min_ticks": min(ticks) if ticks else 0,
+        "resyncs": server.resyncs,
+    }
+
+
+def bench(viewers=100, seconds=5.0, port=DEFAULT_PORT + 1):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    for n in (0, viewers):
+        r = asyncio.run(_bench_host(n, seconds, port))
+        print(f"{n:4d} viewers: {r['frames']} frames, work p50 {r['p50_ms']:.2f} ms, "
+              f"p99 {r['p99_ms']:.2f} ms, wake late max {r['late_max_ms']:.2f} ms | "
+              f"connected {r['viewers']}, min ticks/viewer {r['min_ticks']}, resyncs {r['resyncs']}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args[:1] == ["--bench"]:
+        bench(int(args[1]) if len(args) > 1 else 100, float(args[2]) if len(args) > 2 else 5.0)
+    elif args[:1] == ["--count"]:
+        run_counter(args[1], int(args[2]))
+    else:
+        run_viewer(args[0] if args else DEFAULT_HOST, int(args[1]) if len(args) > 1 else DEFAULT_PORT)
@@ -0,0 +1,168 @@
+import array
+import os
+import queue
+import struct
+import threading
+import time
+
+# ------------------------------------------------------------------------------
+# Match telemetry
+# Records are written into preallocated typed columns (array.array). A full
+# batch is swapped for a spare one and handed to a writer thread, so the frame
+# loop never touches the disk. If the writer falls behind and no spare batch is
+# left, records are dropped (and counted) instead of blocking.
+#
+# On-disk format (one file per table, append-only chunks):
+#   chunk  := b"BJCT" rows:u32 ncols:u16 column*
+#   column := name_len:u8 name typecode:u8 data[rows * itemsize]
+# ------------------------------------------------------------------------------
+MAGIC = b"BJCT"
+_CHUNK_HDR = struct.Struct("<4sIH")
+
+SIDES   = ("top", "bottom")
+SHOTS   = ("receive", "smash")
+REASONS = ("Side out", "Baseline out", "Side line", "Landed in")   # line-call reasons (bjc_journal uses the same list)
+
+SHOT_COLUMNS = (
+    ("t",      "d"),   # scene time (s)
+    ("rally",  "I"),   # rally number in the session
+    ("hitter", "B"),   # index into SIDES
+    ("shot",   "B"),   # index into SHOTS
+    ("speed",  "f"),   # shuttle speed when hit (px/s)
+)
+RALLY_COLUMNS = (
+    ("t",        "d"),
+    ("rally",    "I"),
+    ("winner",   "B"),  # index into SIDES
+    ("reason",   "B"),  # index into REASONS (255 = other)
+    ("shots",    "H"),  # rally length in shots
+    ("duration", "f"),  # rally time (s)
+    ("score_top",    "B"),
+    ("score_bottom", "B"),
+)
+
+
+class ColumnBatch:
+    def __init__(self, columns, capacity):
+        self.names = [n for n, _ in columns]
+        self.cols = [array.array(tc, bytes(array.array(tc).itemsize * capacity)) for _, tc in columns]
+        self.capacity = capacity
+        self.rows = 0
+
+    def append(self, values):
+        i = self.rows
+        for col, v in zip(self.cols, values):
+            col[i] = v
+        self.rows = i + 1
+        return self.rows == self.capacity
+
+    def to_bytes(self):
+        n = self.rows
+        parts = [_CHUNK_HDR.pack(MAGIC, n, len(self.cols))]
+        for name, col in zip(self.names, self.cols):
+            nb = name.encode()
+            parts.append(bytes((len(nb),)) + nb + col.typecode.encode())
+            parts.append(memoryview(col)[:n].tobytes())
+        return b"".join(parts)
+
+
+class _Table:
+    def __init__(self, path, columns, capacity, spares):
+        self.path = path
+        self.columns = columns
+        self.capacity = capacity
+        self.active = ColumnBatch(columns, capacity)
+        self.free = [ColumnBatch(columns, capacity) for _ in range(spares)]
+        self.lock = threading.Lock()   # guards self.free only (writer returns batches)
+
+
+class TelemetryRecorder:
+    def __init__(self, out_dir="telemetry", capacity=1024, spares=3, session=None):
+        os.makedirs(out_dir, exist_ok=True)
+        self.session = session or f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        base = os.path.join(out_dir, self.session)
+        self.shots   = _Table(base + ".shots.bjct",   SHOT_COLUMNS,  capacity, spares)
+        self.rallies = _Table(base + ".rallies.bjct", RALLY_COLUMNS, capacity // 4 or 1, spares)
+        self.rally_no = 0
+        self.dropped = 0
+        self._q = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._writer, name="telemetry-writer", daemon=True)
+        self._thread.start()
+
+    # --- frame-loop side (never blocks) --------------------------------------
+    def record_shot(self, t, hitter, is_smash, speed):
+        self._append(self.shots, (t, self.rally_no, SIDES.index(hitter), 1 if is_smash else 0, speed))
+
+    def record_rally(self, t, winner, reason, shots, duration, score):
+        reason_i = REASONS.index(reason) if reason in REASONS else 255
+        self._append(self.rallies, (t, self.rally_no, SIDES.index(winner), reason_i,
+                                    min(shots, 0xFFFF), duration, score["top"], score["bottom"]))
+        self.rally_no += 1
+
+    def flush(self):
+        """채워진 만큼 쓰기 스레드로 넘김 (게임 종료 등 구간 경계에서 호출)"""
+        for table in (self.shots, self.rallies):
+            if table.active is not None and table.active.rows:
+                self._hand_off(table)
+
+    def close(self, timeout=2.0):
+        self.flush()
+        self._q.put(None)
+        self._thread.join(timeout)
+
+    def _append(self, table, values):
+        if table.active is None and not self._take_spare(table):
+            self.dropped += 1
+            return
+        if table.active.append(values):
+            self._hand_off(table)
+
+    def _hand_off(self, table):
+        self._q.put((table, table.active))
+        table.active = None
+        self._take_spare(table)
+
+    def _take_spare(self, table):
+        with table.lock:
+            if not table.free:
+                return False
+            table.active = table.free.pop()
+        return True
+
+    # --- writer thread ---------------------------------------------------------
+    def _writer(self):
+        while True:
+            item = self._q.get()
+            if item is None:
+                return
+            table, batch = item
+            try:
+                with open(table.path, "ab") as f:
+                    f.write(batch.to_bytes())
+            except OSError:
+                pass   # analytics only — never take the game down
+            batch.rows = 0
+            with table.lock:
+                table.free.append(batch)
+
+
+def read_table(path):
+    """파일의 모든 청크를 이어붙여 {컬럼명: array} 로 반환"""
+    out = {}
+    with open(path, "rb") as f:
+        data = f.read()
+    off = 0
+    while off < len(data):
+        magic, rows, ncols = _CHUNK_HDR.unpack_from(data, off)
+        if magic != MAGIC:
+            raise ValueError(f"bad chunk at offset {off} in {path}")
+        off += _CHUNK_HDR.size
+        for _ in range(ncols):
+            nlen = data[off]; off += 1
+            name = data[off:off + nlen].decode(); off += nlen
+            tc = chr(data[off]); off += 1
+            col = array.array(tc)
+            size = rows * col.itemsize
+            col.frombytes(data[off:off + size]); off += size
+            out.setdefault(name, array.array(tc)).extend(col)
+    return out
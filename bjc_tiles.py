@@ -0,0 +1,253 @@
+import os
+import sys
+import time
+
+import pygame
+
+from bjc_input import InputKeys
+
+# ------------------------------------------------------------------------------
+# Tiled multi-match viewer (tournament monitoring)
+# Runs cols x rows AI-vs-AI matches with the unchanged GameScene rules and
+# shows them all in one window. The matches are stepped in one batch pass;
+# each one is then drawn straight into its reduced-resolution tile from
+# assets built once per tile scale — the court background smoothscaled from
+# GameScene's shared background and the sprite atlas sheet scaled by
+# SpriteAtlas.scaled() — instead of GameScene.draw at 800x900 + a rescale.
+# A tile is redrawn only when what it shows changed at tile resolution
+# (positions rounded to tile pixels, trail, score), and only the redrawn tile
+# rects go to display.update(): matches waiting to serve cost nothing.
+#
+# Viewer: python bjc_tiles.py [cols] [rows]           (default 4 x 4, ESC quits)
+# Bench:  python bjc_tiles.py --bench [cols] [rows]   (tiled vs naive draw, headless)
+# ------------------------------------------------------------------------------
+
+MAX_RALLY_SECONDS = 30.0       # 끝나지 않는 랠리는 서브부터 다시 (bjc_calibrate와 같은 기준)
+TILE_BG = (40, 44, 52)         # 타일 사이 틈 색
+GAP = 2                        # 타일 간격(px)
+
+
+class Tile:
+    """경기 하나 + 그 경기를 그릴 타일 영역, 마지막으로 그린 상태 키"""
+    def __init__(self, index, rect):
+        self.index = index
+        self.rect = rect
+        self.scene = None
+        self.over = False
+        self.finished = 0
+        self.rally_t = 0.0
+        self.key = None              # 마지막으로 그린 상태 (타일 픽셀 단위)
+        self.label_key = None
+        self.label = None
+        self.trail = []              # aalines용 점 목록 (재사용)
+        self.batch = []              # blits용 [표면, [x, y]] 항목 (재사용)
+
+
+class TileWall:
+    def __init__(self, game, cols=4, rows=4, size=None, diffs=None):
+        self.game = game
+        self.cols, self.rows = cols, rows
+        w, h = size or (game.WIDTH, game.HEIGHT)
+        tw, th = (w - GAP * (cols + 1)) // cols, (h - GAP * (rows + 1)) // rows
+        self.scale = min(tw / game.WIDTH, th / game.HEIGHT)
+        self.tile_size = (int(game.WIDTH * self.scale), int(game.HEIGHT * self.scale))
+        self.font = pygame.font.SysFont("malgungothic", max(10, int(40 * self.scale)))
+        self.diffs = diffs or list(game.DIFFICULTY)
+        self.keys = InputKeys()      # 아무 키도 안 누른 입력 (이 창의 키보드가 경기에 섞이지 않게)
+        self.tiles = []
+        for i in range(cols * rows):
+            c, r = i % cols, i // cols
+            x = GAP + c * (tw + GAP) + (tw - self.tile_size[0]) // 2
+            y = GAP + r * (th + GAP) + (th - self.tile_size[1]) // 2
+            tile = Tile(i, pygame.Rect((x, y), self.tile_size))
+            self.restart(tile)
+            self.tiles.append(tile)
+        # 타일 배율 자산: 코트 배경 한 장 + 축소 아틀라스 (모든 타일이 공유)
+        self.background = pygame.transform.smoothscale(self.tiles[0].scene.background, self.tile_size)
+        self.sprites = game.get_atlas().scaled(self.scale)
+        self.redrawn = 0
+
+    def restart(self, tile):
+        game = self.game
+        scene = game.GameScene(lambda: None, lambda *a: self._game_over(tile), doubles=False)
+        scene.player_bottom.is_human = False
+        scene.keys = self.keys
+        scene.particles.available = False      # 타일에는 효과를 그리지 않음
+        scene.diff_mode = self.diffs[tile.index % len(self.diffs)]
+        scene.diff = game.DIFFICULTY[scene.diff_mode]
+        tile.scene = scene
+        tile.over = False
+        tile.rally_t = 0.0
+        tile.key = None
+        tile.batch = []
+
+    def _game_over(self, tile):
+        tile.over = True
+        tile.finished += 1
+
+    # --- 시뮬레이션: 모든 경기를 한 번에 ----------------------------------------------
+    def step(self, dt):
+        for tile in self.tiles:
+            scene = tile.scene
+            if not scene.rally_active:
+                tile.rally_t = 0.0
+                if scene.server == "bottom":
+                    scene.start_rally()          # 사람 대신 아래쪽 AI가 바로 서브
+            else:
+                tile.rally_t += dt
+                if tile.rally_t > MAX_RALLY_SECONDS:
+                    scene.reset_serve(keep_server=True)
+                    continue
+            scene.update(dt)
+            if tile.over:
+                self.restart(tile)
+
+    # --- 그리기: 바뀐 타일만 -----------------------------------------------------------
+    def state_key(self, tile):
+        s = self.scale
+        sc = tile.scene
+        sh = sc.shuttle
+        key = [round(sh.pos[0] * s), round((sh.pos[1] - sh.z * self.game.Z_DRAW_SCALE) * s),
+               round(sh.z * s), sh.trail_count,
+               sc.score["top"], sc.score["bottom"]]
+        for p in sc.players:
+            key.append(round(p.pos[0] * s))
+            key.append(round(p.pos[1] * s))
+        return key
+
+    def draw(self, surf, force=False):
+        """바뀐 타일만 다시 그리고 그 영역 목록을 반환"""
+        rects = []
+        for tile in self.tiles:
+            key = self.state_key(tile)
+            if not force and key == tile.key:
+                continue
+            tile.key = key
+            self.draw_tile(surf, tile)
+            rects.append(tile.rect)
+        self.redrawn += len(rects)
+        return rects
+
+    def draw_tile(self, surf, tile):
+        game = self.game
+        s = self.scale
+        ox, oy = tile.rect.topleft
+        sc = tile.scene
+        sh = sc.shuttle
+        zs = game.Z_DRAW_SCALE
+        surf.blit(self.background, tile.rect)
+
+        # 잔상 (타일 좌표로 옮긴 점 목록은 재사용)
+        if game.ENABLE_TRAIL and sh.trail_count >= 2:
+            pts = tile.trail
+            n = sh.trail_count
+            while len(pts) < n:
+                pts.append([0.0, 0.0])
+            h = sh.trail_head
+            for i in range(n):
+                src = sh.trail[h + i]
+                pts[i][0] = ox + src[0] * s
+                pts[i][1] = oy + src[1] * s
+            pygame.draw.aalines(surf, game.TRAIL_COLOR, False, pts[:n])
+
+        # 선수(몸통, 라켓) + 셔틀 — 축소 아틀라스로 blits 한 번
+        batch = tile.batch
+        if not batch:
+            for p in sc.players:
+                batch.append([self.sprites["body_ai"][0], [0, 0]])
+                batch.append([self.sprites["racket"][0], [0, 0]])
+            batch.append([self.sprites["shuttle"][0], [0, 0]])
+        i = 0
+        for p in sc.players:
+            for name in ("body_ai", "racket"):
+                off = self.sprites[name][1]
+                dest = batch[i][1]
+                dest[0] = ox + p.pos[0] * s - off
+                dest[1] = oy + p.pos[1] * s - off
+                i += 1
+        off = self.sprites["shuttle"][1]
+        dest = batch[i][1]
+        dest[0] = ox + sh.pos[0] * s - off
+        dest[1] = oy + (sh.pos[1] - sh.z * zs) * s - off
+        surf.blits(batch, doreturn=False)
+
+        # 경기 번호 + 점수 (바뀔 때만 렌더)
+        label_key = (tile.finished, sc.score["top"], sc.score["bottom"], sc.diff_mode)
+        if label_key != tile.label_key:
+            tile.label_key = label_key
+            tile.label = self.font.render(f"#{tile.index + 1} {sc.diff_mode}  {sc.score['top']} : {sc.score['bottom']}"
+                                          f"  (done {tile.finished})", True, (0, 0, 0))
+        surf.blit(tile.label, (ox + 4, oy + 2))
+
+    def naive_draw(self, surf, full, scaled):
+        """비교용: 경기마다 800x900 GameScene.draw → 타일 크기로 축소 → blit"""
+        for tile in self.tiles:
+            tile.scene.draw(full)
+            pygame.transform.smoothscale(full, self.tile_size, scaled)
+            surf.blit(scaled, tile.rect)
+
+
+def run(cols=4, rows=4):
+    import bjc_game as game
+
+    pygame.display.set_caption(f"BJC - {cols}x{rows} matches")
+    wall = TileWall(game, cols, rows)
+    screen = game.screen
+    screen.fill(TILE_BG)
+    wall.draw(screen, force=True)
+    pygame.display.flip()
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                pygame.quit(); return
+            if event.type == pygame.VIDEOEXPOSE:
+                screen.fill(TILE_BG)
+                wall.draw(screen, force=True)
+                pygame.display.flip()
+        dt = min(game.clock.tick(game.FPS) / 1000.0, 0.05)
+        wall.step(dt)
+        rects = wall.draw(screen)
+        if rects:
+            pygame.display.update(rects)
+
+
+def bench(cols=4, rows=4, frames=600):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import random
+    import bjc_game as game
+
+    random.seed(1)
+    game.TELEMETRY = None
+    wall = TileWall(game, cols, rows)
+    screen = game.screen
+    full = pygame.Surface((game.WIDTH, game.HEIGHT)).convert()
+    scaled = pygame.Surface(wall.tile_size).convert()
+    dt = 1.0 / game.FPS
+    step_t, tile_t, naive_t = [], [], []
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        wall.step(dt)
+        t1 = time.perf_counter()
+        wall.draw(screen)
+        t2 = time.perf_counter()
+        wall.naive_draw(screen, full, scaled)
+        t3 = time.perf_counter()
+        step_t.append(t1 - t0); tile_t.append(t2 - t1); naive_t.append(t3 - t2)
+
+    def ms(xs):
+        xs = sorted(xs)
+        return f"avg {sum(xs) / len(xs) * 1000:6.2f} ms  p99 {xs[int(len(xs) * 0.99)] * 1000:6.2f} ms"
+    n = cols * rows
+    print(f"{n} matches, tile {wall.tile_size[0]}x{wall.tile_size[1]} ({wall.scale:.3f}x), {frames} frames")
+    print(f"  step (batch)      : {ms(step_t)}")
+    print(f"  tiles (changed)   : {ms(tile_t)}   redrawn {wall.redrawn / frames:.1f}/{n} tiles per frame")
+    print(f"  naive draw+scale  : {ms(naive_t)}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args[:1] == ["--bench"]:
+        bench(*(int(a) for a in args[1:3]))
+    else:
+        run(*(int(a) for a in args[:2]))
@@ -0,0 +1,83 @@
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from logging.handlers import RotatingFileHandler
+
+# ------------------------------------------------------------------------------
+# Frame-hitch watchdog
+# The main loop calls beat() once per frame. A daemon thread polls the time
+# since the last beat; once a frame runs past `factor` x budget it grabs the
+# main thread's stack (sys._current_frames) *while the stall is happening* and
+# logs it with the game state to a rotating file. When the frame finally ends,
+# the total stall time is logged as well.
+# ------------------------------------------------------------------------------
+
+class FrameWatchdog:
+    def __init__(self, log_path="logs/hitches.log", budget=1.0 / 60, factor=3.0,
+                 state_fn=None, max_bytes=1_000_000, backups=5):
+        self.threshold = budget * factor
+        self.state_fn = state_fn
+        self.main_ident = threading.main_thread().ident
+        self._last = None          # perf_counter of the last beat, None while idle
+        self._frame = 0
+        self._reported = -1        # frame number already captured
+        self._stop = threading.Event()
+
+        d = os.path.dirname(log_path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self.log = logging.getLogger("bjc.watchdog")
+        self.log.setLevel(logging.INFO)
+        self.log.propagate = False
+        if not self.log.handlers:
+            h = RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+            h.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self.log.addHandler(h)
+
+        self._thread = threading.Thread(target=self._run, name="frame-watchdog", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    # --- main thread --------------------------------------------------------------
+    def beat(self):
+        now = time.perf_counter()
+        last = self._last
+        if last is not None and self._reported == self._frame:
+            self.log.info("hitch end: frame %d took %.1f ms", self._frame, (now - last) * 1000.0)
+        self._frame += 1
+        self._last = now
+
+    def idle(self):
+        """의도적으로 잠들기 전 호출 (정적 씬 대기 시간은 멈춤으로 보지 않음)"""
+        self._last = None
+
+    # --- watchdog thread ----------------------------------------------------------
+    def _run(self):
+        poll = self.threshold / 3
+        while not self._stop.wait(poll):
+            last, frame = self._last, self._frame
+            if last is None or frame == self._reported:
+                continue
+            stalled = time.perf_counter() - last
+            if stalled < self.threshold:
+                continue
+            self._reported = frame
+            self._capture(frame, stalled)
+
+    def _capture(self, frame, stalled):
+        top = sys._current_frames().get(self.main_ident)
+        stack = "".join(traceback.format_stack(top)) if top is not None else "  <no main thread frame>\n"
+        try:
+            state = self.state_fn() if self.state_fn else ""
+        except Exception as e:   # 게임 상태를 읽다 실패해도 스택은 남김
+            state = f"<state unavailable: {e!r}>"
+        self.log.warning("hitch: frame %d stalled %.1f ms (threshold %.1f ms)\n  state: %s\n%s",
+                         frame, stalled * 1000.0, self.threshold * 1000.0, state, stack)